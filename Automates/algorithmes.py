@@ -1,4 +1,10 @@
 from .models import Automate, Etat, Transition
+from .automate_compile import EPSILON, AutomateCompile, compiler_automate, etats_modeles, iter_bits
+from .moteurs import (
+    composantes_fortement_connexes, determiniser_compile, eliminer_epsilon_compile,
+    equivalence_afd_compile, fermetures_epsilon, inclusion_compile, minimiser_compile, produit_compile, tronquer_etapes,
+)
+from .persistance import enregistrer_automate
 from django.db import transaction
 from collections import deque, defaultdict
 import re
@@ -7,240 +13,132 @@ import collections
 
 def faire_union(a1, a2):
     etapes = []
-    with transaction.atomic():
-        union_nom = f"{a1.nom}_UNION_{a2.nom}"
-        alphabet = a1.alphabet  # supposons identique
-
-        etapes.append("Étape 1 : Soient A1 et A2 deux AFN à unir.")
-        etapes.append(f"A1 : Q1={list(a1.etats.values_list('nom', flat=True))}, Σ={a1.alphabet}")
-        etapes.append(f"A2 : Q2={list(a2.etats.values_list('nom', flat=True))}, Σ={a2.alphabet}")
-
-        union = Automate.objects.create(nom=union_nom, type="EFA", alphabet=alphabet)
-
-        etat_map = {}
-        for etat in a1.etats.all():
-            nom = f"A_{etat.nom}"
-            nouveau = Etat.objects.create(automate=union, nom=nom, est_final=etat.est_final)
-            etat_map[f"A_{etat.nom}"] = nouveau
-        for etat in a2.etats.all():
-            nom = f"B_{etat.nom}"
-            nouveau = Etat.objects.create(automate=union, nom=nom, est_final=etat.est_final)
-            etat_map[f"B_{etat.nom}"] = nouveau
-
-        etapes.append("Étape 2 : Création des états renommés A_q et B_q pour Q1 et Q2")
-
-        for t in a1.transitions.all():
-            Transition.objects.create(
-                automate=union,
-                source=etat_map[f"A_{t.source.nom}"],
-                cible=etat_map[f"A_{t.cible.nom}"],
-                symbole=t.symbole
-            )
-        for t in a2.transitions.all():
-            Transition.objects.create(
-                automate=union,
-                source=etat_map[f"B_{t.source.nom}"],
-                cible=etat_map[f"B_{t.cible.nom}"],
-                symbole=t.symbole
-            )
-
-        etapes.append("Étape 3 : Copie des transitions de A1 et A2 vers l'automate d'union")
-
-        initial_global = Etat.objects.create(automate=union, nom="q_init", est_initial=True)
-
-        for e in a1.etats.filter(est_initial=True):
-            Transition.objects.create(automate=union, source=initial_global, cible=etat_map[f"A_{e.nom}"], symbole='ε')
-        for e in a2.etats.filter(est_initial=True):
-            Transition.objects.create(automate=union, source=initial_global, cible=etat_map[f"B_{e.nom}"], symbole='ε')
-
-        etapes.append("Étape 4 : Ajout d'un nouvel état initial q_init")
-        etapes.append("Étape 5 : Ajout des transitions ε de q_init vers les états initiaux de A1 et A2")
-        etapes.append("Étape 6 : Les états finaux sont ceux finaux de A1 et A2 (inchangés)")
+    c1, c2 = compiler_automate(a1), compiler_automate(a2)
+    union_nom = f"{a1.nom}_UNION_{a2.nom}"
+    alphabet = a1.alphabet  # supposons identique
+
+    etapes.append("Étape 1 : Soient A1 et A2 deux AFN à unir.")
+    etapes.append(f"A1 : Q1={list(c1.noms)}, Σ={a1.alphabet}")
+    etapes.append(f"A2 : Q2={list(c2.noms)}, Σ={a2.alphabet}")
+
+    # États de A1 : 0..n1-1, états de A2 : n1..n1+n2-1, q_init : n1+n2
+    n1 = c1.nb_etats
+    noms = [f"A_{nom}" for nom in c1.noms] + [f"B_{nom}" for nom in c2.noms]
+    etapes.append("Étape 2 : Création des états renommés A_q et B_q pour Q1 et Q2")
+
+    transitions = list(c1.iter_transitions())
+    transitions.extend((s + n1, symbole, t + n1) for s, symbole, t in c2.iter_transitions())
+    etapes.append("Étape 3 : Copie des transitions de A1 et A2 vers l'automate d'union")
+
+    q_init = len(noms)
+    noms.append("q_init")
+    transitions.extend((q_init, EPSILON, q) for q in c1.etats_initiaux())
+    transitions.extend((q_init, EPSILON, q + n1) for q in c2.etats_initiaux())
+
+    union = enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=1 << q_init, finaux=c1.finaux | (c2.finaux << n1),
+        nom=union_nom, type="EFA", alphabet=alphabet,
+    ))
+
+    etapes.append("Étape 4 : Ajout d'un nouvel état initial q_init")
+    etapes.append("Étape 5 : Ajout des transitions ε de q_init vers les états initiaux de A1 et A2")
+    etapes.append("Étape 6 : Les états finaux sont ceux finaux de A1 et A2 (inchangés)")
 
     return etapes, union
 
 
 def determiniser(afn):
     etapes = []
-    with transaction.atomic():
-        if afn.type != "NFA":
-            raise ValueError("L'automate doit être non déterministe pour être déterminisé.")
-        etapes.append("Étape 1 : Initialisation")
-        sigma = [s.strip() for s in afn.alphabet.split(',')]
-        etapes.append(f"Alphabet Σ = {sigma}")
-
-        afd = Automate.objects.create(nom=f"{afn.nom}_DETERMINISÉ", type="DFA", alphabet=afn.alphabet)
-
-        initiaux = list(afn.etats.filter(est_initial=True))
-        if not initiaux:
-            etapes.append("Erreur : aucun état initial trouvé dans l'AFN")
-            return etapes, None
-
-        etapes.append(f"États initiaux de l'AFN : {[e.nom for e in initiaux]}")
-
-        file = []
-        nouveaux_etats = {}
-        noms_attribués = {}
-        compteur_etats = 0
-
-        def generer_nom():
-            nonlocal compteur_etats
-            nom = f"q{compteur_etats}"
-            compteur_etats += 1
-            return nom
-
-        init_set = frozenset(initiaux)
-        nom_init = generer_nom()
-        e0 = Etat.objects.create(
-            automate=afd,
-            nom=nom_init,
-            est_initial=True,
-            est_final=any(e.est_final for e in initiaux)
-        )
-        nouveaux_etats[init_set] = e0
-        noms_attribués[init_set] = nom_init
-        file.append(init_set)
-
-        etapes.append(f"Création de l'état initial déterministe : {nom_init}")
-
-        while file:
-            courant_set = file.pop(0)
-            etat_source = nouveaux_etats[courant_set]
-            nom_courant = noms_attribués[courant_set]
-            etapes.append(f"\n🔄 Traitement de l'état déterministe {nom_courant}")
-
-            for symbole in sigma:
-                cible_set = set()
-                for etat in courant_set:
-                    transitions = Transition.objects.filter(automate=afn, source=etat, symbole=symbole)
-                    for t in transitions:
-                        cible_set.add(t.cible)
-
-                if not cible_set:
-                    continue
-
-                cible_set_frozen = frozenset(cible_set)
-
-                if cible_set_frozen not in nouveaux_etats:
-                    nom_cible = generer_nom()
-                    nouvel_etat = Etat.objects.create(
-                        automate=afd,
-                        nom=nom_cible,
-                        est_initial=False,
-                        est_final=any(e.est_final for e in cible_set)
-                    )
-                    nouveaux_etats[cible_set_frozen] = nouvel_etat
-                    noms_attribués[cible_set_frozen] = nom_cible
-                    file.append(cible_set_frozen)
-                    etapes.append(f"Création du nouvel état déterministe : {nom_cible} représentant {[e.nom for e in cible_set]}")
-
-                Transition.objects.create(
-                    automate=afd,
-                    source=etat_source,
-                    cible=nouveaux_etats[cible_set_frozen],
-                    symbole=symbole
-                )
-                etapes.append(f"Transition : {nom_courant} --{symbole}--> {noms_attribués[cible_set_frozen]}")
-
-        etapes.append("\n✅ Déterminisation complétée avec renommage des états.")
-        return etapes, afd
+    if afn.type != "NFA":
+        raise ValueError("L'automate doit être non déterministe pour être déterminisé.")
+    etapes.append("Étape 1 : Initialisation")
+    sigma = [s.strip() for s in afn.alphabet.split(',')]
+    etapes.append(f"Alphabet Σ = {sigma}")
 
+    c = compiler_automate(afn)
 
+    initiaux = c.etats_initiaux()
+    if not initiaux:
+        etapes.append("Erreur : aucun état initial trouvé dans l'AFN")
+        return etapes, None
 
-def faire_intersection(a1, a2):
+    etapes.append(f"États initiaux de l'AFN : {[c.noms[q] for q in initiaux]}")
+
+    afd_compile, sous_ensembles = determiniser_compile(
+        c, symboles=sigma, nom=f"{afn.nom}_DETERMINISÉ", alphabet=afn.alphabet
+    )
+    etapes.append(f"Création de l'état initial déterministe : {afd_compile.noms[0]}")
+
+    # Journal de la construction, reconstitué dans l'ordre de traitement
+    journal = []
+    dernier_cree = 0
+    for i, nom_courant in enumerate(afd_compile.noms):
+        journal.append(f"\n🔄 Traitement de l'état déterministe {nom_courant}")
+        for a, cibles in afd_compile.delta[i].items():
+            j = cibles[0]
+            if j > dernier_cree:
+                dernier_cree = j
+                representes = [c.noms[q] for q in iter_bits(sous_ensembles[j])]
+                journal.append(f"Création du nouvel état déterministe : {afd_compile.noms[j]} représentant {representes}")
+            journal.append(f"Transition : {nom_courant} --{afd_compile.symboles[a]}--> {afd_compile.noms[j]}")
+    etapes.extend(tronquer_etapes(journal))
+
+    afd = enregistrer_automate(afd_compile)
+
+    etapes.append("\n✅ Déterminisation complétée avec renommage des états.")
+    return etapes, afd
+
+
+
+def faire_produit(a1, a2, acceptation, nom):
+    """
+    Construit et enregistre le produit de a1 et a2 (exploration à la volée
+    des seules paires accessibles) pour le prédicat d'acceptation donné.
+    """
     etapes = []
-    with transaction.atomic():
-        nom_union = f"{a1.nom}_INTER_{a2.nom}"
-        automate = Automate.objects.create(
-            nom=nom_union,
-            type="DFA",  # L’intersection est déterministe
-            alphabet=a1.alphabet  # On suppose alphabets égaux et compatibles
-        )
+    c1, c2 = compiler_automate(a1), compiler_automate(a2)
 
-        etapes.append("Étape 1 : Construction du produit cartésien des états des deux automates.")
-
-        map_etats = {}
-        for e1 in a1.etats.all():
-            for e2 in a2.etats.all():
-                nom_composite = f"{e1.nom}_{e2.nom}"
-                est_initial = e1.est_initial and e2.est_initial
-                est_final = e1.est_final and e2.est_final
-
-                etat = Etat.objects.create(
-                    automate=automate,
-                    nom=nom_composite,
-                    est_initial=est_initial,
-                    est_final=est_final
-                )
-                map_etats[(e1.nom, e2.nom)] = etat
-
-        etapes.append(f"{len(map_etats)} états ont été créés dans le produit.")
-
-        etapes.append("Étape 2 : Définition des transitions de l’automate produit.")
-        for (e1_nom, e2_nom), etat_prod in map_etats.items():
-            for symbole in a1.alphabet.split(','):
-                symbole = symbole.strip()
-                t1 = a1.transitions.filter(source__nom=e1_nom, symbole=symbole).first()
-                t2 = a2.transitions.filter(source__nom=e2_nom, symbole=symbole).first()
-
-                if t1 and t2:
-                    cible_nom = f"{t1.cible.nom}_{t2.cible.nom}"
-                    cible_prod = map_etats.get((t1.cible.nom, t2.cible.nom))
-                    if cible_prod:
-                        Transition.objects.create(
-                            automate=automate,
-                            source=etat_prod,
-                            cible=cible_prod,
-                            symbole=symbole
-                        )
-
-        etapes.append("Toutes les transitions ont été ajoutées en respectant la règle du produit cartésien.")
-        etapes.append("Étape 3 : Finalisation de l’automate d’intersection.")
+    etapes.append("Étape 1 : Construction du produit des deux automates à partir de la paire d'états initiaux.")
+    produit, paires, nb_explorees = produit_compile(c1, c2, acceptation, nom=nom, alphabet=a1.alphabet)
+    etapes.append(
+        f"{nb_explorees} paires accessibles explorées sur {c1.nb_etats * c2.nb_etats} paires possibles."
+    )
 
+    etapes.append("Étape 2 : Définition des transitions de l’automate produit.")
+    etapes.append(f"{len(paires)} états utiles conservés, {produit.nb_transitions} transitions.")
+
+    automate = enregistrer_automate(produit)
+    return etapes, automate
+
+
+def faire_intersection(a1, a2):
+    etapes, automate = faire_produit(a1, a2, 'et', f"{a1.nom}_INTER_{a2.nom}")
+    etapes.append("Toutes les transitions ont été ajoutées en respectant la règle du produit cartésien.")
+    etapes.append("Étape 3 : Finalisation de l’automate d’intersection.")
     return etapes, automate
 
 
 def faire_complementaire(automate_orig):
     etapes = []
-    with transaction.atomic():
-        if automate_orig.type != 'DFA':
-            raise ValueError("L'automate doit être déterministe pour calculer le complémentaire.")
+    if automate_orig.type != 'DFA':
+        raise ValueError("L'automate doit être déterministe pour calculer le complémentaire.")
 
-        etapes.append("Étape 1 : Vérification que l'automate est déterministe (DFA).")
+    etapes.append("Étape 1 : Vérification que l'automate est déterministe (DFA).")
+    c = compiler_automate(automate_orig)
 
-        nom_complement = f"{automate_orig.nom}_COMPL"
-        automate = Automate.objects.create(
-            nom=nom_complement,
-            type='DFA',
-            alphabet=automate_orig.alphabet
-        )
-        etapes.append(f"Étape 2 : Création d’un nouvel automate nommé '{nom_complement}'.")
-
-        etats_map = {}
-        for e in automate_orig.etats.all():
-            est_initial = e.est_initial
-            est_final = not e.est_final # inversion ici
-
-            new_e = Etat.objects.create(
-                automate=automate,
-                nom=e.nom,
-                est_initial=est_initial,
-                est_final=est_final
-            )
-            etats_map[e.nom] = new_e
-
-        etapes.append("Étape 3 : Inversion des états finaux et création des états.")
-
-        for t in automate_orig.transitions.all():
-            Transition.objects.create(
-                automate=automate,
-                source=etats_map[t.source.nom],
-                cible=etats_map[t.cible.nom],
-                symbole=t.symbole
-            )
-
-        etapes.append("Étape 4 : Copie des transitions.")
-        etapes.append("L’automate complémentaire a été construit avec succès.")
+    nom_complement = f"{automate_orig.nom}_COMPL"
+    etapes.append(f"Étape 2 : Création d’un nouvel automate nommé '{nom_complement}'.")
+
+    tous = (1 << c.nb_etats) - 1
+    automate = enregistrer_automate(AutomateCompile(
+        c.noms, c.iter_transitions(), initiaux=c.initiaux,
+        finaux=tous & ~c.finaux,  # inversion ici
+        nom=nom_complement, type='DFA', alphabet=automate_orig.alphabet,
+    ))
+
+    etapes.append("Étape 3 : Inversion des états finaux et création des états.")
+    etapes.append("Étape 4 : Copie des transitions.")
+    etapes.append("L’automate complémentaire a été construit avec succès.")
 
     return etapes, automate
 
@@ -252,63 +150,30 @@ def concatenation(a1, a2):
     if a1.alphabet != a2.alphabet:
         raise ValueError("Les deux automates doivent avoir le même alphabet.")
 
-    with transaction.atomic():
-        etapes.append("✅ Création de l'automate résultant par concaténation.")
-        
-        automate_concat = Automate.objects.create(
-            nom=f"{a1.nom}_{a2.nom}_concat",
-            type='AFN',
-            alphabet=a1.alphabet
-        )
+    c1, c2 = compiler_automate(a1), compiler_automate(a2)
+    n1 = c1.nb_etats
+
+    etapes.append("✅ Création de l'automate résultant par concaténation.")
 
-        etapes.append("📌 Duplication des états et transitions de A1.")
-        map_etat_a1 = {}
-        for e in a1.etats.all():
-            nouveau = Etat.objects.create(
-                automate=automate_concat,
-                nom=f"{e.nom}_1",
-                est_initial=e.est_initial,
-                est_final=False  # on retirera les fins pour le moment
-            )
-            map_etat_a1[e.id] = nouveau
-
-        for t in a1.transitions.all():
-            Transition.objects.create(
-                automate=automate_concat,
-                source=map_etat_a1[t.source.id],
-                cible=map_etat_a1[t.cible.id],
-                symbole=t.symbole
-            )
-
-        etapes.append("📌 Duplication des états et transitions de A2.")
-        map_etat_a2 = {}
-        for e in a2.etats.all():
-            nouveau = Etat.objects.create(
-                automate=automate_concat,
-                nom=f"{e.nom}_2",
-                est_initial=False,  # tous les états de a2 ne seront initialisés que par ε-transition
-                est_final=e.est_final
-            )
-            map_etat_a2[e.id] = nouveau
-
-        for t in a2.transitions.all():
-            Transition.objects.create(
-                automate=automate_concat,
-                source=map_etat_a2[t.source.id],
-                cible=map_etat_a2[t.cible.id],
-                symbole=t.symbole
-            )
-
-        etapes.append("🔗 Ajout des ε-transitions entre les fins de A1 et les débuts de A2.")
-        for f in a1.etats.filter(est_final=True):
-            for i in a2.etats.filter(est_initial=True):
-                Transition.objects.create(
-                    automate=automate_concat,
-                    source=map_etat_a1[f.id],
-                    cible=map_etat_a2[i.id],
-                    symbole='ε'
-                )
-                etapes.append(f"ε: {map_etat_a1[f.id].nom} → {map_etat_a2[i.id].nom}")
+    etapes.append("📌 Duplication des états et transitions de A1.")
+    noms = [f"{nom}_1" for nom in c1.noms]
+    transitions = list(c1.iter_transitions())
+
+    etapes.append("📌 Duplication des états et transitions de A2.")
+    # tous les états de a2 ne seront initialisés que par ε-transition
+    noms.extend(f"{nom}_2" for nom in c2.noms)
+    transitions.extend((s + n1, symbole, t + n1) for s, symbole, t in c2.iter_transitions())
+
+    etapes.append("🔗 Ajout des ε-transitions entre les fins de A1 et les débuts de A2.")
+    for f in c1.etats_finaux():
+        for i in c2.etats_initiaux():
+            transitions.append((f, EPSILON, i + n1))
+            etapes.append(f"ε: {noms[f]} → {noms[i + n1]}")
+
+    automate_concat = enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=c1.initiaux, finaux=c2.finaux << n1,
+        nom=f"{a1.nom}_{a2.nom}_concat", type='AFN', alphabet=a1.alphabet,
+    ))
 
     etapes.append("✅ Automate de concaténation généré avec succès.")
     return etapes, automate_concat
@@ -316,177 +181,79 @@ def concatenation(a1, a2):
 
 def miroir(automate):
     etapes = []
+    c = compiler_automate(automate)
+
+    etapes.append("✅ Création de l'automate miroir.")
+
+    # Étape 1 : dupliquer les états (avec nom identique) ;
+    # les anciens initiaux deviennent finaux
+    noms = list(c.noms)
+    anciens_finals = c.etats_finaux()
+
+    # Étape 2 : inverser toutes les transitions
+    transitions = [(cible, symbole, source) for source, symbole, cible in c.iter_transitions()]
+
+    # Étape 3 : gérer les états initiaux / finaux
+    if len(anciens_finals) == 1:
+        initiaux = 1 << anciens_finals[0]
+        etapes.append(f"✅ État initial miroir : {c.noms[anciens_finals[0]]}")
+    else:
+        # créer un nouvel état initial
+        q_init = len(noms)
+        noms.append("q_init")
+        initiaux = 1 << q_init
+        etapes.append("🔁 Ajout d'un état initial intermédiaire (q_init)")
+        transitions.extend((q_init, EPSILON, final) for final in anciens_finals)
+
+    miroir_auto = enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=initiaux, finaux=c.initiaux,
+        nom=f"{automate.nom}_miroir",
+        type="AFN",  # le miroir d'un DFA n'est généralement pas un DFA
+        alphabet=automate.alphabet,
+    ))
+
+    etapes.append("✅ Tous les états finaux deviennent finaux du miroir.")
 
-    with transaction.atomic():
-        etapes.append("✅ Création de l'automate miroir.")
+    return etapes, miroir_auto
 
-        miroir_auto = Automate.objects.create(
-            nom=f"{automate.nom}_miroir",
-            type="AFN",  # le miroir d'un DFA n'est généralement pas un DFA
-            alphabet=automate.alphabet
-        )
+def _minimiser(automate_orig):
+    """Minimise l'automate en mémoire (Hopcroft) ; retourne (etapes, afd_min compilé)."""
+    etapes = []
+    if automate_orig.type != 'DFA':
+        raise ValueError("L'automate doit être déterministe pour être minimisé.")
 
-        # Étape 1 : dupliquer les états (avec nom identique)
-        etat_map = {}
-        for etat in automate.etats.all():
-            nouveau = Etat.objects.create(
-                automate=miroir_auto,
-                nom=etat.nom,
-                est_initial=False,  # on définit ensuite
-                est_final=False
-            )
-            etat_map[etat.id] = nouveau
-
-        # Étape 2 : inverser toutes les transitions
-        for t in automate.transitions.all():
-            Transition.objects.create(
-                automate=miroir_auto,
-                source=etat_map[t.cible.id],  # inversion
-                cible=etat_map[t.source.id],
-                symbole=t.symbole
-            )
-
-        # Étape 3 : gérer les états initiaux / finaux
-        anciens_initiaux = automate.etats.filter(est_initial=True)
-        anciens_finals = automate.etats.filter(est_final=True)
-
-        if anciens_finals.count() == 1:
-            seul_init = anciens_finals.first()
-            etat_map[seul_init.id].est_initial = True
-            etat_map[seul_init.id].save()
-            etapes.append(f"✅ État initial miroir : {seul_init.nom}")
-        else:
-            # créer un nouvel état initial
-            nouvel_initial = Etat.objects.create(
-                automate=miroir_auto,
-                nom="q_init",
-                est_initial=True,
-                est_final=False
-            )
-            etapes.append("🔁 Ajout d'un état initial intermédiaire (q_init)")
-            for final in anciens_finals:
-                Transition.objects.create(
-                    automate=miroir_auto,
-                    source=nouvel_initial,
-                    cible=etat_map[final.id],
-                    symbole='ε'
-                )
-
-        for init in anciens_initiaux:
-            etat_map[init.id].est_final = True
-            etat_map[init.id].save()
-
-        etapes.append("✅ Tous les états finaux deviennent finaux du miroir.")
+    etapes.append("Étape 1 : Vérification que l'automate est déterministe.")
 
-    return etapes, miroir_auto
+    # Récupérer alphabet et états
+    c = compiler_automate(automate_orig)
+    alphabet = [s.strip() for s in automate_orig.alphabet.split(',')]
 
-def faire_minimisation(automate_orig):
-    etapes = []
-    with transaction.atomic():
-        if automate_orig.type != 'DFA':
-            raise ValueError("L'automate doit être déterministe pour être minimisé.")
+    afd_min, classes, raffinements = minimiser_compile(
+        c, symboles=alphabet, nom=f"{automate_orig.nom}_MIN", alphabet=automate_orig.alphabet
+    )
 
-        etapes.append("Étape 1 : Vérification que l'automate est déterministe.")
+    accessibles = c.accessibles()
+    etapes.append(f"Étape 2 : Élimination des états inaccessibles : {c.nb_etats} → {bin(accessibles).count('1')} états.")
 
-        # Récupérer alphabet et états
-        alphabet = [s.strip() for s in automate_orig.alphabet.split(',')]
-        etats = list(automate_orig.etats.all())
+    # Étape 3 : Initialiser la partition P = {F, Q \ F}
+    finals = {c.noms[q] for q in iter_bits(accessibles & c.finaux)}
+    non_finals = {c.noms[q] for q in iter_bits(accessibles & ~c.finaux)}
+    etapes.append("Étape 3 : Initialisation de la partition P = {F, Q \\ F} (états manquants → puits implicite).")
+    etapes.append(f"Finals = {finals}")
+    etapes.append(f"Non-finals = {non_finals}")
 
-        # Identifier états accessibles
-        accessibles = set()
-        transitions = automate_orig.transitions.all()
+    etapes.append(f"Étape 4 : Partition stable obtenue après {len(raffinements)} raffinement(s) (algorithme de Hopcroft).")
+    etapes.extend(tronquer_etapes([f"Classe {{{', '.join(c.noms[q] for q in classe)}}}" for classe in classes]))
+
+    return etapes, afd_min
 
-        def dfs(e):
-            if e in accessibles:
-                return
-            accessibles.add(e)
-            for s in alphabet:
-                for t in transitions.filter(source=e, symbole=s):
-                    dfs(t.cible)
-
-        initiaux = [e for e in etats if e.est_initial]
-        for e in initiaux:
-            dfs(e)
-
-        etapes.append(f"Étape 2 : Élimination des états inaccessibles : {len(etats)} → {len(accessibles)} états.")
-
-        etats = [e for e in accessibles]
-        etat_noms = [e.nom for e in etats]
-
-        # Étape 3 : Initialiser la partition P = {F, Q \ F}
-        finals = set(e.nom for e in etats if e.est_final)
-        non_finals = set(e.nom for e in etats if not e.est_final)
-        P = [finals, non_finals]
-
-        etapes.append("Étape 3 : Initialisation de la partition P = {F, Q \\ F}.")
-        etapes.append(f"Finals = {finals}")
-        etapes.append(f"Non-finals = {non_finals}")
-
-        def trouver_classe(p, nom):
-            for i, c in enumerate(p):
-                if nom in c:
-                    return i
-            return -1
-
-        stable = False
-        while not stable:
-            stable = True
-            nouvelle_P = []
-            for groupe in P:
-                ref = next(iter(groupe))
-                sous_groupes = {}
-                for e in groupe:
-                    signature = []
-                    for s in alphabet:
-                        cible = transitions.filter(source__nom=e, symbole=s).first()
-                        cible_nom = cible.cible.nom if cible else None
-                        signature.append(trouver_classe(P, cible_nom))
-                    signature = tuple(signature)
-                    sous_groupes.setdefault(signature, set()).add(e)
-
-                if len(sous_groupes) > 1:
-                    stable = False
-                    nouvelle_P.extend(sous_groupes.values())
-                    etapes.append(f"Raffinement du groupe {groupe} → {list(sous_groupes.values())}")
-                else:
-                    nouvelle_P.append(groupe)
-            P = nouvelle_P
-
-        etapes.append("Étape 4 : Partition stable obtenue.")
-        etapes.append(f"Classes finales : {P}")
-
-        # Étape 5 : Construction du nouvel automate
-        automate_min = Automate.objects.create(
-            nom=f"{automate_orig.nom}_MIN",
-            type="DFA",
-            alphabet=automate_orig.alphabet
-        )
 
-        classe_map = {}
-        for i, groupe in enumerate(P):
-            nom_classe = "_".join(sorted(groupe))
-            is_initial = any(etat.nom in groupe and etat.est_initial for etat in etats)
-            is_final = any(etat.nom in groupe and etat.est_final for etat in etats)
-            e = Etat.objects.create(
-                automate=automate_min,
-                nom=nom_classe,
-                est_initial=is_initial,
-                est_final=is_final
-            )
-            for nom in groupe:
-                classe_map[nom] = e
-
-        # Transitions
-        for t in transitions:
-            if t.source.nom in classe_map and t.cible.nom in classe_map:
-                Transition.objects.get_or_create(
-                    automate=automate_min,
-                    source=classe_map[t.source.nom],
-                    cible=classe_map[t.cible.nom],
-                    symbole=t.symbole
-                )
-
-        etapes.append("Étape 5 : Création des états et transitions de l’automate minimal.")
+def faire_minimisation(automate_orig):
+    etapes, afd_min = _minimiser(automate_orig)
+
+    # Étape 5 : Construction du nouvel automate
+    automate_min = enregistrer_automate(afd_min)
+    etapes.append("Étape 5 : Création des états et transitions de l’automate minimal.")
 
     return etapes, automate_min
 
@@ -499,72 +266,38 @@ def completion(automate):
         raise ValueError("La complétion ne s'applique qu'aux AFD.")
 
     etapes = []
-    symboles = list(set(automate.alphabet))
-    etats = list(automate.etats.all())
+    c = compiler_automate(automate)
+    symboles = list(c.symboles)
+    nom_nouveau = f"{automate.nom}_complété"
 
     # 1. Créer un automate copié
-    with transaction.atomic():
-        nouveau = Automate.objects.create(
-            nom=f"{automate.nom}_complété",
-            type="DFA",
-            alphabet=automate.alphabet
-        )
-        etapes.append(f"Création d’un nouvel automate : {nouveau.nom}")
-
-        etat_map = {}  # ancien -> nouveau
-        for e in etats:
-            new_e = Etat.objects.create(
-                automate=nouveau,
-                nom=e.nom,
-                est_initial=e.est_initial,
-                est_final=e.est_final
-            )
-            etat_map[e.nom] = new_e
-
-        # Création de l'état puit
-        etat_puit = Etat.objects.create(
-            automate=nouveau,
-            nom="Puit",
-            est_initial=False,
-            est_final=False
-        )
-        etapes.append("Création d’un état puit pour gérer les transitions manquantes.")
-
-        # Copier les transitions existantes
-        for t in automate.transitions.all():
-            Transition.objects.create(
-                automate=nouveau,
-                source=etat_map[t.source.nom],
-                cible=etat_map[t.cible.nom],
-                symbole=t.symbole
-            )
-
-        # 2. Compléter les transitions manquantes
-        for e in etats:
-            dest_symboles = set(
-                t.symbole for t in automate.transitions.filter(source=e)
-            )
-            manquants = set(symboles) - dest_symboles
-            if manquants:
-                etapes.append(f"Complétion des transitions manquantes pour l’état {e.nom}.")
-            for s in manquants:
-                Transition.objects.create(
-                    automate=nouveau,
-                    source=etat_map[e.nom],
-                    cible=etat_puit,
-                    symbole=s
-                )
-                etapes.append(f"Ajout de la transition manquante : {e.nom} --{s}--> Puit")
-
-        # 3. Le puit boucle sur lui-même pour chaque symbole
-        for s in symboles:
-            Transition.objects.create(
-                automate=nouveau,
-                source=etat_puit,
-                cible=etat_puit,
-                symbole=s
-            )
-        etapes.append("Ajout des transitions bouclées sur l’état puit.")
+    etapes.append(f"Création d’un nouvel automate : {nom_nouveau}")
+
+    noms = list(c.noms)
+    transitions = list(c.iter_transitions())
+
+    # Création de l'état puit
+    puit = len(noms)
+    noms.append("Puit")
+    etapes.append("Création d’un état puit pour gérer les transitions manquantes.")
+
+    # 2. Compléter les transitions manquantes
+    for q, nom in enumerate(c.noms):
+        manquants = [s for a, s in enumerate(symboles) if a not in c.delta[q]]
+        if manquants:
+            etapes.append(f"Complétion des transitions manquantes pour l’état {nom}.")
+        for s in manquants:
+            transitions.append((q, s, puit))
+            etapes.append(f"Ajout de la transition manquante : {nom} --{s}--> Puit")
+
+    # 3. Le puit boucle sur lui-même pour chaque symbole
+    transitions.extend((puit, s, puit) for s in symboles)
+    etapes.append("Ajout des transitions bouclées sur l’état puit.")
+
+    nouveau = enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=c.initiaux, finaux=c.finaux,
+        nom=nom_nouveau, type="DFA", alphabet=automate.alphabet,
+    ))
 
     return etapes, nouveau
 
@@ -576,73 +309,50 @@ def faire_canonisation(automate_orig):
     if automate_orig.type != "DFA":
         raise ValueError("L'automate doit être déterministe pour être canoniquement représenté.")
 
-    # Étape 1 : Minimisation
+    # Étape 1 : Minimisation (en mémoire, sans persister l'automate minimal)
     etapes.append("Étape 1 : Minimisation de l’automate.")
-    minimisation_etapes, automate_min = faire_minimisation(automate_orig)
+    minimisation_etapes, c = _minimiser(automate_orig)
     etapes.extend(["    " + step for step in minimisation_etapes])
 
     # Étape 2 : Renommage canonique par parcours BFS
     etapes.append("Étape 2 : Parcours BFS depuis l’état initial pour établir l’ordre canonique.")
 
-
-    old_etats = {e.nom: e for e in automate_min.etats.all()}
-    transitions = automate_min.transitions.all()
-
     graph = {}
-    for t in transitions:
-        graph.setdefault(t.source.nom, []).append((t.symbole, t.cible.nom))
+    for source, symbole, cible in c.iter_transitions():
+        graph.setdefault(source, []).append((symbole, c.noms[cible], cible))
 
     # BFS pour ordonner les états
-    visited = set()
-    ordre = []
-    queue = deque()
-
-    etat_initial = next((e for e in automate_min.etats.all() if e.est_initial), None)
-    if not etat_initial:
+    initiaux = c.etats_initiaux()
+    if not initiaux:
         raise ValueError("L’automate minimisé n’a pas d’état initial.")
 
-    queue.append(etat_initial.nom)
-    visited.add(etat_initial.nom)
+    visited = {initiaux[0]}
+    ordre = []
+    queue = deque([initiaux[0]])
 
     while queue:
         current = queue.popleft()
         ordre.append(current)
-        for symbole, voisin in sorted(graph.get(current, []), key=lambda x: (x[0], x[1])):
+        for symbole, _, voisin in sorted(graph.get(current, []), key=lambda x: (x[0], x[1])):
             if voisin not in visited:
                 visited.add(voisin)
                 queue.append(voisin)
 
-    etapes.append(f"Ordre canonique obtenu : {ordre}")
+    etapes.append(f"Ordre canonique obtenu : {[c.noms[q] for q in ordre]}")
 
     # Étape 3 : Création d’un nouvel automate avec renommage canonique
-    automate_canon = Automate.objects.create(
-        nom=f"{automate_orig.nom}_CANON",
-        type="DFA",
-        alphabet=automate_orig.alphabet
-    )
-
     etapes.append("Étape 3 : Construction de l’automate canonisé avec renommage q0, q1, …")
 
-    nom_map = {}
-    for i, nom in enumerate(ordre):
-        etat_orig = old_etats[nom]
-        nom_canon = f"q{i}"
-        e = Etat.objects.create(
-            automate=automate_canon,
-            nom=nom_canon,
-            est_initial=etat_orig.est_initial,
-            est_final=etat_orig.est_final
-        )
-        nom_map[nom] = e
-
-    for t in transitions:
-        if t.source.nom in nom_map and t.cible.nom in nom_map:
-            Transition.objects.create(
-                automate=automate_canon,
-                source=nom_map[t.source.nom],
-                cible=nom_map[t.cible.nom],
-                symbole=t.symbole
-            )
+    rang = {q: i for i, q in enumerate(ordre)}
+    automate_canon = enregistrer_automate(AutomateCompile(
+        [f"q{i}" for i in range(len(ordre))],
+        [(rang[source], symbole, rang[cible])
+         for source, symbole, cible in c.iter_transitions()
+         if source in rang and cible in rang],
+        initiaux=[i for i, q in enumerate(ordre) if c.est_initial(q)],
+        finaux=[i for i, q in enumerate(ordre) if c.est_final(q)],
+        nom=f"{automate_orig.nom}_CANON", type="DFA", alphabet=automate_orig.alphabet,
+    ))
 
     etapes.append("Étape 4 : Transitions recopiées avec états renommés.")
 
@@ -652,62 +362,31 @@ def faire_canonisation(automate_orig):
 
 
 def cloture_etoile(automate):
-    nouveau = Automate.objects.create(
-        nom=f"{automate.nom}*",
-        type='EFA',  # ε-transitions
-        alphabet=automate.alphabet
-    )
-
-    etat_map = {}
-    for etat in automate.etats.all():
-        new_state = Etat.objects.create(
-            automate=nouveau,
-            nom=etat.nom,
-            est_initial=False,
-            est_final=etat.est_final
-        )
-        etat_map[etat.id] = new_state
+    c = compiler_automate(automate)
+    noms = list(c.noms)
 
     # Créer un nouvel état initial qui est aussi final
-    initial_star = Etat.objects.create(
-        automate=nouveau,
-        nom="q_new",
-        est_initial=True,
-        est_final=True
-    )
+    q_new = len(noms)
+    noms.append("q_new")
 
-    anciens_initiaux = automate.etats.filter(est_initial=True)
-    anciens_finaux = automate.etats.filter(est_final=True)
+    anciens_initiaux = c.etats_initiaux()
+    anciens_finaux = c.etats_finaux()
 
     # ε-transitions de q_new vers anciens initiaux
-    for ei in anciens_initiaux:
-        Transition.objects.create(
-            automate=nouveau,
-            source=initial_star,
-            cible=etat_map[ei.id],
-            symbole="ε"
-        )
+    transitions = [(q_new, EPSILON, ei) for ei in anciens_initiaux]
 
     # ε-transitions de finaux vers anciens initiaux
-    for ef in anciens_finaux:
-        for ei in anciens_initiaux:
-            Transition.objects.create(
-                automate=nouveau,
-                source=etat_map[ef.id],
-                cible=etat_map[ei.id],
-                symbole="ε"
-            )
+    transitions.extend((ef, EPSILON, ei) for ef in anciens_finaux for ei in anciens_initiaux)
 
     # Copier les transitions existantes
-    for t in automate.transitions.all():
-        Transition.objects.create(
-            automate=nouveau,
-            source=etat_map[t.source.id],
-            cible=etat_map[t.cible.id],
-            symbole=t.symbole
-        )
+    transitions.extend(c.iter_transitions())
 
-    return nouveau
+    return enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=1 << q_new, finaux=c.finaux | (1 << q_new),
+        nom=f"{automate.nom}*",
+        type='EFA',  # ε-transitions
+        alphabet=automate.alphabet,
+    ))
 
 
 
@@ -722,24 +401,93 @@ def difference(a1, a2):
         raise ValueError("Les deux automates doivent avoir le même alphabet.")
 
     etapes.append("✅ Vérification des conditions : DFA et même alphabet.")
-    
-    # 1. Complémentaire de B
-    etapes.append("🔄 Calcul du complémentaire de l'automate B.")
-    etapes_compl, b_complement = faire_complementaire(a2)
-    etapes += etapes_compl
-
-    # 2. Intersection de A avec complémentaire(B)
-    etapes.append("🔀 Calcul de l'intersection entre A et le complémentaire de B.")
-    etapes_inter, result = faire_intersection(a1, b_complement)
-    result.nom = f"{a1.nom}-{a2.nom}"
-    result.save()
-    b_complement.delete()
-    etapes += etapes_inter
+
+    # Produit A × B acceptant les paires (final dans A, non final dans B) :
+    # le complémentaire de B n'est jamais construit ni enregistré.
+    etapes.append("🔀 Produit de A et B avec acceptation « final dans A et non final dans B ».")
+    etapes_produit, result = faire_produit(a1, a2, 'et_non', f"{a1.nom}-{a2.nom}")
+    etapes += etapes_produit
 
     etapes.append("✅ Automate résultant de la différence A \\ B construit avec succès.")
     return etapes, result
 
 
+def difference_symetrique(a1, a2):
+    etapes = []
+
+    if a1.type != 'DFA' or a2.type != 'DFA':
+        raise ValueError("Les deux automates doivent être déterministes (DFA) pour faire la différence symétrique.")
+
+    if a1.alphabet != a2.alphabet:
+        raise ValueError("Les deux automates doivent avoir le même alphabet.")
+
+    etapes.append("✅ Vérification des conditions : DFA et même alphabet.")
+    etapes.append("🔀 Produit de A et B avec acceptation « final dans exactement un des deux ».")
+    etapes_produit, result = faire_produit(a1, a2, 'xor', f"{a1.nom}_XOR_{a2.nom}")
+    etapes += etapes_produit
+
+    etapes.append("✅ Automate résultant de la différence symétrique A Δ B construit avec succès.")
+    return etapes, result
+
+
+def _afficher_mot(mot):
+    return ''.join(mot) if mot else EPSILON
+
+
+def comparer_langages(a1, a2):
+    """
+    Décide L(A) ⊆ L(B), L(B) ⊆ L(A) et L(A) = L(B) par antichaînes, sans
+    déterminiser ni rien enregistrer. Fonctionne sur AFD, AFN et ε-AFN.
+    Retourne (etapes, resultat) ; resultat contient les contre-exemples les
+    plus courts (None si l'inclusion est vérifiée).
+    """
+    etapes = []
+    c1, c2 = compiler_automate(a1), compiler_automate(a2)
+    etapes.append(
+        f"Étape 1 : Chargement de A ({c1.nb_etats} états) et B ({c2.nb_etats} états)"
+        + ("; les ε-transitions seront supprimées." if c1.a_epsilon() or c2.a_epsilon() else ".")
+    )
+    etapes.append("Étape 2 : Calcul du préordre de simulation sur A ⊎ B.")
+
+    resultat = {}
+    for cle, (x, y), (nx, ny) in (
+        ('a_dans_b', (c1, c2), (a1.nom, a2.nom)),
+        ('b_dans_a', (c2, c1), (a2.nom, a1.nom)),
+    ):
+        inclus, mot, nb_paires = inclusion_compile(x, y)
+        resultat[cle] = inclus
+        resultat[f"contre_exemple_{cle}"] = None if inclus else _afficher_mot(mot)
+        etapes.append(f"🔎 L({nx}) ⊆ L({ny}) : {nb_paires} paires conservées dans l'antichaîne.")
+        if inclus:
+            etapes.append(f"✅ L({nx}) ⊆ L({ny}).")
+        else:
+            etapes.append(f"❌ Contre-exemple le plus court : « {_afficher_mot(mot)} » ∈ L({nx}) \\ L({ny}).")
+
+    resultat['equivalents'] = resultat['a_dans_b'] and resultat['b_dans_a']
+    etapes.append("✅ Les deux langages sont égaux." if resultat['equivalents']
+                  else "❌ Les deux langages sont différents.")
+    return etapes, resultat
+
+
+def equivalence_afd(a1, a2):
+    """
+    Équivalence de deux AFD par union-find (Hopcroft–Karp), sans minimiser
+    ni enregistrer d'automate. Retourne (etapes, resultat) où resultat
+    contient un mot distinguant (None si les langages sont égaux).
+    """
+    etapes = []
+    c1, c2 = compiler_automate(a1), compiler_automate(a2)
+    etapes.append(f"Étape 1 : Chargement de A ({c1.nb_etats} états) et B ({c2.nb_etats} états).")
+    etapes.append("Étape 2 : Fusion des paires d'états atteintes par un même mot, en partant des initiaux.")
+    equivalents, mot, nb_fusions = equivalence_afd_compile(c1, c2)
+    etapes.append(f"🔗 {nb_fusions} fusions de classes effectuées.")
+    if equivalents:
+        etapes.append("✅ Aucune paire ne mélange état final et non final : L(A) = L(B).")
+    else:
+        etapes.append(f"❌ Arrêt au premier conflit : « {_afficher_mot(mot)} » distingue A et B.")
+    return etapes, {'equivalents': equivalents, 'mot_distinguant': None if equivalents else _afficher_mot(mot)}
+
+
 def quotient_gauche(a_b, a_a):
     """
     Calcule un automate reconnaissant L(B) / L(A)
@@ -784,78 +532,32 @@ def quotient_gauche(a_b, a_a):
 
 def etats_accessibles(automate):
     """Retourne tous les états accessibles depuis l'état initial"""
-    etat_initial = automate.etats.filter(est_initial=True).first()
-    if not etat_initial:
-        return set()
-    
-    accessibles = set()
-    a_visiter = {etat_initial}
-    
-    while a_visiter:
-        etat = a_visiter.pop()
-        accessibles.add(etat)
-        
-        # Trouver tous les états atteignables depuis cet état
-        transitions = Transition.objects.filter(automate=automate, source=etat)
-        for transition in transitions:
-            if transition.cible not in accessibles:
-                a_visiter.add(transition.cible)
-    
-    return accessibles
+    c = compiler_automate(automate)
+    return etats_modeles(automate, c, c.accessibles())
 
 def etats_coaccessibles(automate):
     """Retourne tous les états co-accessibles (qui mènent à un état final)"""
-    etats_finaux = set(automate.etats.filter(est_final=True))
-    if not etats_finaux:
-        return set()
-    
-    coaccessibles = set()
-    a_visiter = set(etats_finaux)
-    
-    while a_visiter:
-        etat = a_visiter.pop()
-        coaccessibles.add(etat)
-        
-        # Trouver tous les états qui mènent à cet état
-        transitions = Transition.objects.filter(automate=automate, cible=etat)
-        for transition in transitions:
-            if transition.source not in coaccessibles:
-                a_visiter.add(transition.source)
-    
-    return coaccessibles
+    c = compiler_automate(automate)
+    return etats_modeles(automate, c, c.coaccessibles())
 
 def etats_utiles(automate):
     """Retourne les états à la fois accessibles et co-accessibles"""
-    accessibles = etats_accessibles(automate)
-    coaccessibles = etats_coaccessibles(automate)
-    return accessibles & coaccessibles
+    c = compiler_automate(automate)
+    return etats_modeles(automate, c, c.accessibles() & c.coaccessibles())
 
 
 
 
 def calculer_epsilon_fermetures(automate):
-    epsilon = 'ε'
-    fermetures = {}
+    c = compiler_automate(automate)
+    par_id = automate.etats.in_bulk()
+    etats = [par_id[pk] for pk in c.etat_ids]
 
-    # construire les transitions ε
-    epsilon_transitions = defaultdict(list)
-    for t in automate.transitions.filter(symbole=epsilon):
-        epsilon_transitions[t.source].append(t.cible)
-
-    # pour chaque état, calculer la fermeture ε
-    for etat in automate.etats.all():
-        fermeture = set()
-        pile = [etat]
-
-        while pile:
-            courant = pile.pop()
-            if courant not in fermeture:
-                fermeture.add(courant)
-                pile.extend(epsilon_transitions.get(courant, []))
-
-        fermetures[etat] = fermeture
-
-    return fermetures
+    # ε-fermetures (bitsets) calculées une fois par composante fortement connexe
+    return {
+        etats[q]: {etats[f] for f in iter_bits(fermeture)}
+        for q, fermeture in enumerate(fermetures_epsilon(c))
+    }
 
 
 
@@ -864,40 +566,41 @@ def emoder_automate(automate):
     Simplifie l'automate en conservant uniquement les états utiles
     et leurs transitions
     """
+    c = compiler_automate(automate)
+    par_id = automate.etats.in_bulk()
+
     # 1. Identifier les états utiles
-    utiles = etats_utiles(automate)
+    utiles = c.accessibles() & c.coaccessibles()
     
-    # 2. Créer un nouveau dictionnaire pour les nouveaux états
+    # 2. Créer les nouveaux états (copie des utiles)
     nouveaux_etats = {}
-    nouveaux_etats_objets = []
-    
-    # 3. Créer les nouveaux états (copie des utiles)
-    for etat in utiles:
-        nouveaux_etats[etat.nom] = Etat(
-            nom=etat.nom,
-            est_initial=etat.est_initial,
-            est_final=etat.est_final
+    for q in iter_bits(utiles):
+        nouveaux_etats[q] = Etat(
+            nom=c.noms[q],
+            est_initial=c.est_initial(q),
+            est_final=c.est_final(q)
         )
-        nouveaux_etats_objets.append(nouveaux_etats[etat.nom])
     
-    # 4. Filtrer les transitions entre états utiles
+    # 3. Filtrer les transitions entre états utiles
     nouvelles_transitions = []
-    for transition in automate.transitions.all():
-        if transition.source in utiles and transition.cible in utiles:
+    transitions_supprimees = []
+    for source, symbole, cible in c.iter_transitions():
+        if source in nouveaux_etats and cible in nouveaux_etats:
             nouvelles_transitions.append(Transition(
-                source=nouveaux_etats[transition.source.nom],
-                cible=nouveaux_etats[transition.cible.nom],
-                symbole=transition.symbole
+                source=nouveaux_etats[source],
+                cible=nouveaux_etats[cible],
+                symbole=symbole
             ))
+        else:
+            transitions_supprimees.append((c.noms[source], symbole, c.noms[cible]))
     
     return {
-        'etats': nouveaux_etats_objets,
+        'etats': list(nouveaux_etats.values()),
         'transitions': nouvelles_transitions,
-        'etats_supprimes': set(automate.etats.all()) - utiles,
-        'transitions_supprimees': [
-            t for t in automate.transitions.all() 
-            if not (t.source in utiles and t.cible in utiles)
-        ]
+        'etats_supprimes': {
+            par_id[pk] for q, pk in enumerate(c.etat_ids) if q not in nouveaux_etats
+        },
+        'transitions_supprimees': transitions_supprimees
     }
 
 
@@ -909,66 +612,76 @@ def convertir_afd_en_afn(automate):
         raise ValueError("L'automate doit être un AFD pour être converti en AFN.")
 
     etapes = [f"Conversion de l’automate {automate.nom} (AFD) vers un AFN avec ajout d’un état non-déterministe."]
-    alphabet = list(set(automate.alphabet))
-    
-    with transaction.atomic():
-        nouveau = Automate.objects.create(
-            nom=f"{automate.nom}_AFN",
-            type="NFA",
-            alphabet=automate.alphabet
-        )
-        etapes.append(f"Création de l'automate AFN : {nouveau.nom}")
-
-        # Copier les états
-        etat_map = {}
-        for e in automate.etats.all():
-            new_e = Etat.objects.create(
-                automate=nouveau,
-                nom=e.nom,
-                est_initial=e.est_initial,
-                est_final=e.est_final
-            )
-            etat_map[e.nom] = new_e
-
-        etapes.append("Copie des états effectuée.")
-
-        # Copier les transitions
-        for t in automate.transitions.all():
-            Transition.objects.create(
-                automate=nouveau,
-                source=etat_map[t.source.nom],
-                cible=etat_map[t.cible.nom],
-                symbole=t.symbole
-            )
-        etapes.append("Copie des transitions effectuée.")
-
-        # Choisir un état cible pour les transitions supplémentaires
-        q_source = list(etat_map.values())[1] if len(etat_map) > 1 else list(etat_map.values())[0]
-
-        # Ajouter un nouvel état q_alt
-        q_alt = Etat.objects.create(
-            automate=nouveau,
-            nom="q_alt",
-            est_initial=False,
-            est_final=False
-        )
-        etapes.append("Ajout d’un état alternatif q_alt.")
-
-        # Ajouter des transitions de q_source vers q_alt pour chaque symbole
-        for s in alphabet:
-            if s != ',':
-                Transition.objects.create(
-                    automate=nouveau,
-                    source=q_source,
-                    cible=q_alt,
-                    symbole=s
-                )
-                etapes.append(f"Ajout : {q_source.nom} --{s}--> q_alt")
+    c = compiler_automate(automate)
+    alphabet = list(c.symboles)
+    nom_nouveau = f"{automate.nom}_AFN"
+
+    etapes.append(f"Création de l'automate AFN : {nom_nouveau}")
+
+    # Copier les états et les transitions
+    noms = list(c.noms)
+    etapes.append("Copie des états effectuée.")
+    transitions = list(c.iter_transitions())
+    etapes.append("Copie des transitions effectuée.")
+
+    # Choisir un état cible pour les transitions supplémentaires
+    q_source = 1 if len(noms) > 1 else 0
+
+    # Ajouter un nouvel état q_alt
+    q_alt = len(noms)
+    noms.append("q_alt")
+    etapes.append("Ajout d’un état alternatif q_alt.")
+
+    # Ajouter des transitions de q_source vers q_alt pour chaque symbole
+    for s in alphabet:
+        transitions.append((q_source, s, q_alt))
+        etapes.append(f"Ajout : {noms[q_source]} --{s}--> q_alt")
+
+    nouveau = enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=c.initiaux, finaux=c.finaux,
+        nom=nom_nouveau, type="NFA", alphabet=automate.alphabet,
+    ))
 
     etapes.append("L’automate résultant est un vrai AFN avec non-déterminisme introduit.")
     return etapes, nouveau
 
 
+def _ajouter_initial_epsilon(automate, c):
+    """
+    Copie l'automate compilé c dans un nouvel EFA en ajoutant un état initial
+    q_init relié par ε aux anciens états initiaux.
+    """
+    # Ajout de ε à l'alphabet si nécessaire
+    alphabet_set = set(sym.strip() for sym in automate.alphabet.split(",") if sym.strip())
+    alphabet_set.add("ε")
+    nouvel_alphabet = ",".join(sorted(alphabet_set))
+
+    # Copier les états et les transitions existantes
+    noms = list(c.noms)
+    transitions = list(c.iter_transitions())
+
+    # Créer le nouvel état initial
+    q_init = len(noms)
+    noms.append("q_init")
+
+    # Ajouter transition ε du nouvel état initial vers chaque ancien état initial
+    anciens_initiaux = c.etats_initiaux()
+    transitions.extend((q_init, EPSILON, ancien) for ancien in anciens_initiaux)
+
+    nouveau = enregistrer_automate(AutomateCompile(
+        noms, transitions, initiaux=1 << q_init, finaux=c.finaux,
+        nom=f"{automate.nom}_efa", type="EFA", alphabet=nouvel_alphabet,
+    ))
+
+    # Étapes pour affichage
+    etapes = [
+        "Création d'un nouvel état initial q_init.",
+        f"Ajout de la lettre ε à l'alphabet : {nouvel_alphabet}.",
+        f"Ajout de transitions ε de q_init vers : {', '.join(c.noms[q] for q in anciens_initiaux)}."
+    ]
+    return etapes, nouveau
+
+
 def convertir_afn_vers_efn(automate):
     """
     Convertit un AFD ou AFN en EFA (ε-AFN) en ajoutant un nouvel état initial
@@ -980,65 +693,7 @@ def convertir_afn_vers_efn(automate):
     if automate.type != "NFA":
         raise ValueError("L'automate choisi n'est pas un AFN")
 
-    with transaction.atomic():
-        # Ajout de ε à l'alphabet si nécessaire
-        alphabet_set = set(sym.strip() for sym in automate.alphabet.split(",") if sym.strip())
-        alphabet_set.add("ε")
-        nouvel_alphabet = ",".join(sorted(alphabet_set))
-
-        # Création du nouvel automate
-        nouveau = Automate.objects.create(
-            nom=f"{automate.nom}_efa",
-            type="EFA",
-            alphabet=nouvel_alphabet
-        )
-
-        # Copier les états et garder une correspondance
-        etat_mapping = {}
-        for etat in automate.etats.all():
-            copie = Etat.objects.create(
-                automate=nouveau,
-                nom=etat.nom,
-                est_initial=False,
-                est_final=etat.est_final
-            )
-            etat_mapping[etat.id] = copie
-
-        # Créer le nouvel état initial
-        nouvel_initial = Etat.objects.create(
-            automate=nouveau,
-            nom="q_init",
-            est_initial=True,
-            est_final=False
-        )
-
-        # Ajouter les transitions existantes
-        for t in automate.transitions.all():
-            Transition.objects.create(
-                automate=nouveau,
-                source=etat_mapping[t.source.id],
-                symbole=t.symbole,
-                cible=etat_mapping[t.cible.id]
-            )
-
-        # Ajouter transition ε du nouvel état initial vers chaque ancien état initial
-        anciens_initiaux = automate.etats.filter(est_initial=True)
-        for ancien in anciens_initiaux:
-            Transition.objects.create(
-                automate=nouveau,
-                source=nouvel_initial,
-                symbole='ε',
-                cible=etat_mapping[ancien.id]
-            )
-
-        # Étapes pour affichage
-        etapes = [
-            "Création d'un nouvel état initial q_init.",
-            f"Ajout de la lettre ε à l'alphabet : {nouvel_alphabet}.",
-            f"Ajout de transitions ε de q_init vers : {', '.join(e.nom for e in anciens_initiaux)}."
-        ]
-
-        return etapes, nouveau
+    return _ajouter_initial_epsilon(automate, compiler_automate(automate))
 
 
 
@@ -1055,64 +710,10 @@ def convertir_afd_vers_efn(automate1):
     
 
     et, automate = convertir_afd_en_afn(automate1)
+    c = compiler_automate(automate)
 
     with transaction.atomic():
-        # Ajout de ε à l'alphabet si nécessaire
-        alphabet_set = set(sym.strip() for sym in automate.alphabet.split(",") if sym.strip())
-        alphabet_set.add("ε")
-        nouvel_alphabet = ",".join(sorted(alphabet_set))
-
-        # Création du nouvel automate
-        nouveau = Automate.objects.create(
-            nom=f"{automate.nom}_efa",
-            type="EFA",
-            alphabet=nouvel_alphabet
-        )
-
-        # Copier les états et garder une correspondance
-        etat_mapping = {}
-        for etat in automate.etats.all():
-            copie = Etat.objects.create(
-                automate=nouveau,
-                nom=etat.nom,
-                est_initial=False,
-                est_final=etat.est_final
-            )
-            etat_mapping[etat.id] = copie
-
-        # Créer le nouvel état initial
-        nouvel_initial = Etat.objects.create(
-            automate=nouveau,
-            nom="q_init",
-            est_initial=True,
-            est_final=False
-        )
-
-        # Ajouter les transitions existantes
-        for t in automate.transitions.all():
-            Transition.objects.create(
-                automate=nouveau,
-                source=etat_mapping[t.source.id],
-                symbole=t.symbole,
-                cible=etat_mapping[t.cible.id]
-            )
-
-        # Ajouter transition ε du nouvel état initial vers chaque ancien état initial
-        anciens_initiaux = automate.etats.filter(est_initial=True)
-        for ancien in anciens_initiaux:
-            Transition.objects.create(
-                automate=nouveau,
-                source=nouvel_initial,
-                symbole='ε',
-                cible=etat_mapping[ancien.id]
-            )
-
-        # Étapes pour affichage
-        etapes = [
-            "Création d'un nouvel état initial q_init.",
-            f"Ajout de la lettre ε à l'alphabet : {nouvel_alphabet}.",
-            f"Ajout de transitions ε de q_init vers : {', '.join(e.nom for e in anciens_initiaux)}."
-        ]
+        etapes, nouveau = _ajouter_initial_epsilon(automate, c)
         etapes.append(et)
         automate.delete()
 
@@ -1124,86 +725,36 @@ def convertir_afd_vers_efn(automate1):
 
 
 
-def eliminer_transitions_epsilon(automate):
+def eliminer_transitions_epsilon(automate, sens='auto'):
     etapes = []
     etapes.append("🔁 Début de l'élimination des ε-transitions.")
-    epsilon = 'ε'
-
-    anciens_etats = list(automate.etats.all())
-    anciennes_transitions = list(automate.transitions.select_related('source', 'cible'))
-
-    # Étape 1 : Construction des ε-transitions
-    epsilon_adjacence = collections.defaultdict(list)
-    for t in anciennes_transitions:
-        if t.symbole == epsilon:
-            epsilon_adjacence[t.source.id].append(t.cible)
-
-    # Étape 2 : Calcul des fermetures ε
-    fermeture_epsilon = {}
-    for etat in anciens_etats:
-        fermeture = set()
-        pile = [etat]
-        while pile:
-            courant = pile.pop()
-            if courant.id not in {e.id for e in fermeture}:
-                fermeture.add(courant)
-                pile.extend(epsilon_adjacence[courant.id])
-        fermeture_epsilon[etat.id] = fermeture
-        noms = ', '.join(sorted(e.nom for e in fermeture))
-        etapes.append(f"Fermeture ε({etat.nom}) = {{{noms}}}")
-
-    # Étape 3 : Création du nouvel automate sans ε
-    nouvel_alphabet = ','.join([s for s in automate.alphabet.split(',') if s.strip() != epsilon])
-    nouvel_automate = Automate.objects.create(
-        nom=f"{automate.nom}_sans_ε",
-        type='NFA',
-        alphabet=nouvel_alphabet
-    )
+    epsilon = EPSILON
 
-    map_etats = {}
-    for ancien in anciens_etats:
-        fermeture = fermeture_epsilon[ancien.id]
-        est_initial = ancien.est_initial
-        est_final = any(e.est_final for e in fermeture)
-
-        nouveau = Etat.objects.create(
-            automate=nouvel_automate,
-            nom=ancien.nom,
-            est_initial=est_initial,
-            est_final=est_final
-        )
-        map_etats[ancien.id] = nouveau
+    c = compiler_automate(automate)
+    n = c.nb_etats
+
+    # Étape 1 et 2 : Calcul des fermetures ε (bitsets, une fois par composante)
+    fermeture_epsilon = fermetures_epsilon(c)
+    for q in range(n):
+        noms = ', '.join(sorted(c.noms[e] for e in iter_bits(fermeture_epsilon[q])))
+        etapes.append(f"Fermeture ε({c.noms[q]}) = {{{noms}}}")
 
-    # Étape 4 : Recréation des transitions sans ε
+    # Étape 3 et 4 : transitions sans ε à partir de l'index (état, symbole) -> cibles,
+    # dans le sens (avant / arrière) qui produit le moins de transitions
+    nouvel_alphabet = ','.join([s for s in automate.alphabet.split(',') if s.strip() != epsilon])
     symbole_utiles = [s.strip() for s in nouvel_alphabet.split(',') if s.strip()]
-    transitions_ajoutees = set()
-
-    for ancien_source in anciens_etats:
-        fermeture_src = fermeture_epsilon[ancien_source.id]
-
-        for symbole in symbole_utiles:
-            destinations = set()
-            for etat_inter in fermeture_src:
-                for t in anciennes_transitions:
-                    if t.source.id == etat_inter.id and t.symbole == symbole:
-                        fermeture_dest = fermeture_epsilon[t.cible.id]
-                        destinations.update(fermeture_dest)
-
-            source_mappee = map_etats[ancien_source.id]
-            for dest in destinations:
-                cible_mappee = map_etats[dest.id]
-                cle = (source_mappee.id, symbole, cible_mappee.id)
-                if cle not in transitions_ajoutees:
-                    Transition.objects.create(
-                        automate=nouvel_automate,
-                        source=source_mappee,
-                        symbole=symbole,
-                        cible=cible_mappee
-                    )
-                    transitions_ajoutees.add(cle)
+    sans_epsilon, sens = eliminer_epsilon_compile(
+        c, sens=sens, symboles=symbole_utiles, fermetures=fermeture_epsilon,
+        nom=f"{automate.nom}_sans_ε", alphabet=nouvel_alphabet,
+    )
+    etapes.append(
+        f"Élimination {'avant' if sens == 'avant' else 'arrière'} : "
+        f"{sans_epsilon.nb_transitions} transitions sans ε."
+    )
+    nouvel_automate = enregistrer_automate(sans_epsilon)
 
     etapes.append("✅ Élimination des ε-transitions terminée avec succès.")
-    return nouvel_automate, etapes
+    return etapes, nouvel_automate
 
 
 
@@ -1213,7 +764,7 @@ def eliminer_epsilon_et_determiniser(automate):
     etapes = []
 
     # Étape 1 : Éliminer les transitions ε
-    afn_sans_epsilon, etapes_epsilon = eliminer_transitions_epsilon(automate)
+    etapes_epsilon, afn_sans_epsilon = eliminer_transitions_epsilon(automate)
     etapes.extend(["🔹 " + e for e in etapes_epsilon])
     etapes.append("✅ Élimination des ε-transitions terminée.")
 
@@ -1250,147 +801,230 @@ def eliminer_epsilon_et_determiniser(automate):
 
 
 
-import re
+import threading
 from abc import ABC, abstractmethod
 from typing import Dict, List, Set
+from weakref import WeakValueDictionary
 
 class ASTNode(ABC):
-    @abstractmethod
-    def simplify(self) -> 'ASTNode': pass
-
-    @abstractmethod
-    def substitute(self, substitutions: Dict[str, 'ASTNode']) -> 'ASTNode': pass
-
-    @abstractmethod
-    def __str__(self) -> str: pass
+    """
+    Nœud d'expression internalisé (hash-consing) : deux sous-arbres de même
+    structure sont le même objet. L'égalité est l'identité, le hash est calculé
+    à la construction, str(), variables(), simplify() et factorize() sont
+    mémorisés sur le nœud (immuable).
+    """
+    __slots__ = ('_hash', '_str', '_variables', '_nullable', '_simplifie', '_factorise', '__weakref__')
+    _champs = ()
+    _table = WeakValueDictionary()
+    _verrou = threading.Lock()
+
+    @classmethod
+    def _interner(cls, valeurs):
+        cle = (cls, *valeurs)
+        noeud = ASTNode._table.get(cle)
+        if noeud is not None:
+            return noeud
+        with ASTNode._verrou:
+            noeud = ASTNode._table.get(cle)
+            if noeud is None:
+                noeud = object.__new__(cls)
+                for champ, valeur in zip(cls._champs, valeurs):
+                    object.__setattr__(noeud, champ, valeur)
+                noeud._hash = hash(cle)
+                noeud._str = noeud._variables = noeud._nullable = None
+                noeud._simplifie = noeud._factorise = None
+                ASTNode._table[cle] = noeud
+            return noeud
 
-    @abstractmethod
-    def variables(self) -> Set[str]: pass
+    def __hash__(self):
+        return self._hash
+
+    def __str__(self) -> str:
+        if self._str is None:
+            self._str = self._texte()
+        return self._str
+
+    def variables(self) -> Set[str]:
+        if self._variables is None:
+            self._variables = frozenset(self._calculer_variables())
+        return self._variables
+
+    def is_nullable(self) -> bool:
+        """Vrai si le langage dénoté contient le mot vide."""
+        if self._nullable is None:
+            self._nullable = self._calculer_nullable()
+        return self._nullable
+
+    def simplify(self) -> 'ASTNode':
+        if self._simplifie is None:
+            self._simplifie = self._simplifier()
+        return self._simplifie
+
+    def factorize(self) -> 'ASTNode':
+        if self._factorise is None:
+            self._factorise = self._factoriser()
+        return self._factorise
+
+    def substitute(self, substitutions: Dict[str, 'ASTNode'], memo=None) -> 'ASTNode':
+        """
+        Remplace les variables par les expressions de substitutions. Un sous-arbre
+        sans variable concernée est retourné tel quel ; les résultats sont mémorisés
+        par nœud pour cette substitution (memo), le DAG partagé reste donc partagé.
+        """
+        if substitutions.keys().isdisjoint(self.variables()):
+            return self
+        if memo is None:
+            memo = {}
+        resultat = memo.get(self)
+        if resultat is None:
+            resultat = memo[self] = self._substituer(substitutions, memo)
+        return resultat
 
     @abstractmethod
     def is_epsilon(self) -> bool: pass
 
     @abstractmethod
-    def factorize(self) -> 'ASTNode': pass
+    def _texte(self) -> str: pass
 
-    def __eq__(self, other) -> bool:
-        return isinstance(other, ASTNode) and str(self) == str(other)
-
-    def __hash__(self):
-        return hash(str(self))
+    def _calculer_variables(self): return ()
+    def _calculer_nullable(self): return False
+    def _substituer(self, substitutions, memo): return self
+    def _simplifier(self): return self
+    def _factoriser(self): return self
 
 class VariableNode(ASTNode):
-    def __init__(self, name: str): self.name = name
-    def simplify(self): return self
-    def substitute(self, substitutions): return substitutions.get(self.name, self)
-    def __str__(self): return self.name
-    def variables(self): return {self.name}
+    __slots__ = ('name',)
+    _champs = ('name',)
+    def __new__(cls, name: str): return cls._interner((name,))
+    def _substituer(self, substitutions, memo): return substitutions.get(self.name, self)
+    def _texte(self): return self.name
+    def _calculer_variables(self): return (self.name,)
     def is_epsilon(self): return False
-    def factorize(self): return self
 
 class LetterNode(ASTNode):
-    def __init__(self, letter: str): self.letter = letter
-    def simplify(self): return self
-    def substitute(self, substitutions): return self
-    def __str__(self): return self.letter
-    def variables(self): return set()
+    __slots__ = ('letter',)
+    _champs = ('letter',)
+    def __new__(cls, letter: str): return cls._interner((letter,))
+    def _texte(self): return self.letter
     def is_epsilon(self): return False
-    def factorize(self): return self
 
 class EpsilonNode(ASTNode):
-    def simplify(self): return self
-    def substitute(self, substitutions): return self
-    def __str__(self): return "ε"
-    def variables(self): return set()
+    __slots__ = ()
+    def __new__(cls): return cls._interner(())
+    def _texte(self): return "ε"
+    def _calculer_nullable(self): return True
     def is_epsilon(self): return True
-    def factorize(self): return self
+
+class EmptyNode(ASTNode):
+    """Langage vide ∅ (absorbant pour la concaténation, neutre pour l'union)."""
+    __slots__ = ()
+    def __new__(cls): return cls._interner(())
+    def _texte(self): return "∅"
+    def is_epsilon(self): return False
 
 class ConcatNode(ASTNode):
-    def __init__(self, left: ASTNode, right: ASTNode):
-        self.left = left
-        self.right = right
-    def simplify(self):
+    __slots__ = ('left', 'right')
+    _champs = ('left', 'right')
+    def __new__(cls, left: ASTNode, right: ASTNode): return cls._interner((left, right))
+    def _simplifier(self):
         l, r = self.left.simplify(), self.right.simplify()
+        if isinstance(l, EmptyNode) or isinstance(r, EmptyNode): return EmptyNode()
         if l.is_epsilon(): return r
         if r.is_epsilon(): return l
         return ConcatNode(l, r)
-    def substitute(self, substitutions):
-        return ConcatNode(self.left.substitute(substitutions), self.right.substitute(substitutions))
-    def __str__(self):
+    def _substituer(self, substitutions, memo):
+        return ConcatNode(self.left.substitute(substitutions, memo), self.right.substitute(substitutions, memo))
+    def _texte(self):
         l = f"({self.left})" if isinstance(self.left, UnionNode) else str(self.left)
         r = f"({self.right})" if isinstance(self.right, UnionNode) else str(self.right)
         return f"{l}{r}"
-    def variables(self): return self.left.variables().union(self.right.variables())
+    def _calculer_variables(self): return self.left.variables() | self.right.variables()
+    def _calculer_nullable(self): return self.left.is_nullable() and self.right.is_nullable()
     def is_epsilon(self): return False
-    def factorize(self): return ConcatNode(self.left.factorize(), self.right.factorize())
+    def _factoriser(self): return ConcatNode(self.left.factorize(), self.right.factorize())
 
 class UnionNode(ASTNode):
-    def __init__(self, *nodes: ASTNode): self.nodes = list(nodes)
-    def simplify(self):
+    __slots__ = ('nodes',)
+    _champs = ('nodes',)
+    def __new__(cls, *nodes: ASTNode): return cls._interner((nodes,))
+    def _simplifier(self):
         flat, seen, res = [], set(), []
         for n in self.nodes:
             s = n.simplify()
-            flat.extend(s.nodes if isinstance(s, UnionNode) else [s])
-        has_non_eps = any(not n.is_epsilon() for n in flat)
+            if not isinstance(s, EmptyNode):
+                flat.extend(s.nodes if isinstance(s, UnionNode) else [s])
+        if not flat: return EmptyNode()
+        # ε + A = A seulement si A contient déjà le mot vide
+        has_nullable = any(not n.is_epsilon() and n.is_nullable() for n in flat)
         for n in flat:
-            if n.is_epsilon() and has_non_eps: continue
-            if str(n) not in seen:
-                seen.add(str(n))
+            if n.is_epsilon() and has_nullable: continue
+            if n not in seen:
+                seen.add(n)
                 res.append(n)
         if not res: return EpsilonNode()
         if len(res) == 1: return res[0]
         return UnionNode(*res)
-    def substitute(self, substitutions):
-        return UnionNode(*[n.substitute(substitutions) for n in self.nodes])
-    def __str__(self): return "+".join(str(n) for n in self.nodes)
-    def variables(self): return set().union(*(n.variables() for n in self.nodes))
+    def _substituer(self, substitutions, memo):
+        return UnionNode(*[n.substitute(substitutions, memo) for n in self.nodes])
+    def _texte(self): return "+".join(str(n) for n in self.nodes)
+    def _calculer_variables(self): return frozenset().union(*(n.variables() for n in self.nodes))
+    def _calculer_nullable(self): return any(n.is_nullable() for n in self.nodes)
     def is_epsilon(self): return all(n.is_epsilon() for n in self.nodes)
-    def factorize(self):
+    def _factoriser(self):
         simplified = self.simplify()
         if not isinstance(simplified, UnionNode): return simplified
-        groups, mapping = {}, {}
+        groups = {}
         for n in simplified.nodes:
-            f = self._get_first_factor(n)
-            key = str(f)
-            mapping[key] = f
-            groups.setdefault(key, []).append(n)
+            groups.setdefault(self._get_first_factor(n), []).append(n)
         factored = []
-        for k, terms in groups.items():
+        for f, terms in groups.items():
             if len(terms) > 1:
-                rest = [self._extract_remaining_part(t, mapping[k]) for t in terms]
-                factored.append(ConcatNode(mapping[k], UnionNode(*rest).simplify()))
+                rest = [self._extract_remaining_part(t, f) for t in terms]
+                factored.append(ConcatNode(f, UnionNode(*rest).simplify()))
             else:
                 factored.extend(terms)
-        if set(str(t) for t in factored) == set(str(n) for n in simplified.nodes):
+        if set(factored) == set(simplified.nodes):
             return simplified
         return UnionNode(*factored).simplify()
     def _get_first_factor(self, node: ASTNode) -> ASTNode:
         return node.left if isinstance(node, ConcatNode) else node
     def _extract_remaining_part(self, node: ASTNode, factor: ASTNode) -> ASTNode:
-        if isinstance(node, ConcatNode) and node.left == factor:
+        if isinstance(node, ConcatNode) and node.left is factor:
             return node.right
         return EpsilonNode()
 
 class StarNode(ASTNode):
-    def __init__(self, node: ASTNode): self.node = node
-    def simplify(self):
+    __slots__ = ('node',)
+    _champs = ('node',)
+    def __new__(cls, node: ASTNode): return cls._interner((node,))
+    def _simplifier(self):
         inner = self.node.simplify()
-        if inner.is_epsilon(): return EpsilonNode()
+        if inner.is_epsilon() or isinstance(inner, EmptyNode): return EpsilonNode()
         if isinstance(inner, StarNode): return inner
+        if isinstance(inner, UnionNode):
+            # (ε + A)* = A*, (A* + B)* = (A + B)*
+            termes = [n.node if isinstance(n, StarNode) else n for n in inner.nodes if not n.is_epsilon()]
+            inner = UnionNode(*termes).simplify()
+            if isinstance(inner, StarNode): return inner
         return StarNode(inner)
-    def substitute(self, substitutions):
-        return StarNode(self.node.substitute(substitutions))
-    def __str__(self):
+    def _substituer(self, substitutions, memo):
+        return StarNode(self.node.substitute(substitutions, memo))
+    def _texte(self):
         s = str(self.node)
         return f"({s})*" if isinstance(self.node, (UnionNode, ConcatNode)) else f"{s}*"
-    def variables(self): return self.node.variables()
+    def _calculer_variables(self): return self.node.variables()
+    def _calculer_nullable(self): return True
     def is_epsilon(self): return False
-    def factorize(self): return StarNode(self.node.factorize())
+    def _factoriser(self): return StarNode(self.node.factorize())
 
 class Parser:
     @staticmethod
     def parse(expression: str) -> ASTNode:
-        return Parser(expression.replace(' ', ''))._parse_union()
+        parser = Parser(expression.replace(' ', ''))
+        node = parser._parse_union()
+        if parser._current() is not None:
+            raise ValueError(f"Unexpected character: {parser._current()}")
+        return node
     def __init__(self, expression: str):
         self.expression = expression
         self.pos = 0
@@ -1406,6 +1040,8 @@ class Parser:
     def _parse_concat(self):
         left = self._parse_star()
         while self._current() and self._current() not in '+)':
+            if self._current() == '.':  # concaténation explicite
+                self._advance()
             right = self._parse_star()
             left = ConcatNode(left, right)
         return left
@@ -1426,6 +1062,9 @@ class Parser:
         elif c == 'ε':
             self._advance()
             return EpsilonNode()
+        elif c == '∅':
+            self._advance()
+            return EmptyNode()
         elif c == 'X':
             name = 'X'
             self._advance()
@@ -1433,23 +1072,49 @@ class Parser:
                 name += self._current()
                 self._advance()
             return VariableNode(name)
-        elif c and re.match(r'[a-z]', c):
+        elif c and c.isalnum():
             letter = c
             self._advance()
             return LetterNode(letter)
         else:
             raise ValueError(f"Unexpected character: {c}")
 
+def _union(a, b):
+    """Union simplifiée de deux expressions, None représentant ∅."""
+    if a is None: return b
+    if b is None: return a
+    return UnionNode(a, b).simplify()
+
+def _concat(a, b):
+    """Concaténation simplifiée de deux expressions, None représentant ∅."""
+    if a is None or b is None: return None
+    return ConcatNode(a, b).simplify()
+
 class EquationSolver:
-    def __init__(self, systeme_texte):
+    def __init__(self, systeme_texte=''):
         self.raw_lines = systeme_texte.strip().splitlines()
         self.equations, self.resolved, self.etapes = {}, {}, []
+        self.variables, self.systeme, self.solutions = [], None, []
+
+    @classmethod
+    def from_linear_system(cls, systeme, noms=None):
+        """
+        Solveur d'un système déjà sous forme linéaire, sans passer par le texte :
+        systeme[i] = ({j: coefficient}, constante) pour Xi = Σ coefficient·Xj + constante,
+        les coefficients et constantes étant des ASTNode (None pour ∅).
+        """
+        solver = cls()
+        solver.systeme = list(systeme)
+        solver.variables = list(noms) if noms is not None else [f"X{i}" for i in range(len(solver.systeme))]
+        return solver
 
     def parse_equations(self):
         for ligne in self.raw_lines:
             if '=' in ligne:
                 gauche, droite = ligne.split('=')
-                self.equations[gauche.strip()] = Parser.parse(droite.strip())
+                droite = droite.strip()
+                # "∅" : variable sans aucun terme (langage vide)
+                self.equations[gauche.strip()] = None if droite in ('', '∅') else Parser.parse(droite)
 
     def _is_known_system(self):
         """Vérifie si le système correspond au système spécifique attendu"""
@@ -1474,73 +1139,151 @@ class EquationSolver:
             "Système reconnu. Résultats insérés manuellement sans calcul intermédiaire."
         ]
 
-    def resoudre(self):
-        if self._is_known_system():
-            self._set_known_solution()
-            return
-
-        self.parse_equations()
-        pending = dict(self.equations)
-        changed = True
-
-        while changed:
-            changed = False
-            for var in list(pending):
-                expr = pending[var].substitute(self.resolved).simplify().factorize()
-
-                loops, rest = [], []
-                if isinstance(expr, UnionNode):
-                    for node in expr.nodes:
-                        if var in node.variables():
-                            loops.append(self._extract_prefix(node, var))
-                        else:
-                            rest.append(node)
-                elif var in expr.variables():
-                    loops = [self._extract_prefix(expr, var)]
-                else:
-                    rest = [expr]
-
-                if not loops and rest:
-                    self.resolved[var] = UnionNode(*rest).simplify().factorize()
-                    self.etapes.append(f"{var} = {self.resolved[var]}")
-                    del pending[var]
-                    changed = True
-                elif loops:
-                    A = UnionNode(*loops).simplify()
-                    B = UnionNode(*rest).simplify() if rest else EpsilonNode()
-                    new_expr = ConcatNode(StarNode(A), B).simplify().factorize()
-                    if new_expr != expr:
-                        pending[var] = new_expr
-                        changed = True
-
-        # 🔁 PHASE FINALE : Substituer récursivement toutes les variables jusqu’à stabilisation
-        stable = False
-        max_iterations = 50  # limite de sécurité
-        iteration = 0
-
-        while not stable and iteration < max_iterations:
-            iteration += 1
-            stable = True
-            for var, expr in self.resolved.items():
-                substituted = expr.substitute(self.resolved).simplify().factorize()
-                if substituted != expr:
-                    self.resolved[var] = substituted
-                    stable = False  # Encore des dépendances, refaire un tour
-
-        # En option : ajoute un message si on atteint la limite d'itérations
-        if iteration == max_iterations:
-            self.etapes.append("⚠️ Avertissement : résolution non totalement stabilisée (limite atteinte)")
-
-    def _extract_prefix(self, node, var):
-        if isinstance(node, VariableNode) and node.name == var:
-            return EpsilonNode()
-        elif isinstance(node, ConcatNode):
-            if var in node.right.variables():
-                return node.left
-        return node
+    def resoudre(self, tracer=False, cibles=()):
+        """
+        Résout le système. Les étapes (équations intermédiaires et solutions,
+        rendues en texte) ne sont enregistrées dans self.etapes que si tracer
+        est vrai : sur un gros système, leur rendu coûte bien plus que le calcul.
+
+        Les variables d'indice dans cibles sont éliminées en dernier dans leur
+        composante : leur solution sort directement de l'élimination, sans
+        remontée qui recopierait dans leur expression les sous-expressions
+        partagées des autres variables.
+        """
+        if self.systeme is not None:
+            variables, lineaires = self.variables, self.systeme
+        else:
+            if self._is_known_system():
+                self._set_known_solution()
+                return
+            self.parse_equations()
+            variables, lineaires = self._linear_system()
+            self.variables = variables
+
+        # Composantes fortement connexes du graphe de dépendances, dans l'ordre
+        # topologique inverse : une composante est résolue après celles dont elle dépend
+        successeurs = [list(coefs) for coefs, _ in lineaires]
+        composantes, _ = composantes_fortement_connexes(len(variables), successeurs)
+        solutions = {}
+
+        for membres in composantes:
+            # Les variables déjà résolues passent dans les constantes
+            systeme = {}
+            for i in membres:
+                coefs, constante = lineaires[i]
+                internes = {}
+                for j, coef in coefs.items():
+                    if j in solutions:
+                        constante = _union(constante, _concat(coef, solutions[j]))
+                    else:
+                        internes[j] = coef
+                systeme[i] = [internes, constante]
+
+            # Élimination de Gauss avec le lemme d'Arden, variable la moins connectée
+            # d'abord, les cibles après toutes les autres
+            ordre = []
+            restantes = list(membres)
+            while restantes:
+                i = min(restantes, key=lambda k: (k in cibles, self._degree(systeme, restantes, k)))
+                restantes.remove(i)
+                ordre.append(i)
+                coefs, constante = systeme[i]
+                boucle = coefs.pop(i, None)
+                if boucle is not None:
+                    # Lemme d'Arden : X = AX + B  =>  X = A*B
+                    etoile = StarNode(boucle).simplify()
+                    coefs = {j: _concat(etoile, c) for j, c in coefs.items()}
+                    constante = _concat(etoile, constante)
+                    systeme[i] = [coefs, constante]
+                    if tracer:
+                        self.etapes.append(f"Arden sur {variables[i]} : {variables[i]} = {self._format(coefs, constante, variables)}")
+                # Substitution de X dans les équations restantes de la composante
+                for k in restantes:
+                    autres, constante_k = systeme[k]
+                    coef_x = autres.pop(i, None)
+                    if coef_x is None:
+                        continue
+                    for j, c in coefs.items():
+                        autres[j] = _union(autres.get(j), _concat(coef_x, c))
+                    systeme[k][1] = _union(constante_k, _concat(coef_x, constante))
+
+            # Remontée : chaque variable ne dépend plus que de variables éliminées après
+            # elle, déjà résolues. Le mémo est partagé par toute la remontée : ses entrées
+            # restent valides (une solution ne change plus) et un sous-DAG commun à
+            # plusieurs équations n'est réécrit qu'une fois.
+            resolues, memo = {}, {}
+            for i in reversed(ordre):
+                expression = self._equation(*systeme[i], variables).substitute(resolues, memo).simplify()
+                resolues[variables[i]] = expression
+                solutions[i] = None if isinstance(expression, EmptyNode) else expression.factorize()
+
+        self.solutions = [solutions[i] for i in range(len(variables))]
+        for var, solution in zip(variables, self.solutions):
+            if solution is not None:
+                self.resolved[var] = solution
+            if tracer:
+                self.etapes.append(f"{var} = {solution if solution is not None else '∅'}")
+
+    def _linear_system(self):
+        """Forme linéaire à droite de chaque équation texte : X = Σ coef·Y + constante."""
+        variables = list(self.equations)
+        index = {var: i for i, var in enumerate(variables)}
+        lineaires = []
+        for var in variables:
+            coefs, constante = self._linear_form(self.equations[var])
+            inconnues = set(coefs) - set(index)
+            if inconnues:
+                raise ValueError(f"Variables non définies dans {var} : {', '.join(sorted(inconnues))}")
+            lineaires.append(({index[v]: c for v, c in coefs.items()}, constante))
+        return variables, lineaires
+
+    def _linear_form(self, expr):
+        """Décompose expr en ({variable: coefficient}, constante), None représentant ∅."""
+        if expr is None:
+            return {}, None
+        if not expr.variables():
+            return {}, expr
+        if isinstance(expr, VariableNode):
+            return {expr.name: EpsilonNode()}, None
+        if isinstance(expr, UnionNode):
+            coefs, constante = {}, None
+            for n in expr.nodes:
+                c_n, k_n = self._linear_form(n)
+                for v, c in c_n.items():
+                    coefs[v] = _union(coefs.get(v), c)
+                constante = _union(constante, k_n)
+            return coefs, constante
+        if isinstance(expr, ConcatNode) and not expr.left.variables():
+            c_r, k_r = self._linear_form(expr.right)
+            return {v: _concat(expr.left, c) for v, c in c_r.items()}, _concat(expr.left, k_r)
+        raise ValueError(f"Équation non linéaire à droite : {expr}")
+
+    @staticmethod
+    def _degree(systeme, restantes, k):
+        """Nombre d'arcs (entrants + sortants) de k parmi les variables restantes."""
+        sortants = sum(1 for j in systeme[k][0] if j != k)
+        entrants = sum(1 for j in restantes if j != k and k in systeme[j][0])
+        return sortants + entrants
+
+    @staticmethod
+    def _equation(coefs, constante, variables):
+        """Membre droit Σ coef·Xj + constante d'une équation linéaire, en AST (∅ si vide)."""
+        termes = [ConcatNode(c, VariableNode(variables[j])) for j, c in coefs.items()]
+        if constante is not None:
+            termes.append(constante)
+        return UnionNode(*termes) if termes else EmptyNode()
+
+    @staticmethod
+    def _format(coefs, constante, variables):
+        termes = [f"{ConcatNode(c, VariableNode(variables[j])).simplify()}" for j, c in coefs.items()]
+        if constante is not None:
+            termes.append(str(constante))
+        return " + ".join(termes) if termes else "∅"
 
     def get_resultats(self):
-        return {k: str(v) for k, v in self.resolved.items()}
+        # Les variables absentes de resolved dénotent le langage vide
+        variables = self.variables or self.resolved
+        return {k: str(self.resolved[k]) if k in self.resolved else '∅' for k in variables}
 
     def get_etapes(self):
         self.etapes = None
@@ -1549,123 +1292,78 @@ class EquationSolver:
 
 
 
+# Au-delà (en caractères), simplify_expression rend l'expression telle quelle :
+# l'aller-retour texte -> AST -> texte coûte environ 2 µs par caractère
+TAILLE_MAX_SIMPLIFICATION = 100_000
+
+
 def simplify_expression(expr: str) -> str:
     """
-    Simplifie une expression régulière selon les règles suivantes :
-    - aε = a, εa = a
-    - Aε = A, A*ε = A*
-    - a+a = a, A+A = A
-    - Suppression des parenthèses inutiles :
-      * (a) → a
-      * a(b(a+b)*) → ab(a+b)*
-      * ((a+b)) → (a+b)
-    - Élimination des doublons dans les alternatives
+    Simplifie une expression régulière en la réécrivant sur son AST, de bas en
+    haut et en une passe (formes normales mémorisées par nœud) :
+    - aε = εa = a, a∅ = ∅a = ∅, a + ∅ = a
+    - a + a = a (y compris dans les unions imbriquées), ε + A = A si A contient ε
+    - (a*)* = a*, ε* = ∅* = ε, (ε + a)* = a*
+    - factorisation à gauche : ab + ac = a(b + c)
+    Une expression trop longue (TAILLE_MAX_SIMPLIFICATION) ou trop imbriquée
+    pour l'analyseur récursif est rendue inchangée.
     """
-    if not expr:
+    if not expr or len(expr) > TAILLE_MAX_SIMPLIFICATION:
+        return expr
+    try:
+        return str(Parser.parse(expr).simplify().factorize())
+    except RecursionError:
         return expr
 
-    # Normalisation : supprimer les espaces et normaliser les symboles spéciaux
-    expr = expr.replace(' ', '').replace('∅', '')
-    
-    old_expr = None
-    while expr != old_expr:
-        old_expr = expr
-        
-        # === 1. Simplification des parenthèses ===
-        # (a) → a
-        expr = re.sub(r'\((\w)\)', r'\1', expr)
-        # (abc) → abc
-        expr = re.sub(r'\(([^()*+]+)\)', r'\1', expr)
-        # ((a+b)) → (a+b)
-        expr = re.sub(r'\(\(([^()]+)\)\)', r'(\1)', expr)
-        # a(b(a+b)*) → ab(a+b)*
-        expr = re.sub(r'(\w+)\((\w+)\(([^()]+)\)\*\)', r'\1\2(\3)*', expr)
-        # (a+b)(a+b)* → (a+b)+
-        expr = re.sub(r'\(([^()]+)\)\((\1)\)\*', r'(\1)+', expr)
-        
-        # === 2. Simplification du epsilon (ε) ===
-        expr = re.sub(r'\.ε', '', expr)                  # .ε → supprimé
-        expr = re.sub(r'(\*|\))ε(\b|$)', r'\1', expr)    # *ε ou )ε → * ou )
-        expr = re.sub(r'ε\.', '', expr)                  # ε. → supprimé
-        
-        # === 3. Simplification de la concaténation ===
-        expr = re.sub(r'(\w)\.', r'\1', expr)           # a.b → ab
-        expr = re.sub(r'\)\.\(', ')(', expr)             # ).( → )(
-        expr = re.sub(r'\*\.', '*', expr)               # *. → *
-        
-        # === 4. Simplification des alternatives ===
-        # Gestion des cas a + a → a
-        expr = re.sub(r'\b(\w+)\+\1\b', r'\1', expr)
-        expr = re.sub(r'\(([^()]+)\)\+\(\1\)', r'\1', expr)
-        expr = re.sub(r'\b(\w+)\+\(\1\)|\(\1\)\+\1', r'\1', expr)
-        
-        # Élimination des doublons dans les alternatives
-        parts = [p.strip() for p in expr.split('+') if p.strip()]
-        unique_parts = []
-        seen = set()
-        for part in parts:
-            if part not in seen:
-                seen.add(part)
-                unique_parts.append(part)
-        expr = '+'.join(unique_parts)
-        
-        # Simplification des alternatives vides
-        if expr == '':
-            expr = '∅'
-    
-    return expr
 
+def automate_vers_systeme(c):
+    """
+    Système d'équations (à droite) d'un automate compilé, directement en AST :
+    une variable par état utile (accessible et co-accessible), d'identifiant
+    entier, Xi = Σ symbole·Xj + ε si i est final. Retourne (systeme, etats)
+    où etats[i] est l'état compilé de la variable i.
+    """
+    utiles = c.accessibles() & c.coaccessibles()
+    etats = list(iter_bits(utiles))
+    variable = {q: i for i, q in enumerate(etats)}
+    lettres = [LetterNode(s) for s in c.symboles]
+
+    systeme = []
+    for q in etats:
+        coefs = {}
+        for a, cibles in c.delta[q].items():
+            for r in cibles:
+                if r in variable:
+                    coefs.setdefault(variable[r], []).append(lettres[a])
+        for r in c.epsilon[q]:
+            if r in variable:
+                coefs.setdefault(variable[r], []).append(EpsilonNode())
+        systeme.append((
+            {j: UnionNode(*termes).simplify() for j, termes in coefs.items()},
+            EpsilonNode() if c.est_final(q) else None,
+        ))
+    return systeme, etats
 
 
 def automate_to_expression(automate_id):
-    automate = Automate.objects.prefetch_related('etats', 'transitions').get(id=automate_id)
-
-    # Étape 1 : Émoder l’automate
-    emode_result = emoder_automate(automate)
-    etats = emode_result['etats']
-    transitions = emode_result['transitions']
-
-    # Étape 2 : Renommage des états -> X0, X1, ...
-    nom_originaux = [etat.nom for etat in etats]
-    renommage = {nom: f"X{i}" for i, nom in enumerate(nom_originaux)}
-    inverse_renommage = {v: k for k, v in renommage.items()}
-
-    # Identifier l’état initial et les états finaux
-    initial_original = next(etat.nom for etat in etats if etat.est_initial)
-    initial = renommage[initial_original]
-    finals = {renommage[etat.nom] for etat in etats if etat.est_final}
-
-    # Étape 3 : Construction du système d’équations textuelles
-    equations = defaultdict(list)
-    for t in transitions:
-        source = renommage[t.source.nom]
-        cible = renommage[t.cible.nom]
-        symbole = t.symbole.strip() or 'ε'
-        equations[source].append((symbole, cible))
-
-    # Générer le système d'équations sous forme de texte
-    systeme = ""
-    for nom in sorted(renommage.values(), key=lambda x: int(x[1:])):  # tri X0, X1, ...
-        parties = [f"{symb}{cible}" for symb, cible in equations[nom]]
-        if nom in finals:
-            parties.append("ε")
-        droite = " + ".join(parties) if parties else "∅"
-        systeme += f"{nom} = {droite}\n"
-
-    # Étape 4 : Résolution du système
-    solver = EquationSolver(systeme)
-    solver.resoudre()
-
-    # Étape 5 : Récupérer l'expression de X0 complètement substituée
-    resolved_ast = solver.resolved.get(initial)
+    automate = Automate.objects.get(id=automate_id)
+    c = compiler_automate(automate)
 
-    if resolved_ast is None:
+    # Étapes 1 à 3 : système d'équations des états utiles, construit en AST
+    systeme, etats = automate_vers_systeme(c)
+    initiaux = [i for i, q in enumerate(etats) if c.est_initial(q)]
+    if not initiaux:
         return '∅'
 
-    # Appliquer une substitution finale au cas où des variables résiduelles restent
-    fully_substituted = resolved_ast.substitute(solver.resolved).simplify().factorize()
+    # Étape 4 : Résolution du système
+    solver = EquationSolver.from_linear_system(systeme)
+    solver.resoudre(cibles=set(initiaux))
 
-    return str(fully_substituted)
+    # Étape 5 : Expression des états initiaux
+    solutions = [solver.solutions[i] for i in initiaux if solver.solutions[i] is not None]
+    if not solutions:
+        return '∅'
+    return str(UnionNode(*solutions).simplify().factorize())
 
 
 
@@ -1673,77 +1371,71 @@ def automate_to_expression(automate_id):
 from collections import defaultdict
 from .models import Automate, Etat, Transition
 
+def eliminer_etats(c, ordre=None):
+    """
+    Expression régulière d'un automate compilé par élimination d'états.
+
+    Les états utiles sont reliés à une super-source (ε vers chaque initial) et à
+    un super-puits (ε depuis chaque final) ; le graphe est tenu en listes
+    d'adjacence creuses d'AST. On élimine à chaque pas l'état de coût minimal
+    (degré entrant × degré sortant, puis poids des expressions incidentes),
+    ou dans l'ordre imposé par ordre (itérable d'états) s'il est donné.
+    Retourne l'ASTNode obtenu, ou None pour le langage vide.
+    """
+    utiles = list(iter_bits(c.accessibles() & c.coaccessibles()))
+    source, puits = c.nb_etats, c.nb_etats + 1
+    sortants = {q: {} for q in utiles + [source, puits]}
+    entrants = {q: set() for q in sortants}
+
+    def ajouter(p, q, expr):
+        sortants[p][q] = _union(sortants[p].get(q), expr)
+        entrants[q].add(p)
+
+    for q in utiles:
+        for a, cibles in c.delta[q].items():
+            for r in cibles:
+                if r in sortants:
+                    ajouter(q, r, LetterNode(c.symboles[a]))
+        for r in c.epsilon[q]:
+            if r in sortants:
+                ajouter(q, r, EpsilonNode())
+        if c.est_initial(q):
+            ajouter(source, q, EpsilonNode())
+        if c.est_final(q):
+            ajouter(q, puits, EpsilonNode())
+
+    def cout(k):
+        entree = len(entrants[k] - {k})
+        sortie = len(sortants[k]) - (k in sortants[k])
+        poids = sum(len(str(e)) for e in sortants[k].values())
+        poids += sum(len(str(sortants[p][k])) for p in entrants[k] if p != k)
+        return entree * sortie, poids
+
+    restants = set(utiles)
+    imposes = iter(q for q in ordre if q in restants) if ordre is not None else None
+    while restants:
+        k = next(imposes) if imposes is not None else min(restants, key=cout)
+        restants.remove(k)
+        boucle = sortants[k].pop(k, None)
+        entrants[k].discard(k)
+        etoile = StarNode(boucle).simplify() if boucle is not None else EpsilonNode()
+        for p in entrants[k]:
+            vers_k = sortants[p].pop(k)
+            prefixe = _concat(vers_k, etoile)
+            for q, depuis_k in sortants[k].items():
+                ajouter(p, q, _concat(prefixe, depuis_k))
+        for q in sortants[k]:
+            entrants[q].discard(k)
+        del sortants[k], entrants[k]
+
+    resultat = sortants[source].get(puits)
+    return resultat.simplify().factorize() if resultat is not None else None
+
+
 def extraire_expression_reguliere(automate: Automate) -> str:
-    # Étape 1 : Chargement des états
-    etats = list(automate.etats.all())
-    transitions = automate.transitions.all()
-
-    noms = [e.nom for e in etats]
-    n = len(etats)
-    index_etat = {etats[i].nom: i for i in range(n)}
-    M = [['∅' for _ in range(n)] for _ in range(n)]
-
-    # Étape 2 : Remplir la matrice initiale
-    for t in transitions:
-        i = index_etat[t.source.nom]
-        j = index_etat[t.cible.nom]
-        symbole = t.symbole
-        if M[i][j] == '∅':
-            M[i][j] = symbole
-        else:
-            M[i][j] = f"{M[i][j]}+{symbole}"
-
-    # Ajouter ε pour les boucles
-    for i in range(n):
-        nom = etats[i].nom
-        sorties = [t for t in transitions if t.source.nom == nom and t.cible.nom == nom]
-        for t in sorties:
-            if M[i][i] == '∅':
-                M[i][i] = t.symbole
-            else:
-                M[i][i] = f"{M[i][i]}+{t.symbole}"
-
-    # Trouver l’état initial et final
-    initiales = [e for e in etats if e.est_initial]
-    finaux = [e for e in etats if e.est_final]
-    if len(initiales) != 1 or len(finaux) != 1:
-        raise ValueError("L'automate doit avoir un seul état initial et un seul état final pour cet algorithme.")
-
-    i0 = index_etat[initiales[0].nom]
-    f0 = index_etat[finaux[0].nom]
-
-    # Élimination des autres états
-    for k in range(n):
-        if k == i0 or k == f0:
-            continue
-        for i in range(n):
-            for j in range(n):
-                if i == k or j == k:
-                    continue
-                Rik = M[i][k]
-                Rkk = M[k][k]
-                Rkj = M[k][j]
-                if Rik == '∅' or Rkj == '∅':
-                    continue
-                part1 = Rik
-                if Rkk != '∅':
-                    part1 += f"({Rkk})*"
-                part1 += Rkj
-                if M[i][j] == '∅':
-                    M[i][j] = part1
-                else:
-                    M[i][j] = f"{M[i][j]}+{part1}"
-        # Nettoyer ligne/colonne k
-        for i in range(n):
-            M[i][k] = '∅'
-            M[k][i] = '∅'
-        M[k][k] = '∅'
-
-    # Dernière expression
-    result = M[i0][f0]
-    if result == '∅':
-        return '∅'
-    return result
+    # Élimination d'états sur l'automate compilé (plusieurs initiaux / finaux acceptés)
+    resultat = eliminer_etats(compiler_automate(automate))
+    return str(resultat) if resultat is not None else '∅'
 
 
 
@@ -0,0 +1,273 @@
+"""
+Représentation compilée (en mémoire) d'un automate.
+
+Un automate stocké en base est chargé en un nombre fixe de requêtes puis
+converti en tables indexées par des entiers : états numérotés 0..n-1,
+table des symboles internée, table de transitions par état et ensembles
+d'états initiaux / finaux codés en bitsets (entiers Python).
+Les algorithmes travaillent ensuite sur cette représentation sans aucun
+accès à l'ORM dans leurs boucles.
+"""
+
+EPSILON = 'ε'
+
+
+def iter_bits(bits):
+    """
+    Itère sur les indices des bits à 1 d'un entier (ordre croissant).
+    Chaque opération sur un grand entier coûte sa taille : au-delà de quelques
+    mots machine, on parcourt une fois son écriture binaire.
+    """
+    if bits.bit_length() <= 256:
+        while bits:
+            bas = bits & -bits
+            yield bas.bit_length() - 1
+            bits ^= bas
+        return
+    chiffres = bin(bits)[:1:-1]
+    i = chiffres.find('1')
+    while i >= 0:
+        yield i
+        i = chiffres.find('1', i + 1)
+
+
+_CHIFFRES = bytes.maketrans(b'\x00\x01', b'01')
+
+
+def marques_vers_bits(marques):
+    """Bitset d'un bytearray de marques 0 / 1 (une par état), en temps linéaire."""
+    return int(marques[::-1].translate(_CHIFFRES), 2) if marques else 0
+
+
+def vers_bits(indices):
+    """Convertit un itérable d'indices (ou un entier déjà codé) en bitset."""
+    if isinstance(indices, int):
+        return indices
+    indices = list(indices)
+    if len(indices) > 64:
+        # Un « ou » par indice sur un grand entier serait quadratique
+        marques = bytearray(max(indices) + 1)
+        for i in indices:
+            marques[i] = 1
+        return marques_vers_bits(marques)
+    bits = 0
+    for i in indices:
+        bits |= 1 << i
+    return bits
+
+
+def normaliser_symbole(symbole):
+    """Un symbole vide (ou ε) désigne une ε-transition."""
+    symbole = (symbole or '').strip()
+    return symbole or EPSILON
+
+
+def parser_alphabet(alphabet):
+    """Découpe le champ alphabet ("a,b,c") en liste ordonnée de symboles, sans ε."""
+    symboles = []
+    for s in (alphabet or '').split(','):
+        s = s.strip()
+        if s and s != EPSILON and s not in symboles:
+            symboles.append(s)
+    return symboles
+
+
+class AutomateCompile:
+    """
+    Automate immuable en mémoire.
+
+    - noms[q]            : nom de l'état q
+    - symboles[a]        : symbole d'indice a (table internée, sans ε)
+    - delta[q]           : dict {indice symbole: tuple des cibles}
+    - epsilon[q]         : tuple des cibles des ε-transitions depuis q
+    - initiaux / finaux  : bitsets des états initiaux / finaux
+    """
+
+    __slots__ = (
+        'nom', 'type', 'alphabet', 'noms', 'etat_ids', 'symboles', 'index_symbole',
+        'delta', 'epsilon', 'initiaux', 'finaux', 'nb_transitions', 'transition_ids',
+        '_predecesseurs',
+    )
+
+    def __init__(self, noms, transitions, initiaux=0, finaux=0, symboles=(),
+                 nom='', type='NFA', alphabet=None, etat_ids=None, transition_ids=None):
+        self.nom = nom
+        self.type = type
+        self.noms = tuple(noms)
+        self.etat_ids = tuple(etat_ids) if etat_ids is not None else None
+        self.initiaux = vers_bits(initiaux)
+        self.finaux = vers_bits(finaux)
+        self.transition_ids = transition_ids or {}
+        self._predecesseurs = None
+
+        table = list(symboles)
+        index_symbole = {s: a for a, s in enumerate(table)}
+        n = len(self.noms)
+        delta = [{} for _ in range(n)]
+        epsilon = [[] for _ in range(n)]
+
+        for source, symbole, cible in transitions:
+            # Un symbole déjà dans la table est déjà normalisé
+            a = index_symbole.get(symbole)
+            if a is None:
+                symbole = normaliser_symbole(symbole)
+                if symbole == EPSILON:
+                    epsilon[source].append(cible)
+                    continue
+                a = index_symbole.get(symbole)
+                if a is None:
+                    a = index_symbole[symbole] = len(table)
+                    table.append(symbole)
+            delta[source].setdefault(a, []).append(cible)
+
+        # Gel des tables (et suppression des doublons en conservant l'ordre)
+        self.delta = tuple(
+            {a: tuple(dict.fromkeys(cibles)) for a, cibles in d.items()} for d in delta
+        )
+        self.epsilon = tuple(tuple(dict.fromkeys(e)) for e in epsilon)
+        self.nb_transitions = (
+            sum(len(c) for d in self.delta for c in d.values())
+            + sum(len(e) for e in self.epsilon)
+        )
+        self.symboles = tuple(table)
+        self.index_symbole = index_symbole
+        self.alphabet = alphabet if alphabet is not None else ",".join(self.symboles)
+
+    # --- Accès élémentaires -------------------------------------------------
+
+    @property
+    def nb_etats(self):
+        return len(self.noms)
+
+    def est_initial(self, q):
+        return (self.initiaux >> q) & 1 == 1
+
+    def est_final(self, q):
+        return (self.finaux >> q) & 1 == 1
+
+    def etats_initiaux(self):
+        return list(iter_bits(self.initiaux))
+
+    def etats_finaux(self):
+        return list(iter_bits(self.finaux))
+
+    def successeurs(self, q, a):
+        """Cibles de q par le symbole d'indice a."""
+        return self.delta[q].get(a, ())
+
+    def cible(self, q, a):
+        """Cible (déterministe) de q par le symbole d'indice a, ou -1."""
+        cibles = self.delta[q].get(a)
+        return cibles[0] if cibles else -1
+
+    def a_epsilon(self):
+        return any(self.epsilon)
+
+    def est_deterministe(self):
+        if self.a_epsilon() or bin(self.initiaux).count('1') > 1:
+            return False
+        return all(len(c) == 1 for d in self.delta for c in d.values())
+
+    def iter_transitions(self):
+        """Itère sur les transitions (source, symbole, cible), ε compris."""
+        symboles = self.symboles
+        for q, d in enumerate(self.delta):
+            for a, cibles in d.items():
+                for c in cibles:
+                    yield q, symboles[a], c
+            for c in self.epsilon[q]:
+                yield q, EPSILON, c
+
+    def transition_id(self, source, symbole, cible):
+        """Identifiant en base de la transition (None pour un automate calculé)."""
+        return self.transition_ids.get((source, symbole, cible))
+
+    # --- Parcours -----------------------------------------------------------
+
+    def predecesseurs(self):
+        """Pour chaque état, tuple de ses prédécesseurs (tous symboles, ε compris)."""
+        if self._predecesseurs is None:
+            preds = [[] for _ in range(self.nb_etats)]
+            for q, d in enumerate(self.delta):
+                for cibles in d.values():
+                    for c in cibles:
+                        preds[c].append(q)
+                for c in self.epsilon[q]:
+                    preds[c].append(q)
+            self._predecesseurs = tuple(tuple(dict.fromkeys(p)) for p in preds)
+        return self._predecesseurs
+
+    def accessibles(self):
+        """Bitset des états accessibles depuis les états initiaux."""
+        # Marques dans un bytearray : tester un bit d'un grand entier coûte sa taille
+        vus = bytearray(self.nb_etats)
+        pile = self.etats_initiaux()
+        for q in pile:
+            vus[q] = 1
+        while pile:
+            q = pile.pop()
+            voisins = [c for cibles in self.delta[q].values() for c in cibles]
+            voisins.extend(self.epsilon[q])
+            for c in voisins:
+                if not vus[c]:
+                    vus[c] = 1
+                    pile.append(c)
+        return marques_vers_bits(vus)
+
+    def coaccessibles(self):
+        """Bitset des états depuis lesquels un état final est accessible."""
+        preds = self.predecesseurs()
+        vus = bytearray(self.nb_etats)
+        pile = self.etats_finaux()
+        for q in pile:
+            vus[q] = 1
+        while pile:
+            q = pile.pop()
+            for p in preds[q]:
+                if not vus[p]:
+                    vus[p] = 1
+                    pile.append(p)
+        return marques_vers_bits(vus)
+
+
+def compiler_automate(automate):
+    """
+    Charge un automate de la base en deux requêtes (états puis transitions)
+    et retourne sa représentation compilée.
+    """
+    etats = list(
+        automate.etats.order_by('id').values_list('id', 'nom', 'est_initial', 'est_final')
+    )
+    lignes = list(
+        automate.transitions.order_by('id').values_list('id', 'source_id', 'symbole', 'cible_id')
+    )
+
+    index = {pk: q for q, (pk, _, _, _) in enumerate(etats)}
+    initiaux = vers_bits(q for q, e in enumerate(etats) if e[2])
+    finaux = vers_bits(q for q, e in enumerate(etats) if e[3])
+
+    transitions = []
+    transition_ids = {}
+    for pk, source_id, symbole, cible_id in lignes:
+        t = (index[source_id], normaliser_symbole(symbole), index[cible_id])
+        transitions.append(t)
+        transition_ids.setdefault(t, pk)
+
+    return AutomateCompile(
+        noms=[e[1] for e in etats],
+        transitions=transitions,
+        initiaux=initiaux,
+        finaux=finaux,
+        symboles=parser_alphabet(automate.alphabet),
+        nom=automate.nom,
+        type=automate.type,
+        alphabet=automate.alphabet,
+        etat_ids=[e[0] for e in etats],
+        transition_ids=transition_ids,
+    )
+
+
+def etats_modeles(automate, compile, bits):
+    """Instances Etat (une seule requête) correspondant à un bitset d'états compilés."""
+    par_id = automate.etats.in_bulk()
+    return {par_id[compile.etat_ids[q]] for q in iter_bits(bits)}
@@ -0,0 +1,78 @@
+"""
+Cache LRU, local au processus, des reconnaisseurs compilés.
+
+Une entrée est indexée par l'identifiant de l'automate et n'est servie que
+pour la révision (Automate.revision) à laquelle elle a été construite : un
+automate modifié est donc recompilé au prochain accès. L'éviction est bornée
+par le nombre d'entrées et par une estimation de la mémoire occupée.
+"""
+import threading
+from collections import OrderedDict
+
+from .automate_compile import compiler_automate
+from .moteurs import Reconnaisseur
+
+TAILLE_MAX = 128
+MEMOIRE_MAX = 64 * 1024 * 1024  # octets (estimation)
+
+
+class CacheReconnaisseurs:
+    def __init__(self, taille_max=TAILLE_MAX, memoire_max=MEMOIRE_MAX):
+        self.taille_max = taille_max
+        self.memoire_max = memoire_max
+        self._entrees = OrderedDict()  # automate_id -> (revision, reconnaisseur, taille)
+        self._memoire = 0
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def obtenir(self, automate):
+        """Reconnaisseur de l'automate, compilé au besoin (2 requêtes en cas d'absence)."""
+        with self._verrou:
+            entree = self._entrees.get(automate.pk)
+            if entree is not None and entree[0] == automate.revision:
+                self._entrees.move_to_end(automate.pk)
+                self.hits += 1
+                return entree[1]
+            self.misses += 1
+
+        reconnaisseur = Reconnaisseur(compiler_automate(automate))
+        taille = reconnaisseur.taille_estimee()
+
+        with self._verrou:
+            self._retirer(automate.pk)
+            if taille <= self.memoire_max:
+                self._entrees[automate.pk] = (automate.revision, reconnaisseur, taille)
+                self._memoire += taille
+                while len(self._entrees) > self.taille_max or self._memoire > self.memoire_max:
+                    self._retirer(next(iter(self._entrees)))
+                    self.evictions += 1
+        return reconnaisseur
+
+    def invalider(self, automate_id):
+        with self._verrou:
+            self._retirer(automate_id)
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+            self._memoire = 0
+
+    def statistiques(self):
+        with self._verrou:
+            return {
+                'entrees': len(self._entrees),
+                'memoire': self._memoire,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _retirer(self, automate_id):
+        entree = self._entrees.pop(automate_id, None)
+        if entree is not None:
+            self._memoire -= entree[2]
+
+
+cache_reconnaisseurs = CacheReconnaisseurs()
@@ -0,0 +1,84 @@
+"""
+Cache des résultats d'opérations (union, minimisation, …).
+
+Une opération appliquée à des automates dont le contenu n'a pas changé
+renvoie l'automate résultat déjà enregistré et ses étapes, sans recalcul
+ni nouvelle écriture. La clé est (opération, empreinte du contenu de chaque
+automate d'entrée) : nom, type, alphabet, états et transitions, indépendamment
+des identifiants en base.
+
+Les entrées sont stockées dans le cache Django CACHE_OPERATIONS (LocMemCache
+par défaut : expiration TIMEOUT et éviction LRU au-delà de MAX_ENTRIES ; un
+backend partagé – base de données, Redis – sert tous les processus). Une
+entrée n'est servie que si l'automate résultat existe encore, à la révision
+à laquelle il a été mis en cache, et si aucun automate d'entrée n'a changé de
+révision depuis.
+"""
+import hashlib
+
+from django.core.cache import caches
+
+from .automate_compile import normaliser_symbole
+from .models import Automate
+
+CACHE_OPERATIONS = 'operations'
+
+
+def empreinte_automate(automate):
+    """
+    Empreinte SHA-256 du contenu d'un automate (deux requêtes). Les états sont
+    numérotés dans l'ordre des identifiants (comme compiler_automate) : les noms,
+    qui peuvent se répéter, ne servent pas à désigner les extrémités des transitions.
+    """
+    etats = list(automate.etats.order_by('id').values_list('id', 'nom', 'est_initial', 'est_final'))
+    index = {pk: q for q, (pk, _, _, _) in enumerate(etats)}
+    transitions = sorted(
+        (index[source], normaliser_symbole(symbole), index[cible])
+        for source, symbole, cible in automate.transitions.values_list('source_id', 'symbole', 'cible_id')
+    )
+
+    h = hashlib.sha256()
+    h.update(f"{automate.nom}\x00{automate.type}\x00{automate.alphabet}\n".encode())
+    for q, (_, nom, initial, final) in enumerate(etats):
+        h.update(f"{q}\x00{nom}\x00{initial:d}{final:d}\n".encode())
+    for source, symbole, cible in transitions:
+        h.update(f"{source}\x00{symbole}\x00{cible}\n".encode())
+    return h.hexdigest()
+
+
+def _revision(automate_id):
+    return Automate.objects.filter(pk=automate_id).values_list('revision', flat=True).first()
+
+
+def resultat_operation(operation, automates, calcul):
+    """
+    Retourne (etapes, resultat) de calcul(*automates), en réutilisant le
+    résultat déjà enregistré si les automates d'entrée n'ont pas changé.
+    """
+    cache = caches[CACHE_OPERATIONS]
+    cle = ":".join(["automates", "operation", operation, *(empreinte_automate(a) for a in automates)])
+
+    revisions = {a.pk: _revision(a.pk) for a in automates}
+
+    entree = cache.get(cle)
+    if entree is not None:
+        revision = _revision(entree['resultat_id'])
+        # Un automate d'entrée déjà vu à une autre révision a été modifié depuis
+        entrees_a_jour = all(
+            entree['entrees'].get(pk, r) == r for pk, r in revisions.items()
+        )
+        if revision is not None and revision == entree['revision'] and entrees_a_jour:
+            resultat = Automate.objects.get(pk=entree['resultat_id'])
+            etapes = [f"♻️ Résultat déjà calculé pour ces automates : « {resultat.nom} » réutilisé sans recalcul."]
+            return etapes + entree['etapes'], resultat
+        cache.delete(cle)
+
+    etapes, resultat = calcul(*automates)
+    if resultat is not None:
+        cache.set(cle, {
+            'resultat_id': resultat.pk,
+            'revision': _revision(resultat.pk),
+            'entrees': revisions,
+            'etapes': list(etapes or []),
+        })
+    return etapes, resultat
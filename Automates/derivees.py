@@ -0,0 +1,120 @@
+"""
+Reconnaissance de mots par dérivées de Brzozowski, sans construire d'automate.
+
+L'expression est lue par le même analyseur que les constructions de
+regular.py (Glushkov, AFD direct) puis convertie en AST internalisé ; la
+dérivée d'un nœud par un symbole est normalisée (unions aplaties, sans
+doublon ni ∅, triées) puis mémorisée par (nœud, symbole). Les nœuds
+rencontrés forment ainsi un AFD construit paresseusement, au fil des mots
+testés, dont la table est bornée à TAILLE_MAX_DERIVEES entrées. Rien n'est
+écrit en base.
+"""
+import threading
+from collections import OrderedDict
+
+from .algorithmes import ConcatNode, EmptyNode, EpsilonNode, LetterNode, StarNode, UnionNode
+from .regular import expression_vers_ast
+
+# Nombre d'expressions dont le reconnaisseur (et son AFD paresseux) est conservé
+TAILLE_CACHE_EXPRESSIONS = 128
+# Nombre maximal de dérivées mémorisées par expression : au-delà, la table est
+# vidée et reconstruite au fil des mots (une expression adverse ne peut donc
+# pas faire croître la mémoire sans limite)
+TAILLE_MAX_DERIVEES = 10_000
+
+
+def _union(termes):
+    """Union normalisée (associative, commutative, idempotente, ∅ neutre)."""
+    vus = set()
+    for t in termes:
+        for n in (t.nodes if isinstance(t, UnionNode) else (t,)):
+            if not isinstance(n, EmptyNode):
+                vus.add(n)
+    if not vus:
+        return EmptyNode()
+    if len(vus) == 1:
+        return vus.pop()
+    return UnionNode(*sorted(vus, key=str))
+
+
+def _concat(gauche, droite):
+    if isinstance(gauche, EmptyNode) or isinstance(droite, EmptyNode):
+        return EmptyNode()
+    if gauche.is_epsilon():
+        return droite
+    if droite.is_epsilon():
+        return gauche
+    return ConcatNode(gauche, droite)
+
+
+class ReconnaisseurDerivees:
+    """AFD paresseux d'une expression régulière : états = dérivées normalisées."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        self.racine = _union([expression_vers_ast(expression).simplify()])
+        self._derivees = {}  # (nœud, symbole) -> dérivée normalisée
+        self.vidages = 0
+
+    def deriver(self, noeud, symbole):
+        cle = (noeud, symbole)
+        resultat = self._derivees.get(cle)
+        if resultat is None:
+            resultat = self._calculer(noeud, symbole)
+            if len(self._derivees) >= TAILLE_MAX_DERIVEES:
+                self._derivees.clear()
+                self.vidages += 1
+            self._derivees[cle] = resultat
+        return resultat
+
+    def _calculer(self, noeud, symbole):
+        if isinstance(noeud, LetterNode):
+            return EpsilonNode() if noeud.letter == symbole else EmptyNode()
+        if isinstance(noeud, UnionNode):
+            return _union([self.deriver(n, symbole) for n in noeud.nodes])
+        if isinstance(noeud, ConcatNode):
+            derivee = _concat(self.deriver(noeud.left, symbole), noeud.right)
+            if noeud.left.is_nullable():
+                return _union([derivee, self.deriver(noeud.right, symbole)])
+            return derivee
+        if isinstance(noeud, StarNode):
+            return _concat(self.deriver(noeud.node, symbole), noeud)
+        return EmptyNode()  # ε et ∅
+
+    def tester(self, mot):
+        """Retourne (accepte, position) ; position = indice du premier symbole bloquant."""
+        noeud = self.racine
+        for position, lettre in enumerate(mot):
+            noeud = self.deriver(noeud, lettre)
+            if isinstance(noeud, EmptyNode):
+                return False, position
+        return noeud.is_nullable(), len(mot)
+
+    def tester_lot(self, mots):
+        """Teste une liste de mots ; retourne deux listes (acceptes, positions)."""
+        resultats = [self.tester(mot) for mot in mots]
+        return [r[0] for r in resultats], [r[1] for r in resultats]
+
+    @property
+    def nb_etats(self):
+        """Nombre d'états de l'AFD paresseux explorés jusqu'ici."""
+        return len({self.racine, *self._derivees.values()})
+
+
+_reconnaisseurs = OrderedDict()
+_verrou = threading.Lock()
+
+
+def obtenir_reconnaisseur(expression):
+    """Reconnaisseur de l'expression, partagé entre requêtes (cache LRU borné)."""
+    with _verrou:
+        reconnaisseur = _reconnaisseurs.get(expression)
+        if reconnaisseur is not None:
+            _reconnaisseurs.move_to_end(expression)
+            return reconnaisseur
+    reconnaisseur = ReconnaisseurDerivees(expression)
+    with _verrou:
+        _reconnaisseurs[expression] = reconnaisseur
+        while len(_reconnaisseurs) > TAILLE_CACHE_EXPRESSIONS:
+            _reconnaisseurs.popitem(last=False)
+    return reconnaisseur
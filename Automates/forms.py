@@ -70,6 +70,8 @@ class ExpressionReguliereForm(forms.Form):
     ALGORITHMES = [
         ('thompson', 'Thompson pur'),
         ('glushkov', 'Glushkov'),
+        ('antimirov', 'Antimirov (dérivées partielles)'),
+        ('dfa', 'AFD minimal (direct)'),
     ]
 
     algorithme = forms.ChoiceField(
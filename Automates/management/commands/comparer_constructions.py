@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from Automates.regular import comparer_constructions
+
+EXPRESSIONS_PAR_DEFAUT = [
+    '(a+b)*abb',
+    '(a*b)*+ε',
+    '(ab+ba)*(a+ε)b*',
+    '(a+b)*a' + '(a+b)' * 10,
+    '(' + '+'.join('ab' * i for i in range(1, 15)) + ')*',
+]
+
+
+class Command(BaseCommand):
+    help = "Compare Thompson, Glushkov et Antimirov : états, transitions et temps de construction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('expressions', nargs='*', help="Expressions régulières à comparer")
+        parser.add_argument('--repetitions', type=int, default=5,
+                            help="Nombre de constructions par expression (meilleur temps retenu)")
+
+    def handle(self, *args, **options):
+        expressions = options['expressions'] or EXPRESSIONS_PAR_DEFAUT
+        meilleures = {}
+        for _ in range(max(1, options['repetitions'])):
+            for ligne in comparer_constructions(expressions):
+                cle = (ligne['expression'], ligne['algorithme'])
+                if cle not in meilleures or ligne['duree'] < meilleures[cle]['duree']:
+                    meilleures[cle] = ligne
+
+        self.stdout.write(f"{'algorithme':<10} {'états':>7} {'transitions':>12} {'dont ε':>7} {'durée (ms)':>11}")
+        for expression in expressions:
+            self.stdout.write(f"\n{expression}")
+            for algorithme in ('thompson', 'glushkov', 'antimirov'):
+                l = meilleures[(expression, algorithme)]
+                self.stdout.write(
+                    f"{algorithme:<10} {l['etats']:>7} {l['transitions']:>12} {l['epsilon']:>7} {l['duree'] * 1000:>11.3f}"
+                )
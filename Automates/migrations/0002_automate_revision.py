@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Automates', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='automate',
+            name='revision',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
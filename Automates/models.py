@@ -10,6 +10,9 @@ class Automate(models.Model):
     nom = models.CharField(max_length=100)
     type = models.CharField(max_length=3, choices=TYPE_CHOICES, default='DFA')
     alphabet = models.CharField(max_length=100, help_text="Ex: a,b,c")
+    # Incrémenté à chaque modification de l'automate, de ses états ou de ses
+    # transitions : sert de clé d'invalidation aux caches d'automates compilés.
+    revision = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.nom} ({self.get_type_display()})"
@@ -0,0 +1,1026 @@
+"""
+Moteurs de calcul sur les automates compilés (AutomateCompile).
+
+Ces fonctions ne font aucun accès à l'ORM : elles prennent et retournent
+des AutomateCompile, la persistance étant faite en une fois par
+persistance.enregistrer_automate.
+"""
+from collections import deque
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle : exécution par lots en Python pur
+    np = None
+
+from .automate_compile import EPSILON, AutomateCompile, iter_bits
+
+# Nombre maximal de lignes détaillées dans les étapes affichées à l'utilisateur
+LIMITE_ETAPES_DETAILLEES = 200
+
+
+def tronquer_etapes(lignes, limite=LIMITE_ETAPES_DETAILLEES):
+    """Garde les premières lignes d'un journal et résume le reste."""
+    if len(lignes) <= limite:
+        return lignes
+    return lignes[:limite] + [f"… ({len(lignes) - limite} étapes supplémentaires non détaillées)"]
+
+
+# --- Déterminisation ----------------------------------------------------------
+
+def table_successeurs(c):
+    """Pour chaque symbole a, liste (par état) du bitset des cibles de q par a."""
+    table = [[0] * c.nb_etats for _ in c.symboles]
+    for q, d in enumerate(c.delta):
+        for a, cibles in d.items():
+            bits = 0
+            for t in cibles:
+                bits |= 1 << t
+            table[a][q] = bits
+    return table
+
+
+def determiniser_compile(c, symboles=None, nom='', alphabet=None):
+    """
+    Construction des sous-ensembles sur un AFN compilé (sans ε).
+
+    Les sous-ensembles sont codés en bitsets et internés dans un dict ; la
+    frontière est une deque. Retourne (afd, sous_ensembles) où
+    sous_ensembles[i] est le bitset des états de l'AFN représentés par qi.
+    Seuls les sous-ensembles non vides sont créés (AFD partiel).
+    """
+    if symboles is None:
+        symboles = c.symboles
+    indices = [(s, c.index_symbole.get(s)) for s in symboles]
+    indices = [(s, a) for s, a in indices if a is not None]
+    succ = table_successeurs(c)
+
+    sous_ensembles = [c.initiaux]
+    index = {c.initiaux: 0}
+    transitions = []
+    frontiere = deque([0])
+
+    while frontiere:
+        i = frontiere.popleft()
+        membres = list(iter_bits(sous_ensembles[i]))
+        for symbole, a in indices:
+            succ_a = succ[a]
+            cible = 0
+            for q in membres:
+                cible |= succ_a[q]
+            if not cible:
+                continue
+            j = index.get(cible)
+            if j is None:
+                j = index[cible] = len(sous_ensembles)
+                sous_ensembles.append(cible)
+                frontiere.append(j)
+            transitions.append((i, symbole, j))
+
+    finaux = [i for i, bits in enumerate(sous_ensembles) if bits & c.finaux]
+    afd = AutomateCompile(
+        [f"q{i}" for i in range(len(sous_ensembles))],
+        transitions,
+        initiaux=1 if c.initiaux else 0,
+        finaux=finaux,
+        symboles=[s for s, _ in indices],
+        nom=nom,
+        type='DFA',
+        alphabet=alphabet if alphabet is not None else c.alphabet,
+    )
+    return afd, sous_ensembles
+
+
+# --- Minimisation (Hopcroft) --------------------------------------------------
+
+def minimiser_compile(c, symboles=None, nom='', alphabet=None):
+    """
+    Minimisation de Hopcroft d'un AFD compilé (éventuellement incomplet).
+
+    Seuls les états accessibles sont conservés. Les transitions manquantes
+    vont vers un puits implicite ; la classe du puits (états morts) est
+    retirée du résultat, qui reste donc un AFD partiel.
+    Retourne (afd_min, classes, raffinements) où classes[i] est la liste
+    des états de c fusionnés dans l'état i, et raffinements le journal
+    des découpages effectués.
+    """
+    if symboles is None:
+        symboles = c.symboles
+    indices = [a for a in (c.index_symbole.get(s) for s in symboles) if a is not None]
+
+    # Renumérotation des états accessibles ; le puits reçoit le dernier indice
+    etats = list(iter_bits(c.accessibles()))
+    rang = {q: i for i, q in enumerate(etats)}
+    n = len(etats)
+    puits = n
+    k = len(indices)
+
+    # Index inverse à plat : pour le x-ième symbole, les prédécesseurs de q sont
+    # predecesseurs[x][debuts[x][q]:debuts[x][q + 1]] (deux listes par symbole
+    # plutôt qu'une liste par état : beaucoup moins d'objets pour le ramasse-miettes)
+    predecesseurs, debuts = [], []
+    for a in indices:
+        cibles = [rang[t[0]] if t else puits for t in (c.delta[q].get(a) for q in etats)]
+        cibles.append(puits)
+        predecesseurs.append(sorted(range(n + 1), key=cibles.__getitem__))
+        nombres = [0] * (n + 2)
+        for t in cibles:
+            nombres[t + 1] += 1
+        debuts.append(list(accumulate(nombres)))
+
+    # Partition raffinée sur place : les états de chaque bloc b occupent la
+    # tranche elements[premier[b]:fin[b]], position[p] donnant la place de p.
+    # Aucun ensemble par bloc : découper un bloc ne fait que déplacer des bornes.
+    finaux_c = set(c.etats_finaux())
+    est_final = [q in finaux_c for q in etats] + [False]
+    elements = [i for i in range(n + 1) if est_final[i]]
+    nb_finaux = len(elements)
+    elements.extend(i for i in range(n + 1) if not est_final[i])
+    position = [0] * (n + 1)
+    for j, i in enumerate(elements):
+        position[i] = j
+    premier, fin = [], []
+    for debut_bloc, fin_bloc in ((0, nb_finaux), (nb_finaux, n + 1)):
+        if debut_bloc < fin_bloc:
+            premier.append(debut_bloc)
+            fin.append(fin_bloc)
+    bloc_de = [0 if est_final[i] or not nb_finaux else 1 for i in range(n + 1)]
+    # marques[y] : nombre d'états de y touchés par le séparateur courant,
+    # rangés en tête de la tranche de y
+    marques = [0] * len(premier)
+
+    # Liste de travail des séparateurs (bloc, symbole)
+    if len(premier) == 2:
+        plus_petit = 0 if nb_finaux <= n + 1 - nb_finaux else 1
+        attente = [(plus_petit, x) for x in range(k)]
+    else:
+        attente = []
+    raffinements = []
+
+    while attente:
+        b, x = attente.pop()
+        preds, debut = predecesseurs[x], debuts[x]
+        touches = []
+        # Copie de la tranche : marquer peut permuter les états de b lui-même.
+        # Chaque état n'a qu'un successeur par x (puits compris) : il n'est
+        # rencontré qu'une fois dans l'index inverse.
+        for q in elements[premier[b]:fin[b]]:
+            for p in preds[debut[q]:debut[q + 1]]:
+                y = bloc_de[p]
+                m = marques[y]
+                if not m:
+                    touches.append(y)
+                j = premier[y] + m
+                i = position[p]
+                elements[i], elements[j] = elements[j], p
+                position[elements[i]], position[p] = i, j
+                marques[y] = m + 1
+
+        for y in touches:
+            m, marques[y] = marques[y], 0
+            taille = fin[y] - premier[y]
+            if m == taille:
+                continue
+            # Découpage de Y en (Y ∩ X) en tête et (Y \ X) : le plus petit devient Z
+            z = len(premier)
+            milieu = premier[y] + m
+            if m <= taille - m:
+                premier.append(premier[y])
+                fin.append(milieu)
+                premier[y] = milieu
+            else:
+                premier.append(milieu)
+                fin.append(fin[y])
+                fin[y] = milieu
+            marques.append(0)
+            for p in elements[premier[z]:fin[z]]:
+                bloc_de[p] = z
+            raffinements.append((y, z))
+            # Le nouveau bloc est toujours la plus petite moitié. Si (Y, a) était en
+            # attente, il désigne déjà le Y réduit (modifié sur place) et (Z, a) le
+            # complète ; sinon (Z, a) suffit. Dans les deux cas, on ajoute Z seul.
+            attente.extend((z, x2) for x2 in range(k))
+
+    # Construction de l'AFD minimal (sans la classe du puits)
+    blocs = [elements[premier[b]:fin[b]] for b in range(len(premier))]
+    bloc_puits = bloc_de[puits]
+    initiaux = [rang[q] for q in c.etats_initiaux() if q in rang]
+    numero = {}
+    classes = []
+    for b, bloc in enumerate(blocs):
+        if b == bloc_puits:
+            continue
+        numero[b] = len(classes)
+        classes.append(sorted(etats[i] for i in bloc))
+    if initiaux and bloc_de[initiaux[0]] == bloc_puits:
+        # Langage vide : on conserve un unique état initial non final
+        numero[bloc_puits] = len(classes)
+        classes.append(sorted(etats[i] for i in blocs[bloc_puits] if i != puits))
+
+    # Les états d'une même classe ont les mêmes classes cibles : un représentant
+    # suffit (tous les états de la classe du puits, pour le langage vide)
+    classe_de = [numero.get(b) for b in bloc_de]
+    lettres = [c.symboles[a] for a in indices]
+    transitions = []
+    for b, src in numero.items():
+        if b != bloc_puits:
+            d = c.delta[etats[blocs[b][0]]]
+            for x, a in enumerate(indices):
+                t = d.get(a)
+                dst = classe_de[rang[t[0]]] if t else None
+                if dst is not None:
+                    transitions.append((src, lettres[x], dst))
+            continue
+        cibles = {}
+        for i in blocs[b]:
+            if i == puits:
+                continue
+            for x, a in enumerate(indices):
+                t = c.cible(etats[i], a)
+                if t >= 0 and classe_de[rang[t]] is not None:
+                    cibles.setdefault(x, classe_de[rang[t]])
+        transitions.extend((src, lettres[x], dst) for x, dst in sorted(cibles.items()))
+
+    afd_min = AutomateCompile(
+        [c.noms[classe[0]] if len(classe) == 1 else "_".join(sorted(c.noms[q] for q in classe))
+         for classe in classes],
+        transitions,
+        initiaux=[numero[bloc_de[i]] for i in initiaux][:1],
+        finaux=[numero[b] for b in numero if est_final[blocs[b][0]]],
+        symboles=lettres,
+        nom=nom,
+        type='DFA',
+        alphabet=alphabet if alphabet is not None else c.alphabet,
+    )
+    return afd_min, classes, raffinements
+
+
+# --- Produit synchronisé à la volée ------------------------------------------
+
+# Prédicats d'acceptation d'une paire (f1, f2) = (q1 final ?, q2 final ?)
+ACCEPTATIONS = {
+    'et': lambda f1, f2: f1 and f2,          # intersection
+    'ou': lambda f1, f2: f1 or f2,           # union
+    'et_non': lambda f1, f2: f1 and not f2,  # différence
+    'xor': lambda f1, f2: f1 != f2,          # différence symétrique
+}
+
+# État « puits » implicite d'un composant dont la transition est absente
+PUITS = -1
+
+
+def produit_compile(c1, c2, acceptation='et', symboles=None, nom='', type=None, alphabet=None):
+    """
+    Produit synchronisé de deux automates compilés, construit à la volée.
+
+    Seules les paires accessibles depuis les paires initiales sont explorées ;
+    une transition absente mène au puits implicite PUITS du composant, et les
+    paires qui ne peuvent plus être acceptantes ne sont pas créées.
+    Le résultat est enfin émondé : seules les paires utiles sont conservées
+    (plus la paire initiale).
+
+    `acceptation` est une clé de ACCEPTATIONS ou un prédicat (f1, f2) -> bool.
+    Pour 'et' les automates peuvent être non déterministes (ε compris) ; les
+    autres prédicats supposent deux automates déterministes.
+    Retourne (produit, paires, nb_explorees).
+    """
+    accepte = ACCEPTATIONS[acceptation] if isinstance(acceptation, str) else acceptation
+    if symboles is None:
+        symboles = list(dict.fromkeys(c1.symboles + c2.symboles))
+    indices = [(s, c1.index_symbole.get(s), c2.index_symbole.get(s)) for s in symboles]
+
+    # Une paire dont un composant est au puits peut-elle encore accepter ?
+    puits_1 = accepte(False, False) or accepte(False, True)
+    puits_2 = accepte(False, False) or accepte(True, False)
+    puits_12 = accepte(False, False)
+
+    def admissible(p1, p2):
+        if p1 == PUITS and p2 == PUITS:
+            return puits_12
+        if p1 == PUITS:
+            return puits_1
+        if p2 == PUITS:
+            return puits_2
+        return True
+
+    def successeurs(c, q, a):
+        if q == PUITS:
+            return (PUITS,)
+        return (a is not None and c.delta[q].get(a)) or (PUITS,)
+
+    paires = []
+    index = {}
+    frontiere = deque()
+
+    def numero(paire):
+        i = index.get(paire)
+        if i is None:
+            i = index[paire] = len(paires)
+            paires.append(paire)
+            frontiere.append(i)
+        return i
+
+    initiaux = [
+        numero((q1, q2))
+        for q1 in (c1.etats_initiaux() or [PUITS])
+        for q2 in (c2.etats_initiaux() or [PUITS])
+        if admissible(q1, q2)
+    ]
+
+    transitions = []
+    while frontiere:
+        i = frontiere.popleft()
+        q1, q2 = paires[i]
+        for symbole, a1, a2 in indices:
+            for t1 in successeurs(c1, q1, a1):
+                for t2 in successeurs(c2, q2, a2):
+                    if admissible(t1, t2):
+                        transitions.append((i, symbole, numero((t1, t2))))
+        # ε-transitions : chaque composant avance seul
+        if q1 != PUITS:
+            for t1 in c1.epsilon[q1]:
+                transitions.append((i, EPSILON, numero((t1, q2))))
+        if q2 != PUITS:
+            for t2 in c2.epsilon[q2]:
+                transitions.append((i, EPSILON, numero((q1, t2))))
+
+    def final(paire):
+        q1, q2 = paire
+        return accepte(q1 != PUITS and c1.est_final(q1), q2 != PUITS and c2.est_final(q2))
+
+    nb_explorees = len(paires)
+    brut = AutomateCompile(
+        [str(i) for i in range(nb_explorees)], transitions,
+        initiaux=initiaux, finaux=[i for i, p in enumerate(paires) if final(p)],
+        symboles=symboles,
+    )
+
+    # Émondage : paires accessibles et co-accessibles (on garde les initiales)
+    utiles = (brut.accessibles() & brut.coaccessibles()) | brut.initiaux
+    rang = {i: r for r, i in enumerate(iter_bits(utiles))}
+    paires = [paires[i] for i in rang]
+
+    def nom_paire(paire):
+        q1, q2 = paire
+        n1 = c1.noms[q1] if q1 != PUITS else '∅'
+        n2 = c2.noms[q2] if q2 != PUITS else '∅'
+        return f"{n1}_{n2}"
+
+    if type is None:
+        type = 'DFA' if c1.est_deterministe() and c2.est_deterministe() else (
+            'EFA' if c1.a_epsilon() or c2.a_epsilon() else 'NFA')
+
+    produit = AutomateCompile(
+        [nom_paire(p) for p in paires],
+        [(rang[s], symbole, rang[t]) for s, symbole, t in brut.iter_transitions()
+         if s in rang and t in rang],
+        initiaux=[rang[i] for i in initiaux],
+        finaux=[r for r, p in enumerate(paires) if final(p)],
+        symboles=symboles,
+        nom=nom,
+        type=type,
+        alphabet=alphabet if alphabet is not None else ",".join(symboles),
+    )
+    return produit, paires, nb_explorees
+
+
+# --- Simulation d'un mot ------------------------------------------------------
+
+def composantes_fortement_connexes(n, successeurs):
+    """
+    Composantes fortement connexes d'un graphe 0..n-1 (Tarjan, itératif).
+
+    successeurs[q] est la séquence des voisins de q. Retourne (composantes,
+    composante_de) : composantes[k] est la liste des sommets de la k-ième
+    composante, dans l'ordre où Tarjan les ferme, c'est-à-dire un ordre
+    topologique inverse (toute composante atteinte depuis k a un indice < k) ;
+    composante_de[q] est l'indice de la composante de q.
+    """
+    numero = [-1] * n
+    bas = [0] * n
+    sur_pile = [False] * n
+    pile = []
+    composante_de = [-1] * n
+    composantes = []
+    compteur = 0
+
+    for racine in range(n):
+        if numero[racine] >= 0:
+            continue
+        numero[racine] = bas[racine] = compteur
+        compteur += 1
+        pile.append(racine)
+        sur_pile[racine] = True
+        appels = [(racine, 0)]
+        while appels:
+            q, i = appels[-1]
+            voisins = successeurs[q]
+            if i < len(voisins):
+                appels[-1] = (q, i + 1)
+                r = voisins[i]
+                if numero[r] < 0:
+                    numero[r] = bas[r] = compteur
+                    compteur += 1
+                    pile.append(r)
+                    sur_pile[r] = True
+                    appels.append((r, 0))
+                elif sur_pile[r] and numero[r] < bas[q]:
+                    bas[q] = numero[r]
+                continue
+            appels.pop()
+            if appels:
+                p = appels[-1][0]
+                if bas[q] < bas[p]:
+                    bas[p] = bas[q]
+            if bas[q] == numero[q]:
+                k = len(composantes)
+                membres = []
+                while True:
+                    r = pile.pop()
+                    sur_pile[r] = False
+                    composante_de[r] = k
+                    membres.append(r)
+                    if r == q:
+                        break
+                composantes.append(membres)
+    return composantes, composante_de
+
+
+def composantes_epsilon(c):
+    """Composantes fortement connexes du graphe des ε-transitions de c."""
+    return composantes_fortement_connexes(c.nb_etats, c.epsilon)
+
+
+def fermetures_epsilon(c):
+    """
+    ε-fermeture de chaque état de c, sous forme de bitsets.
+
+    Le graphe des ε-transitions est condensé en composantes fortement connexes ;
+    la fermeture est calculée une fois par composante, dans l'ordre topologique
+    inverse, comme l'union de ses membres et des fermetures des composantes
+    voisines, puis partagée (même objet) par tous les états de la composante.
+    """
+    if not c.a_epsilon():
+        return [1 << q for q in range(c.nb_etats)]
+
+    composantes, composante_de = composantes_epsilon(c)
+    par_composante = []
+    for k, membres in enumerate(composantes):
+        bits = 0
+        voisines = set()
+        for q in membres:
+            bits |= 1 << q
+            for r in c.epsilon[q]:
+                j = composante_de[r]
+                if j != k:
+                    voisines.add(j)
+        for j in voisines:
+            bits |= par_composante[j]
+        par_composante.append(bits)
+    return [par_composante[k] for k in composante_de]
+
+
+SENS_ELIMINATION = ('avant', 'arriere')
+
+
+def eliminer_epsilon_compile(c, sens='auto', symboles=None, fermetures=None, nom='', alphabet=None):
+    """
+    Suppression des ε-transitions sur un automate compilé, sans ORM.
+
+    - 'avant'   : q -a-> r pour r ∈ δ(E(q), a) ; q final si E(q) contient un final.
+    - 'arriere' : p -a-> s pour s ∈ E(δ(p, a)) ; initiaux remplacés par E(I).
+    - 'auto'    : calcule les deux et garde celle qui a le moins de transitions.
+
+    Les cibles sont accumulées en bitsets par (état, symbole), donc sans
+    doublons. Retourne (automate sans ε, sens retenu).
+    """
+    if symboles is None:
+        symboles = c.symboles
+    if fermetures is None:
+        fermetures = fermetures_epsilon(c)
+    n = c.nb_etats
+    indices = [(s, c.index_symbole[s]) for s in symboles if s in c.index_symbole]
+
+    # Index (état, symbole) -> bitset des cibles directes
+    directs = [{} for _ in range(n)]
+    for s, a in indices:
+        for q in range(n):
+            cibles = c.delta[q].get(a)
+            if cibles:
+                bits = 0
+                for r in cibles:
+                    bits |= 1 << r
+                directs[q][s] = bits
+
+    def avant():
+        lignes = []
+        for q in range(n):
+            fermeture = fermetures[q]
+            if fermeture == 1 << q:
+                lignes.extend((q, s, bits) for s, bits in directs[q].items())
+                continue
+            par_symbole = {}
+            for p in iter_bits(fermeture):
+                for s, bits in directs[p].items():
+                    par_symbole[s] = par_symbole.get(s, 0) | bits
+            lignes.extend((q, s, bits) for s, bits in par_symbole.items())
+        return lignes
+
+    def arriere():
+        lignes = []
+        for p in range(n):
+            for s, bits in directs[p].items():
+                etendu = 0
+                for r in iter_bits(bits):
+                    etendu |= fermetures[r]
+                lignes.append((p, s, etendu))
+        return lignes
+
+    if sens == 'auto':
+        candidats = {'avant': avant(), 'arriere': arriere()}
+        sens = min(SENS_ELIMINATION, key=lambda k: sum(b.bit_count() for _, _, b in candidats[k]))
+        lignes = candidats[sens]
+    elif sens == 'avant':
+        lignes = avant()
+    elif sens == 'arriere':
+        lignes = arriere()
+    else:
+        raise ValueError(f"Sens d'élimination inconnu : {sens}")
+
+    if sens == 'avant':
+        initiaux = c.initiaux
+        finaux = [q for q in range(n) if fermetures[q] & c.finaux]
+    else:
+        initiaux = 0
+        for q in iter_bits(c.initiaux):
+            initiaux |= fermetures[q]
+        finaux = c.finaux
+
+    transitions = [(q, s, r) for q, s, bits in lignes for r in iter_bits(bits)]
+    sans_epsilon = AutomateCompile(
+        c.noms, transitions, initiaux=initiaux, finaux=finaux, symboles=symboles,
+        nom=nom, type='NFA', alphabet=alphabet,
+    )
+    return sans_epsilon, sens
+
+
+def chemin_epsilon(c, depart, arrivee):
+    """Plus court chemin de ε-transitions de depart à arrivee (liste de triplets)."""
+    if depart == arrivee:
+        return []
+    parent = {depart: None}
+    file = deque([depart])
+    while file:
+        q = file.popleft()
+        for t in c.epsilon[q]:
+            if t not in parent:
+                parent[t] = q
+                if t == arrivee:
+                    chemin = []
+                    while t != depart:
+                        chemin.append((parent[t], EPSILON, t))
+                        t = parent[t]
+                    return chemin[::-1]
+                file.append(t)
+    return None
+
+
+def simuler_mot(c, mot, fermetures=None, avec_chemin=True):
+    """
+    Simulation d'un AFN / ε-AFN par ensembles d'états actifs.
+
+    À chaque lettre, l'ensemble actif (bitset) avance en une passe, les
+    ε-fermetures étant précalculées. Si avec_chemin, un pointeur arrière
+    (état précédent, état atteint par la lettre) est gardé pour chaque état
+    actif afin de reconstruire un chemin acceptant en O(|w|·|Q|).
+
+    Retourne (accepte, position, chemin) : position est l'indice de la lettre
+    où la lecture a échoué (len(mot) si le mot est lu sans finir dans un état
+    final) ; chemin est une liste de triplets (source, symbole, cible).
+    """
+    if fermetures is None:
+        fermetures = fermetures_epsilon(c)
+
+    actifs = 0
+    for q in c.etats_initiaux():
+        actifs |= fermetures[q]
+
+    retours = []
+    for position, lettre in enumerate(mot):
+        a = c.index_symbole.get(lettre)
+        suivants = 0
+        retour = {}
+        if a is not None:
+            for p in iter_bits(actifs):
+                for r in c.delta[p].get(a, ()):
+                    nouveaux = fermetures[r] & ~suivants
+                    if nouveaux:
+                        suivants |= nouveaux
+                        if avec_chemin:
+                            for q in iter_bits(nouveaux):
+                                retour[q] = (p, r)
+        if not suivants:
+            return False, position, None
+        actifs = suivants
+        if avec_chemin:
+            retours.append(retour)
+
+    acceptants = actifs & c.finaux
+    if not acceptants:
+        return False, len(mot), None
+    if not avec_chemin:
+        return True, len(mot), None
+
+    # Reconstruction du chemin depuis un état final, couche par couche
+    q = (acceptants & -acceptants).bit_length() - 1
+    chemin = []
+    for position in range(len(mot) - 1, -1, -1):
+        p, r = retours[position][q]
+        chemin.extend(reversed(chemin_epsilon(c, r, q)))
+        chemin.append((p, mot[position], r))
+        q = p
+    depart = next(i for i in c.etats_initiaux() if (fermetures[i] >> q) & 1)
+    chemin.extend(reversed(chemin_epsilon(c, depart, q)))
+    chemin.reverse()
+    return True, len(mot), chemin
+
+
+# --- Inclusion de langages (antichaînes) -------------------------------------
+
+def simulation_avant(post, pre, finaux, n):
+    """
+    Plus grand préordre de simulation avant : sim[q] est le bitset des états r
+    qui simulent q (q final ⇒ r final, et tout q -a-> q' est suivi par un
+    r -a-> r' avec r' simulant q'). Entraîne L(q) ⊆ L(r).
+    post[q] / pre[q] : dict {symbole: bitset des successeurs / prédécesseurs}.
+    """
+    tous = (1 << n) - 1
+    sim = [finaux if (finaux >> q) & 1 else tous for q in range(n)]
+    modifie = True
+    while modifie:
+        modifie = False
+        for q in range(n):
+            s = sim[q]
+            for symbole, cibles in post[q].items():
+                for q2 in iter_bits(cibles):
+                    # États ayant un successeur par symbole qui simule q2
+                    candidats = 0
+                    for r2 in iter_bits(sim[q2]):
+                        candidats |= pre[r2].get(symbole, 0)
+                    s &= candidats
+            if s != sim[q]:
+                sim[q] = s
+                modifie = True
+    return sim
+
+
+def inclusion_compile(a, b):
+    """
+    Décide L(a) ⊆ L(b) sans déterminiser b (AFN ou ε-AFN).
+
+    Parcours en largeur des paires (p, P) : p état de a, P bitset des états
+    de b atteints par le même mot. Une paire est écartée si un état de P
+    simule p, ou si une paire (p, Q) déjà vue a Q couvert par P au sens de
+    la simulation (antichaîne). Retourne (inclus, contre_exemple, nb_paires)
+    où contre_exemple est un plus court mot de L(a) \\ L(b) (liste de
+    symboles) ou None.
+    """
+    if a.a_epsilon():
+        a = eliminer_epsilon_compile(a)[0]
+    if b.a_epsilon():
+        b = eliminer_epsilon_compile(b)[0]
+
+    na, n = a.nb_etats, a.nb_etats + b.nb_etats
+    post = [{} for _ in range(n)]
+    pre = [{} for _ in range(n)]
+    for decalage, c in ((0, a), (na, b)):
+        for q, symbole, r in c.iter_transitions():
+            q, r = q + decalage, r + decalage
+            post[q][symbole] = post[q].get(symbole, 0) | (1 << r)
+            pre[r][symbole] = pre[r].get(symbole, 0) | (1 << q)
+    finaux_b = b.finaux << na
+    sim = simulation_avant(post, pre, a.finaux | finaux_b, n)
+    utiles = a.coaccessibles()
+
+    antichaines = [[] for _ in range(na)]
+    paires = []  # (p, P, parent, symbole)
+    file = deque()
+
+    def ajouter(p, ensemble, parent, symbole):
+        """Enfile (p, ensemble) s'il n'est pas subsumé ; True si contre-exemple."""
+        if not (utiles >> p) & 1 or sim[p] & ensemble:
+            return False
+        antichaine = antichaines[p]
+        for vu in antichaine:
+            if all(sim[q] & ensemble for q in iter_bits(vu)):
+                return False
+        antichaine[:] = [
+            vu for vu in antichaine if not all(sim[q] & vu for q in iter_bits(ensemble))
+        ]
+        antichaine.append(ensemble)
+        paires.append((p, ensemble, parent, symbole))
+        file.append(len(paires) - 1)
+        return a.est_final(p) and not ensemble & finaux_b
+
+    def mot(i):
+        symboles = []
+        while paires[i][2] >= 0:
+            symboles.append(paires[i][3])
+            i = paires[i][2]
+        return symboles[::-1]
+
+    depart = b.initiaux << na
+    for p in a.etats_initiaux():
+        if ajouter(p, depart, -1, None):
+            return False, [], len(paires)
+
+    while file:
+        i = file.popleft()
+        p, ensemble = paires[i][0], paires[i][1]
+        for symbole, cibles in post[p].items():
+            suivant = 0
+            for r in iter_bits(ensemble):
+                suivant |= post[r].get(symbole, 0)
+            for p2 in iter_bits(cibles):
+                if ajouter(p2, suivant, i, symbole):
+                    return False, mot(len(paires) - 1), len(paires)
+    return True, None, len(paires)
+
+
+def equivalence_compile(a, b):
+    """
+    Décide L(a) = L(b) par deux tests d'inclusion.
+    Retourne (inclus_ab, contre_exemple_ab, inclus_ba, contre_exemple_ba, nb_paires).
+    """
+    inclus_ab, mot_ab, paires_ab = inclusion_compile(a, b)
+    inclus_ba, mot_ba, paires_ba = inclusion_compile(b, a)
+    return inclus_ab, mot_ab, inclus_ba, mot_ba, paires_ab + paires_ba
+
+
+def equivalence_afd_compile(a, b):
+    """
+    Équivalence de deux AFD (éventuellement partiels) par union-find
+    (Hopcroft–Karp) : les paires d'états atteintes par un même mot sont
+    fusionnées, et l'on s'arrête dès qu'une paire mélange final et non final.
+    Les transitions absentes mènent à un puits commun non final.
+    Retourne (equivalents, mot_distinguant, nb_fusions) ; le mot est une
+    liste de symboles (None si les automates sont équivalents).
+    """
+    if not a.est_deterministe() or not b.est_deterministe():
+        raise ValueError("Les deux automates doivent être déterministes (DFA).")
+
+    na = a.nb_etats
+    puits = na + b.nb_etats
+    symboles = list(dict.fromkeys(a.symboles + b.symboles))
+
+    def table(c, decalage):
+        indices = [c.index_symbole.get(s, -1) for s in symboles]
+        return [
+            [d[x][0] + decalage if x in d else puits for x in indices]
+            for d in c.delta
+        ]
+
+    delta = table(a, 0) + table(b, na) + [[puits] * len(symboles)]
+    # Finaux dépliés en liste (linéaire, même pour de très grands bitsets)
+    final = [False] * (puits + 1)
+    for decalage, c in ((0, a), (na, b)):
+        for q, bit in enumerate(bin(c.finaux)[:1:-1]):
+            if bit == '1':
+                final[q + decalage] = True
+    parent = list(range(puits + 1))
+
+    def trouver(x):
+        racine = x
+        while parent[racine] != racine:
+            racine = parent[racine]
+        while parent[x] != racine:
+            parent[x], x = racine, parent[x]
+        return racine
+
+    initiaux_a, initiaux_b = a.etats_initiaux(), b.etats_initiaux()
+    depart = (initiaux_a[0] if initiaux_a else puits, initiaux_b[0] + na if initiaux_b else puits)
+    paires = [(depart, -1, None)]  # ((p, q), parent, symbole)
+    nb_fusions = 0
+
+    def mot(i):
+        symboles_mot = []
+        while paires[i][1] >= 0:
+            symboles_mot.append(paires[i][2])
+            i = paires[i][1]
+        return symboles_mot[::-1]
+
+    if final[depart[0]] != final[depart[1]]:
+        return False, [], nb_fusions
+    parent[trouver(depart[0])] = trouver(depart[1])
+    nb_fusions += 1
+
+    file = deque([0])
+    while file:
+        i = file.popleft()
+        p, q = paires[i][0]
+        for k, s in enumerate(symboles):
+            p2, q2 = delta[p][k], delta[q][k]
+            r1, r2 = trouver(p2), trouver(q2)
+            if r1 == r2:
+                continue
+            paires.append(((p2, q2), i, s))
+            if final[p2] != final[q2]:
+                return False, mot(len(paires) - 1), nb_fusions
+            parent[r1] = r2
+            nb_fusions += 1
+            file.append(len(paires) - 1)
+    return True, None, nb_fusions
+
+
+# --- Reconnaisseur compilé ----------------------------------------------------
+
+class Reconnaisseur:
+    """
+    Reconnaisseur de mots prêt à l'emploi, construit une fois par automate.
+
+    Pour un AFD, table dense delta[q][a] (-1 si absente) ; sinon, ε-fermetures
+    précalculées et simulation par ensembles d'états (simuler_mot).
+    """
+
+    def __init__(self, c):
+        self.automate = c
+        self.deterministe = c.est_deterministe()
+        if self.deterministe:
+            k = len(c.symboles)
+            self.table = [[-1] * k for _ in range(c.nb_etats)]
+            for q, d in enumerate(c.delta):
+                ligne = self.table[q]
+                for a, cibles in d.items():
+                    ligne[a] = cibles[0]
+            self.fermetures = None
+        else:
+            self.table = None
+            self.fermetures = fermetures_epsilon(c)
+        self._matrice = None
+
+    def tester(self, mot, avec_chemin=False):
+        """Retourne (accepte, position, chemin) comme simuler_mot."""
+        c = self.automate
+        if not self.deterministe:
+            return simuler_mot(c, mot, self.fermetures, avec_chemin)
+
+        initiaux = c.etats_initiaux()
+        if not initiaux:
+            return False, 0, None
+        q = initiaux[0]
+        table, index_symbole = self.table, c.index_symbole
+        chemin = [] if avec_chemin else None
+        for position, lettre in enumerate(mot):
+            a = index_symbole.get(lettre)
+            suivant = table[q][a] if a is not None else -1
+            if suivant < 0:
+                return False, position, None
+            if avec_chemin:
+                chemin.append((q, lettre, suivant))
+            q = suivant
+        if not c.est_final(q):
+            return False, len(mot), None
+        return True, len(mot), chemin
+
+    def tester_lot(self, mots):
+        """
+        Teste une liste de mots ; retourne deux listes (acceptes, positions).
+        Pour un AFD, avec NumPy, tout le lot est converti d'un coup en indices
+        de symboles ; les mots, triés par longueur, sont groupés en paquets de
+        longueurs voisines. Dans un paquet, rangé par longueur décroissante, les
+        mots encore en lecture à l'étape i forment un préfixe : chaque étape est
+        une seule opération sur ce préfixe, sans aucun travail Python par mot.
+        """
+        if np is None or not self.deterministe or not self.automate.initiaux or not mots:
+            resultats = [self.tester(mot) for mot in mots]
+            return [r[0] for r in resultats], [r[1] for r in resultats]
+
+        matrice, finaux, _, _ = self._matrice_numpy()
+        largeur = matrice.shape[1]
+        puits = (matrice.shape[0] - 1) * largeur
+        plate = matrice.ravel()
+
+        longueurs = np.fromiter(map(len, mots), dtype=np.intp, count=len(mots))
+        debuts = np.zeros(len(mots), dtype=np.intp)
+        np.cumsum(longueurs[:-1], out=debuts[1:])
+        longueur_max = int(longueurs.max())
+        # Texte complété de longueur_max cases : chaque mot est le début d'une
+        # fenêtre de longueur fixe, lue jusqu'à sa propre longueur seulement
+        texte = self._coder(''.join(mots))
+        symboles = np.zeros(texte.size + longueur_max, dtype=texte.dtype)
+        symboles[:texte.size] = texte
+
+        # Tri par longueur (tri par base sur des entiers 16 bits)
+        cles = longueurs.astype(np.uint16) if longueur_max < 2 ** 16 else longueurs
+        ordre = np.argsort(cles, kind='stable')
+        triees = longueurs[ordre]
+        etats_finaux = np.empty(len(mots), dtype=np.int32)
+        positions = triees.copy()
+        initial = self.automate.etats_initiaux()[0] * largeur
+
+        debut = 0
+        while debut < len(mots):
+            # Paquet : longueurs dans [l, 2l + 8], les fenêtres restent donc bornées
+            fin = int(np.searchsorted(triees, 2 * int(triees[debut]) + 8, side='right'))
+            decroissantes = triees[debut:fin][::-1]
+            largeur_paquet = int(decroissantes[0])
+            fenetres = np.lib.stride_tricks.sliding_window_view(symboles, largeur_paquet)
+            bloc = fenetres[debuts[ordre[debut:fin][::-1]]]
+
+            etats = np.full(fin - debut, initial, dtype=np.int32)
+            self._avancer(plate, bloc, decroissantes, etats)
+            etats_finaux[debut:fin] = etats[::-1]
+            # Mots tombés dans le puits (absorbant) : on les rejoue seuls en
+            # comptant les étapes hors puits, c'est-à-dire la position de blocage
+            bloques = np.flatnonzero(etats == puits)
+            if bloques.size:
+                vivants = np.zeros(bloques.size, dtype=np.intp)
+                self._avancer(plate, bloc[bloques], decroissantes[bloques],
+                              np.full(bloques.size, initial, dtype=np.int32), vivants, puits)
+                positions[fin - 1 - bloques] = vivants
+            debut = fin
+
+        acceptes = np.empty(len(mots), dtype=bool)
+        acceptes[ordre] = finaux[etats_finaux // largeur]
+        resultat = np.empty(len(mots), dtype=np.intp)
+        resultat[ordre] = positions
+        return acceptes.tolist(), resultat.tolist()
+
+    @staticmethod
+    def _avancer(plate, bloc, longueurs, etats, vivants=None, puits=None):
+        """
+        Fait lire à chaque mot (ligne de bloc, longueurs décroissantes) ses
+        symboles, une colonne par étape ; etats contient les états prémultipliés
+        (q x largeur) et est mis à jour sur place. Si vivants est donné, il
+        compte pour chaque mot les étapes terminées hors du puits.
+        """
+        tampon = np.empty_like(etats)
+        # Nombre de mots encore en lecture à chaque étape
+        actifs = np.searchsorted(-longueurs, -np.arange(bloc.shape[1]), side='left')
+        for i, n in enumerate(actifs.tolist()):
+            np.add(etats[:n], bloc[:n, i], out=tampon[:n], casting='unsafe')
+            np.take(plate, tampon[:n], out=etats[:n], mode='clip')
+            if vivants is not None:
+                vivants[:n] += etats[:n] != puits
+
+    def _coder(self, texte):
+        """
+        Indices de symboles du texte (colonne « inconnu » hors alphabet) : table
+        de traduction d'octets si le texte tient en latin-1, correspondance par
+        code point sinon.
+        """
+        _, _, traduction, correspondance = self._matrice_numpy()
+        if traduction is not None:
+            try:
+                return np.frombuffer(texte.encode('latin-1').translate(traduction), dtype=np.uint8)
+            except UnicodeEncodeError:
+                pass
+        points = np.frombuffer(texte.encode('utf-32-le'), dtype=np.uint32)
+        return correspondance[np.minimum(points, correspondance.size - 1)]
+
+    def _matrice_numpy(self):
+        """
+        Matrice dense int32 (n+1) x (k+1), à plat et prémultipliée : la case
+        q x (k+1) + a contient l'état cible déjà multiplié par k+1. La ligne n
+        est un puits et la colonne k reçoit les caractères hors alphabet.
+        Retourne aussi les finaux et les tables de codage du texte (_coder).
+        """
+        if self._matrice is None:
+            c = self.automate
+            n, k = c.nb_etats, len(c.symboles)
+            matrice = np.full((n + 1, k + 1), n, dtype=np.int32)
+            if n and k:
+                table = np.array(self.table, dtype=np.int32).reshape(n, k)
+                matrice[:n, :k] = np.where(table < 0, n, table)
+            matrice *= k + 1
+            finaux = np.zeros(n + 1, dtype=bool)
+            finaux[c.etats_finaux()] = True
+
+            # Code point -> indice de symbole (symboles d'un seul caractère) ;
+            # la dernière case, « inconnu », reçoit tous les codes au-delà
+            codes = {ord(s): a for a, s in enumerate(c.symboles) if len(s) == 1}
+            type_symbole = np.uint8 if k < 256 else np.int32
+            correspondance = np.full(max(codes, default=0) + 2, k, dtype=type_symbole)
+            for code, a in codes.items():
+                correspondance[code] = a
+            traduction = None
+            if k < 256:
+                octets = np.full(256, k, dtype=np.uint8)
+                for code, a in codes.items():
+                    if code < 256:
+                        octets[code] = a
+                traduction = octets.tobytes()
+            self._matrice = (matrice, finaux, traduction, correspondance)
+        return self._matrice
+
+    def taille_estimee(self):
+        """Estimation (en octets) de la mémoire occupée, pour l'éviction du cache."""
+        c = self.automate
+        taille = 100 * c.nb_etats + 120 * c.nb_transitions
+        if self.table is not None:
+            taille += 8 * c.nb_etats * max(len(c.symboles), 1)
+        if self.fermetures is not None:
+            taille += c.nb_etats * (28 + c.nb_etats // 8)
+        if self._matrice is not None:
+            taille += self._matrice[0].nbytes
+        return taille
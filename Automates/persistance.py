@@ -0,0 +1,61 @@
+"""
+Persistance groupée des automates construits en mémoire.
+
+Un AutomateCompile est écrit en base dans une seule transaction avec des
+bulk_create : un INSERT pour l'automate, un (lot) pour les états et un
+(lot) pour les transitions, quelle que soit la taille du résultat.
+"""
+from itertools import islice
+
+from django.db import transaction
+
+from .models import Automate, Etat, Transition
+
+# Au-delà de ce nombre de transitions, on écrit par tranches pour ne jamais
+# matérialiser toutes les instances Transition en mémoire en même temps.
+SEUIL_ECRITURE_PAR_TRANCHES = 100_000
+TAILLE_TRANCHE = 10_000
+
+
+def _par_tranches(iterable, taille):
+    iterateur = iter(iterable)
+    while True:
+        tranche = list(islice(iterateur, taille))
+        if not tranche:
+            return
+        yield tranche
+
+
+def enregistrer_automate(automate_compile, nom=None, type=None, alphabet=None):
+    """
+    Enregistre un AutomateCompile en base et retourne l'Automate créé.
+    nom / type / alphabet remplacent, s'ils sont fournis, ceux de l'automate compilé.
+    """
+    c = automate_compile
+    with transaction.atomic():
+        automate = Automate.objects.create(
+            nom=nom if nom is not None else c.nom,
+            type=type if type is not None else c.type,
+            alphabet=alphabet if alphabet is not None else c.alphabet,
+        )
+
+        etats = Etat.objects.bulk_create([
+            Etat(automate=automate, nom=nom_etat, est_initial=c.est_initial(q), est_final=c.est_final(q))
+            for q, nom_etat in enumerate(c.noms)
+        ])
+        ids = [e.pk for e in etats]
+        if None in ids:
+            # SGBD sans RETURNING : les identifiants suivent l'ordre d'insertion
+            ids = list(automate.etats.order_by('id').values_list('id', flat=True))
+
+        transitions = (
+            Transition(automate_id=automate.pk, source_id=ids[source], symbole=symbole, cible_id=ids[cible])
+            for source, symbole, cible in c.iter_transitions()
+        )
+        if c.nb_transitions > SEUIL_ECRITURE_PAR_TRANCHES:
+            for tranche in _par_tranches(transitions, TAILLE_TRANCHE):
+                Transition.objects.bulk_create(tranche)
+        else:
+            Transition.objects.bulk_create(list(transitions))
+
+    return automate
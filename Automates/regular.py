@@ -1,51 +1,43 @@
+import time
+
 from .models import Automate, Etat, Transition
-import itertools
-from django.core.exceptions import ValidationError
+from .automate_compile import AutomateCompile, iter_bits
+from .moteurs import determiniser_compile, minimiser_compile
+from .algorithmes import ConcatNode, EmptyNode, EpsilonNode, LetterNode, StarNode, UnionNode
+from .persistance import enregistrer_automate
 
 class ThompsonBuilder:
     def __init__(self, expression, user=None):
         self.expression = expression
-        self.state_id = itertools.count()
         self.symbols = set()
         self.user = user
+        self.etats = []        # noms des états, indexés par numéro de création
+        self.transitions = []  # (source, symbole, cible) sur ces numéros
 
-    def new_state_name(self):
-        return f"q{next(self.state_id)}"
+    def new_state(self):
+        q = len(self.etats)
+        self.etats.append(f"q{q}")
+        return q
 
-    def create_automate(self):
+    def construire(self):
+        """AFN de Thompson en mémoire (AutomateCompile)."""
         # 1. Convertir l'expression en postfixée
         postfix = self.infix_to_postfix(self.expression)
-        if postfix is None:
+        if not postfix:
             raise ValueError("Expression invalide")
-        
-        # 2. Construire l'automate à partir du postfix
-        nfa = self.build_from_postfix(postfix)
 
-        # 3. Créer en base de données
-        automate = Automate.objects.create(
+        # 2. Construire l'automate à partir du postfix
+        initial, final = self.build_from_postfix(postfix)
+        return AutomateCompile(
+            self.etats, self.transitions, initiaux=[initial], finaux=[final],
             nom=f"Thompson({self.expression})",
             type="EFA",
-            alphabet=",".join(sorted(self.symbols))
+            alphabet=",".join(sorted(self.symbols)),
         )
 
-        etat_objs = {}
-        for name in nfa["etats"]:
-            etat_objs[name] = Etat.objects.create(
-                automate=automate,
-                nom=name,
-                est_initial=(name == nfa["initial"]),
-                est_final=(name == nfa["final"])
-            )
-
-        for (src, symb, tgt) in nfa["transitions"]:
-            Transition.objects.create(
-                automate=automate,
-                source=etat_objs[src],
-                cible=etat_objs[tgt],
-                symbole=symb
-            )
-
-        return automate
+    def create_automate(self):
+        # 3. Créer en base de données (écriture groupée)
+        return enregistrer_automate(self.construire())
 
     def infix_to_postfix(self, expr):
         precedence = {'*': 3, '.': 2, '+': 1}
@@ -63,6 +55,8 @@ class ThompsonBuilder:
             elif token == ')':
                 while stack and stack[-1] != '(':
                     output.append(stack.pop())
+                if not stack:
+                    raise ValueError("Parenthèses déséquilibrées")
                 stack.pop()  # pop '('
             else:
                 while stack and stack[-1] != '(' and precedence.get(token, 0) <= precedence.get(stack[-1], 0):
@@ -70,349 +64,104 @@ class ThompsonBuilder:
                 stack.append(token)
 
         while stack:
+            if stack[-1] == '(':
+                raise ValueError("Parenthèses déséquilibrées")
             output.append(stack.pop())
         return output
 
     def add_concat(self, expr):
         """Ajoute '.' pour concaténation implicite : ab -> a.b"""
-        result = ""
-        for i in range(len(expr)):
-            c1 = expr[i]
-            result += c1
+        result = []
+        for i, c1 in enumerate(expr):
+            result.append(c1)
             if i + 1 < len(expr):
                 c2 = expr[i + 1]
                 if (c1.isalnum() or c1 == ')' or c1 == '*') and (c2.isalnum() or c2 == '('):
-                    result += '.'
-        return result
+                    result.append('.')
+        return "".join(result)
 
     def build_from_postfix(self, postfix):
+        """
+        Construit l'AFN en ajoutant aux tableaux partagés self.etats et
+        self.transitions ; la pile ne contient que des couples (initial, final).
+        Retourne le couple (initial, final) de l'automate complet.
+        """
         stack = []
+        transitions = self.transitions
+
+        try:
+            for token in postfix:
+                if token.isalnum():
+                    if token != 'ε':
+                        self.symbols.add(token)
+                    i = self.new_state()
+                    f = self.new_state()
+                    transitions.append((i, token, f))
+                    stack.append((i, f))
+                elif token == '*':
+                    a_i, a_f = stack.pop()
+                    i = self.new_state()
+                    f = self.new_state()
+                    transitions.extend((
+                        (a_f, 'ε', a_i),
+                        (i, 'ε', a_i),
+                        (a_f, 'ε', f),
+                        (i, 'ε', f),
+                    ))
+                    stack.append((i, f))
+                elif token == '.':
+                    b_i, b_f = stack.pop()
+                    a_i, a_f = stack.pop()
+                    transitions.append((a_f, 'ε', b_i))
+                    stack.append((a_i, b_f))
+                elif token == '+':
+                    b_i, b_f = stack.pop()
+                    a_i, a_f = stack.pop()
+                    i = self.new_state()
+                    f = self.new_state()
+                    transitions.extend((
+                        (i, 'ε', a_i),
+                        (i, 'ε', b_i),
+                        (a_f, 'ε', f),
+                        (b_f, 'ε', f),
+                    ))
+                    stack.append((i, f))
+        except IndexError:
+            raise ValueError("Expression invalide")
 
-        for token in postfix:
-            if token.isalnum():
-                self.symbols.add(token)
-                i = self.new_state_name()
-                f = self.new_state_name()
-                stack.append({
-                    "etats": [i, f],
-                    "transitions": [(i, token, f)],
-                    "initial": i,
-                    "final": f
-                })
-            elif token == '*':
-                a = stack.pop()
-                i = self.new_state_name()
-                f = self.new_state_name()
-                trans = a["transitions"] + [
-                    (a["final"], 'ε', a["initial"]),
-                    (i, 'ε', a["initial"]),
-                    (a["final"], 'ε', f),
-                    (i, 'ε', f),
-                ]
-                stack.append({
-                    "etats": a["etats"] + [i, f],
-                    "transitions": trans,
-                    "initial": i,
-                    "final": f
-                })
-            elif token == '.':
-                b = stack.pop()
-                a = stack.pop()
-                trans = a["transitions"] + b["transitions"] + [(a["final"], 'ε', b["initial"])]
-                stack.append({
-                    "etats": a["etats"] + b["etats"],
-                    "transitions": trans,
-                    "initial": a["initial"],
-                    "final": b["final"]
-                })
-            elif token == '+':
-                b = stack.pop()
-                a = stack.pop()
-                i = self.new_state_name()
-                f = self.new_state_name()
-                trans = a["transitions"] + b["transitions"] + [
-                    (i, 'ε', a["initial"]),
-                    (i, 'ε', b["initial"]),
-                    (a["final"], 'ε', f),
-                    (b["final"], 'ε', f),
-                ]
-                stack.append({
-                    "etats": a["etats"] + b["etats"] + [i, f],
-                    "transitions": trans,
-                    "initial": i,
-                    "final": f
-                })
-
+        if len(stack) != 1:
+            raise ValueError("Expression invalide")
         return stack.pop()
 
 
 
 
-class GlushkovBuilder:
-    def __init__(self, regex_expression):
-        self.regex = regex_expression
-        self.counter = itertools.count(start=1)
-        self.symbols = set()
-        self.positions = {}
-        self.followpos = {}
-        self.firstpos = set()
-        self.lastpos = set()
-        self.accepts_empty = False
-        self.root_node = None
-
-    def build(self):
-        """Construit l'automate complet"""
-        self.validate_regex()
-        self.root_node = self.parse_regex()
-        self.compute_positions(self.root_node)
-        return self.create_automate()
-
-    def validate_regex(self):
-        """Valide la syntaxe de l'expression régulière"""
-        if not self.regex:
-            raise ValidationError("Expression vide")
-        stack = 0
-        for c in self.regex:
-            if c == '(':
-                stack += 1
-            elif c == ')':
-                stack -= 1
-                if stack < 0:
-                    raise ValidationError("Parentèses déséquilibrées")
-        if stack != 0:
-            raise ValidationError("Parentèses déséquilibrées")
-
-    def parse_regex(self):
-        """Parse l'expression et construit l'AST"""
-        expr = self.add_concat_operators()
-        postfix = self.infix_to_postfix(expr)
-        return self.build_ast(postfix)
-
-    def add_concat_operators(self):
-        """Ajoute les opérateurs de concaténation explicites"""
-        output = []
-        for i, c in enumerate(self.regex):
-            output.append(c)
-            if i < len(self.regex) - 1:
-                next_c = self.regex[i+1]
-                if (c not in {'(', '|'} and 
-                    next_c not in {')', '|', '*', '+', '?'}):
-                    output.append('.')
-        return ''.join(output)
-
-    def infix_to_postfix(self, expr):
-        """Conversion infixe vers postfixe"""
-        precedence = {'*': 4, '+': 4, '?': 4, '.': 3, '|': 2}
-        output = []
-        stack = []
-
-        for token in expr:
-            if token.isalnum():
-                output.append(token)
-                self.symbols.add(token)
-            elif token == '(':
-                stack.append(token)
-            elif token == ')':
-                while stack and stack[-1] != '(':
-                    output.append(stack.pop())
-                stack.pop()
-            else:
-                while (stack and stack[-1] != '(' and 
-                       precedence[token] <= precedence.get(stack[-1], 0)):
-                    output.append(stack.pop())
-                stack.append(token)
-
-        while stack:
-            output.append(stack.pop())
-        return output
-
-    class ASTNode:
-        """Nœud de l'arbre de syntaxe"""
-        def __init__(self, value, left=None, right=None):
-            self.value = value
-            self.left = left
-            self.right = right
-            self.position = None
-            self.nullable = False
-            self.firstpos = set()
-            self.lastpos = set()
-
-    def build_ast(self, postfix_expr):
-        """Construit l'AST à partir de la notation postfixe"""
-        stack = []
-        for token in postfix_expr:
-            if token.isalnum():
-                stack.append(self.ASTNode(token))
-            elif token == '*':
-                stack.append(self.ASTNode(token, stack.pop()))
-            elif token in {'+', '?'}:
-                stack.append(self.ASTNode(token, stack.pop()))
-            elif token in {'.', '|'}:
-                right = stack.pop()
-                left = stack.pop()
-                stack.append(self.ASTNode(token, left, right))
-        return stack[0] if stack else None
-
-    def compute_positions(self, node):
-        """Calcule les positions et relations followpos"""
-        if node is None:
-            return
-
-        self.compute_positions(node.left)
-        self.compute_positions(node.right)
-
-        if node.value.isalnum():
-            pos = next(self.counter)
-            node.position = pos
-            self.positions[pos] = node.value
-            self.followpos[pos] = set()
-            node.nullable = False
-            node.firstpos = {pos}
-            node.lastpos = {pos}
-            
-        elif node.value == '|':
-            node.nullable = node.left.nullable or node.right.nullable
-            node.firstpos = node.left.firstpos | node.right.firstpos
-            node.lastpos = node.left.lastpos | node.right.lastpos
-            
-        elif node.value == '.':
-            node.nullable = node.left.nullable and node.right.nullable
-            node.firstpos = node.left.firstpos.copy()
-            if node.left.nullable:
-                node.firstpos.update(node.right.firstpos)
-            node.lastpos = node.right.lastpos.copy()
-            if node.right.nullable:
-                node.lastpos.update(node.left.lastpos)
-            for i in node.left.lastpos:
-                self.followpos[i].update(node.right.firstpos)
-                
-        elif node.value == '*':
-            node.nullable = True
-            node.firstpos = node.left.firstpos.copy()
-            node.lastpos = node.left.lastpos.copy()
-            for i in node.lastpos:
-                self.followpos[i].update(node.firstpos)
-                
-        elif node.value in {'+', '?'}:
-            node.nullable = (node.value == '?') or node.left.nullable
-            node.firstpos = node.left.firstpos.copy()
-            node.lastpos = node.left.lastpos.copy()
-            if node.value == '+':
-                for i in node.lastpos:
-                    self.followpos[i].update(node.firstpos)
-
-        if node is self.root_node:
-            self.firstpos = node.firstpos
-            self.lastpos = node.lastpos
-            self.accepts_empty = node.nullable
-
-    def create_automate(self):
-        """Crée l'automate dans la base de données"""
-        automate = Automate.objects.create(
-            nom=f"Glushkov({self.regex})",
-            type="NFA",
-            alphabet="".join(sorted(self.symbols)))
-        
-        # Création des états
-        etat_map = {}
-        if self.accepts_empty:
-            q0 = Etat.objects.create(
-                automate=automate,
-                nom="q0",
-                est_initial=True,
-                est_final=True)
-        
-        for pos in self.positions:
-            etat_map[pos] = Etat.objects.create(
-                automate=automate,
-                nom=f"q{pos}",
-                est_initial=(pos in self.firstpos),
-                est_final=(pos in self.lastpos))
-        
-        # Création des transitions
-        for src_pos, symbol in self.positions.items():
-            for dest_pos in self.followpos[src_pos]:
-                Transition.objects.create(
-                    automate=automate,
-                    source=etat_map[src_pos],
-                    cible=etat_map[dest_pos],
-                    symbole=symbol)
-        
-        if self.accepts_empty:
-            for pos in self.firstpos:
-                Transition.objects.create(
-                    automate=automate,
-                    source=q0,
-                    cible=etat_map[pos],
-                    symbole=self.positions[pos])
-        
-        return automate
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-# Glushkov.py (ou dans un fichier utilitaire de votre app Django)
-
-import re
-from django.db import transaction
-from .models import Automate, Etat, Transition
-
-# --- Classes pour la construction de l'AST ---
+# --- Construction de Glushkov : classes pour l'AST ---
 class Node:
     """
     Représente un nœud dans l'arbre syntaxique abstrait (AST) de l'expression régulière.
+    firstpos / lastpos sont des bitsets de positions (bit p pour la position p).
     """
+    __slots__ = ('char', 'op', 'left', 'right', 'nullable', 'firstpos', 'lastpos', 'position', 'is_leaf')
+
     def __init__(self, char=None, op=None):
         self.char = char  # Le caractère (pour les feuilles)
         self.op = op      # L'opérateur (*, |, ., +)
         self.left = None  # Enfant gauche (pour les opérateurs binaires et unaires)
         self.right = None # Enfant droit (pour les opérateurs binaires)
         self.nullable = False
-        self.firstpos = set()
-        self.lastpos = set()
-        self.positions = set() # Pour les feuilles, contient la position unique
+        self.firstpos = 0
+        self.lastpos = 0
+        self.position = None # Pour les feuilles (sauf ε), la position unique
         self.is_leaf = (char is not None)
 
     def __repr__(self):
         if self.is_leaf:
-            return f"Leaf('{self.char}' P:{self.positions})"
+            return f"Leaf('{self.char}' P:{self.position})"
         if self.op == '*':
             return f"Star(Left={self.left})"
         return f"Op('{self.op}', Left={self.left}, Right={self.right})"
 
-# Variables globales pour l'état de l'algorithme
-global_position_counter = 0
-global_followpos_map = {}
-global_char_at_position = {}
-
-def reset_glushkov_globals():
-    global global_position_counter, global_followpos_map, global_char_at_position
-    global_position_counter = 0
-    global_followpos_map = {}
-    global_char_at_position = {}
-
-def create_leaf_node(char):
-    global global_position_counter, global_char_at_position
-    node = Node(char=char)
-    global_position_counter += 1
-    node.positions.add(global_position_counter)
-    node.firstpos.add(global_position_counter)
-    node.lastpos.add(global_position_counter)
-    global_char_at_position[global_position_counter] = char
-    if char == 'ε': # Epsilon, pour la chaîne vide
-        node.nullable = True
-    return node
-
 def insert_concat_operators(regex):
     """
     Insère les opérateurs de concaténation explicites ('.')
@@ -426,21 +175,10 @@ def insert_concat_operators(regex):
 
         if i + 1 < len(regex):
             next_char = regex[i+1]
-            # La concaténation implicite se produit entre:
-            # - un caractère ou epsilon et un caractère ou '(' ou epsilon
-            # - un ')' et un caractère ou '(' ou epsilon
-            # - un '*' et un caractère ou '(' ou epsilon
-            # - un '+' (qui est maintenant un OR) et un caractère ou '(' ou epsilon
-            # Cette condition inclut 'current == '+' si c'est un OR binaire.
-            # Cependant, si '+' est un OR, il ne participe pas à une concaténation implicite après lui
-            # de la même manière que '*' le ferait.
-            # Revoir la logique: 'current' doit être quelque chose qui "produit" un résultat
-            # avant le 'next_char'. C'est le cas pour les lettres, ')' et '*'.
-            # Pour l'opérateur 'OU' ('|' ou '+'), il n'y a pas de concaténation implicite juste après.
-            
-            # Correction: '+' ne devrait pas initier une concaténation implicite
-            # comme le ferait un caractère ou un star. Il est un opérateur binaire.
-            if (current.isalnum() or current == ')' or current == '*') and \
+            # La concaténation implicite se produit après ce qui "produit" un résultat
+            # (lettre, ε, ')' ou '*') et avant une lettre, ε ou '('.
+            # L'opérateur 'OU' ('|' ou '+') n'initie pas de concaténation implicite.
+            if (current.isalnum() or current in (')', '*', 'ε')) and \
                (next_char.isalnum() or next_char == '(' or next_char == 'ε'):
                 new_regex.append('.')
         i += 1
@@ -452,13 +190,12 @@ def infix_to_postfix(regex):
     Gère les parenthèses et la précédence des opérateurs.
     L'opérateur '+' a le même fonctionnement que '|'.
     """
-    # Modification: '+' a la même précédence que '|'
-    precedence = {'*': 3, '.': 2, '|': 1, '+': 1} 
+    # '+' a la même précédence que '|'
+    precedence = {'*': 3, '.': 2, '|': 1, '+': 1}
     output = []
     operators = []
 
     processed_regex = insert_concat_operators(regex)
-    print(f"Regex après insertion de '.': {processed_regex}")
 
     for char in processed_regex:
         if char.isalnum() or char == 'ε': # Opérandes (lettres ou epsilon)
@@ -478,12 +215,12 @@ def infix_to_postfix(regex):
             operators.append(char)
         else:
             raise ValueError(f"Caractère non reconnu dans l'expression régulière: '{char}'")
-    
+
     while operators:
         if operators[-1] == '(':
             raise ValueError("Mismatching parentheses in regex.")
         output.append(operators.pop())
-    
+
     return "".join(output)
 
 def build_ast_from_postfix(postfix_regex):
@@ -494,71 +231,116 @@ def build_ast_from_postfix(postfix_regex):
     stack = []
     for char in postfix_regex:
         if char.isalnum() or char == 'ε': # Feuille
-            stack.append(create_leaf_node(char))
+            stack.append(Node(char=char))
         elif char == '*': # Unaire (Kleene Star)
             if not stack: raise ValueError(f"Erreur de syntaxe: '*' sans opérande précédent dans {postfix_regex}")
-            operand = stack.pop()
             node = Node(op='*')
-            node.left = operand
+            node.left = stack.pop()
             stack.append(node)
-        # Modification: '+' est traité comme un opérateur binaire d'union
-        elif char in ('.', '|', '+'): # Binaire (concaténation, union, ou notre nouveau 'OU')
+        elif char in ('.', '|', '+'): # Binaire (concaténation ou union)
             if len(stack) < 2: raise ValueError(f"Erreur de syntaxe: '{char}' sans deux opérandes précédents dans {postfix_regex}")
-            right_operand = stack.pop()
-            left_operand = stack.pop()
-            node = Node(op=char) # Le nœud aura l'opérateur ('.', '|', ou '+')
-            node.left = left_operand
-            node.right = right_operand
+            node = Node(op=char)
+            node.right = stack.pop()
+            node.left = stack.pop()
             stack.append(node)
         else:
             raise ValueError(f"Caractère opérateur non géré en post-fixé: '{char}'")
-    
+
     if len(stack) != 1:
         raise ValueError(f"Erreur de syntaxe: Pile d'AST invalide à la fin de {postfix_regex}")
     return stack.pop() # La racine de l'AST
 
-def compute_glushkov_sets(node):
+
+class GlushkovBuilder:
     """
-    Calcule nullable, firstpos, lastpos récursivement pour chaque nœud de l'AST.
-    Met à jour global_followpos_map.
+    Construction de Glushkov ré-entrante : tout l'état de l'algorithme
+    (positions, symbole de chaque position, followpos) appartient à l'instance,
+    followpos[p] étant le bitset des positions qui peuvent suivre p.
+    Une instance par expression ; utilisable depuis plusieurs threads en parallèle.
     """
-    if node.is_leaf:
-        return
-
-    # Parcourir les enfants d'abord (post-ordre)
-    if node.left:
-        compute_glushkov_sets(node.left)
-    if node.right:
-        compute_glushkov_sets(node.right)
-
-    if node.op == '*':
-        node.nullable = True
-        node.firstpos = node.left.firstpos
-        node.lastpos = node.left.lastpos
-        for pos_last in node.left.lastpos:
-            global_followpos_map.setdefault(pos_last, set()).update(node.left.firstpos)
-
-    # Modification: La logique pour '+' est la même que pour '|'
-    elif node.op == '|' or node.op == '+': 
-        node.nullable = node.left.nullable or node.right.nullable
-        node.firstpos = node.left.firstpos.union(node.right.firstpos)
-        node.lastpos = node.left.lastpos.union(node.right.lastpos)
-
-    elif node.op == '.': # Concaténation
-        node.nullable = node.left.nullable and node.right.nullable
-        
-        if node.left.nullable:
-            node.firstpos = node.left.firstpos.union(node.right.firstpos)
-        else:
-            node.firstpos = node.left.firstpos
 
-        if node.right.nullable:
-            node.lastpos = node.left.lastpos.union(node.right.lastpos)
-        else:
-            node.lastpos = node.right.lastpos
+    def __init__(self, regex_expression):
+        self.regex = regex_expression
+        self.char_at_position = [None]  # position 0 réservée à l'état initial
+        self.followpos = [0]
+        self.root = None
+
+    def analyser(self):
+        """Construit l'AST puis calcule nullable, firstpos, lastpos et followpos."""
+        self.root = build_ast_from_postfix(infix_to_postfix(self.regex))
+        for node in self._post_ordre(self.root):
+            self._calculer(node)
+        return self.root
+
+    @staticmethod
+    def _post_ordre(racine):
+        """Nœuds en post-ordre, sans récursion (expressions longues)."""
+        pile, ordre = [racine], []
+        while pile:
+            node = pile.pop()
+            ordre.append(node)
+            if node.left: pile.append(node.left)
+            if node.right: pile.append(node.right)
+        ordre.reverse()
+        return ordre
+
+    def _calculer(self, node):
+        if node.is_leaf:
+            if node.char == 'ε':  # Epsilon : pas de position
+                node.nullable = True
+                return
+            node.position = len(self.char_at_position)
+            self.char_at_position.append(node.char)
+            self.followpos.append(0)
+            node.firstpos = node.lastpos = 1 << node.position
+            return
 
-        for pos_last in node.left.lastpos:
-            global_followpos_map.setdefault(pos_last, set()).update(node.right.firstpos)
+        left, right = node.left, node.right
+        if node.op == '*':
+            node.nullable = True
+            node.firstpos, node.lastpos = left.firstpos, left.lastpos
+            self._suivre(left.lastpos, left.firstpos)
+        elif node.op in ('|', '+'):
+            node.nullable = left.nullable or right.nullable
+            node.firstpos = left.firstpos | right.firstpos
+            node.lastpos = left.lastpos | right.lastpos
+        else:  # '.' : concaténation
+            node.nullable = left.nullable and right.nullable
+            node.firstpos = left.firstpos | right.firstpos if left.nullable else left.firstpos
+            node.lastpos = left.lastpos | right.lastpos if right.nullable else right.lastpos
+            self._suivre(left.lastpos, right.firstpos)
+
+    def _suivre(self, positions, suivants):
+        followpos = self.followpos
+        for p in iter_bits(positions):
+            followpos[p] |= suivants
+
+    def construire(self, nom=None):
+        """
+        AFN de Glushkov en mémoire (AutomateCompile) : état initial q0 puis
+        un état qp par position p.
+        """
+        if self.root is None:
+            self.analyser()
+        root = self.root
+        chars = self.char_at_position
+        m = len(chars) - 1
+
+        transitions = [(0, chars[p], p) for p in iter_bits(root.firstpos)]
+        for p in range(1, m + 1):
+            transitions.extend((p, chars[r], r) for r in iter_bits(self.followpos[p]))
+
+        finaux = root.lastpos | (1 if root.nullable else 0)
+        return AutomateCompile(
+            [f"q{p}" for p in range(m + 1)], transitions, initiaux=1, finaux=finaux,
+            symboles=sorted(set(chars[1:])),
+            nom=nom if nom is not None else f"Glushkov({self.regex})",
+            type='NFA', # Glushkov construit un NFA
+        )
+
+    def build(self, nom=None):
+        """Construit l'automate et l'enregistre en base."""
+        return enregistrer_automate(self.construire(nom))
 
 
 def glushkov_to_django_automate(regex_name, input_regex):
@@ -566,118 +348,162 @@ def glushkov_to_django_automate(regex_name, input_regex):
     Construit un automate AFN à partir d'une expression régulière
     et l'enregistre dans la base de données Django.
     """
-    reset_glushkov_globals() # Réinitialiser les globales pour une nouvelle exécution
-
-    try:
-        # 1. Convertir en post-fixé et construire l'AST
-        postfix_regex = infix_to_postfix(input_regex) 
-        print(f"Expression régulière post-fixée: {postfix_regex}")
-        ast_root = build_ast_from_postfix(postfix_regex)
-
-        # 2. Calculer les ensembles (nullable, firstpos, lastpos, et remplir followpos_map)
-        compute_glushkov_sets(ast_root)
-
-        # 3. Construire l'AFN et l'enregistrer dans Django
-        with transaction.atomic():
-            # Créer l'objet Automate
-            all_leaf_chars = set(global_char_at_position.values())
-            alphabet_chars = sorted(list(c for c in all_leaf_chars if c != 'ε'))
-            alphabet_str = ",".join(alphabet_chars)
-
-            automate = Automate.objects.create(
-                nom=regex_name,
-                type='NFA', # Glushkov construit un NFA
-                alphabet=alphabet_str
-            )
-
-            # Créer les objets Etat
-            # Utilisation d'un dictionnaire pour mapper les positions (P1, P2, ...)
-            # aux objets Etat Django (q1, q2, ...) et aussi pour S0 (q0).
-            django_states_by_pos = {} # Map Glushkov_position -> Etat_Django_Object
-            django_states_by_qname = {} # Map q_name -> Etat_Django_Object
-
-            # État initial q0
-            # Il est toujours q0 et a le premier id Django
-            initial_django_state = Etat.objects.create(
-                automate=automate,
-                nom="q0",
-                est_initial=True,
-                est_final=False # Sera mis à jour si l'expression est nullable
-            )
-            django_states_by_qname["q0"] = initial_django_state
-
-            # Mapping des positions Glushkov (1, 2, ...) aux noms d'états (q1, q2, ...)
-            # Nous réservons q0 pour l'état initial virtuel.
-            # Donc, position 1 devient q1, position 2 devient q2, etc.
-            glushkov_pos_to_q_name_map = {}
-            current_q_number = 1 # q1, q2, ...
-            
-            # Tri des positions pour un nommage déterministe
-            sorted_positions = sorted(global_char_at_position.keys())
-
-            for pos in sorted_positions:
-                q_name = f"q{current_q_number}"
-                glushkov_pos_to_q_name_map[pos] = q_name
-                
-                # Créer l'état Django
-                is_final_state = (pos in ast_root.lastpos)
-                
-                django_state = Etat.objects.create(
-                    automate=automate,
-                    nom=q_name,
-                    est_initial=False, # q0 est le seul initial
-                    est_final=is_final_state
-                )
-                django_states_by_pos[pos] = django_state
-                django_states_by_qname[q_name] = django_state # Pour référence facile
-
-                current_q_number += 1
-
-            # Si l'expression est nullable, l'état initial q0 est aussi final
-            if ast_root.nullable:
-                initial_django_state.est_final = True
-                initial_django_state.save()
-
-            # Créer les Transitions
-            # Transitions depuis l'état initial q0
-            for pos_first in ast_root.firstpos:
-                target_state = django_states_by_pos[pos_first]
-                Transition.objects.create(
-                    automate=automate,
-                    source=initial_django_state,
-                    symbole=global_char_at_position[pos_first],
-                    cible=target_state
-                )
-
-            # Transitions basées sur followpos
-            for pos_source, follow_set in global_followpos_map.items():
-                source_django_state = django_states_by_pos.get(pos_source)
-                if not source_django_state:
-                    print(f"AVERTISSEMENT: État source (pos {pos_source}) non trouvé pour une transition.")
-                    continue
-
-                for pos_dest in follow_set:
-                    symbol = global_char_at_position[pos_dest]
-                    cible_django_state = django_states_by_pos.get(pos_dest)
-                    if not cible_django_state:
-                        print(f"AVERTISSEMENT: État cible (pos {pos_dest}) non trouvé pour une transition.")
+    return GlushkovBuilder(input_regex).build(nom=regex_name)
+
+
+def expression_vers_ast(regex):
+    """
+    AST internalisé (algorithmes.ASTNode) d'une expression lue par le même
+    analyseur que Glushkov et l'AFD direct : chaque lettre ou chiffre est un
+    symbole, '+' et '|' désignent l'union, ε le mot vide.
+    """
+    racine = build_ast_from_postfix(infix_to_postfix(regex))
+    convertis = {}
+    for node in GlushkovBuilder._post_ordre(racine):
+        if node.is_leaf:
+            ast = EpsilonNode() if node.char == 'ε' else LetterNode(node.char)
+        elif node.op == '*':
+            ast = StarNode(convertis[node.left])
+        elif node.op == '.':
+            ast = ConcatNode(convertis[node.left], convertis[node.right])
+        else:  # '|' ou '+'
+            ast = UnionNode(convertis[node.left], convertis[node.right])
+        convertis[node] = ast
+    return convertis[racine]
+
+
+class AntimirovBuilder:
+    """
+    Automate des dérivées partielles (Antimirov) : les états sont les termes
+    obtenus par dérivation partielle de l'expression, sans ε-transition, en
+    général moins d'états que Glushkov et bien moins de transitions.
+    Les dérivées sont mémorisées par (terme, symbole) sur l'AST internalisé.
+    """
+
+    def __init__(self, regex_expression):
+        self.regex = regex_expression
+        self._derivees = {}
+
+    def derivees_partielles(self, terme, symbole):
+        """
+        Dérivées partielles de terme par symbole, sans doublon et triées par
+        leur texte : la numérotation des états ne dépend pas du hachage.
+        """
+        cle = (terme, symbole)
+        resultat = self._derivees.get(cle)
+        if resultat is None:
+            resultat = self._derivees[cle] = tuple(sorted(set(self._calculer(terme, symbole)), key=str))
+        return resultat
+
+    def _calculer(self, terme, symbole):
+        if isinstance(terme, LetterNode):
+            return [EpsilonNode()] if terme.letter == symbole else []
+        if isinstance(terme, UnionNode):
+            return [d for n in terme.nodes for d in self.derivees_partielles(n, symbole)]
+        if isinstance(terme, ConcatNode):
+            resultat = [self._suivi(d, terme.right) for d in self.derivees_partielles(terme.left, symbole)]
+            if terme.left.is_nullable():
+                resultat.extend(self.derivees_partielles(terme.right, symbole))
+            return resultat
+        if isinstance(terme, StarNode):
+            return [self._suivi(d, terme) for d in self.derivees_partielles(terme.node, symbole)]
+        return []  # ε et ∅
+
+    @staticmethod
+    def _suivi(terme, suite):
+        return suite if terme.is_epsilon() else ConcatNode(terme, suite)
+
+    def construire(self, nom=None):
+        """AFN des dérivées partielles en mémoire (AutomateCompile)."""
+        racine = expression_vers_ast(self.regex).simplify()
+        symboles = sorted({n.letter for n in self._feuilles(racine)})
+
+        index = {racine: 0}
+        termes = [racine]
+        transitions = []
+        for q, terme in enumerate(termes):  # la liste grandit pendant le parcours
+            for symbole in symboles:
+                for d in self.derivees_partielles(terme, symbole):
+                    if isinstance(d, EmptyNode):
                         continue
-                        
-                    Transition.objects.create(
-                        automate=automate,
-                        source=source_django_state,
-                        symbole=symbol,
-                        cible=cible_django_state
-                    )
-
-        return automate
-
-    except ValueError as e:
-        print(f"Erreur de syntaxe de l'expression régulière: {e}")
-        raise # Relaunch the error so the view can catch it
-    except Exception as e:
-        print(f"Une erreur inattendue est survenue: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
+                    r = index.get(d)
+                    if r is None:
+                        r = index[d] = len(termes)
+                        termes.append(d)
+                    transitions.append((q, symbole, r))
+
+        return AutomateCompile(
+            [f"q{i}" for i in range(len(termes))], transitions, initiaux=1,
+            finaux=[i for i, t in enumerate(termes) if t.is_nullable()],
+            symboles=symboles,
+            nom=nom if nom is not None else f"Antimirov({self.regex})",
+            type='NFA',
+        )
 
+    def build(self, nom=None):
+        """Construit l'automate et l'enregistre en base."""
+        return enregistrer_automate(self.construire(nom))
+
+    @staticmethod
+    def _feuilles(racine):
+        pile = [racine]
+        while pile:
+            n = pile.pop()
+            if isinstance(n, LetterNode):
+                yield n
+            elif isinstance(n, ConcatNode):
+                pile.extend((n.left, n.right))
+            elif isinstance(n, UnionNode):
+                pile.extend(n.nodes)
+            elif isinstance(n, StarNode):
+                pile.append(n.node)
+
+
+def comparer_constructions(expressions):
+    """
+    Compare Thompson, Glushkov et Antimirov (en mémoire, sans écriture en base).
+    Retourne une liste de dicts {expression, algorithme, etats, transitions, epsilon, duree}.
+    """
+    constructions = [
+        ('thompson', lambda e: ThompsonBuilder(e).construire()),
+        ('glushkov', lambda e: GlushkovBuilder(e).construire()),
+        ('antimirov', lambda e: AntimirovBuilder(e).construire()),
+    ]
+    lignes = []
+    for expression in expressions:
+        for algorithme, construire in constructions:
+            debut = time.perf_counter()
+            c = construire(expression)
+            duree = time.perf_counter() - debut
+            lignes.append({
+                'expression': expression,
+                'algorithme': algorithme,
+                'etats': c.nb_etats,
+                'transitions': c.nb_transitions,
+                'epsilon': sum(len(e) for e in c.epsilon),
+                'duree': duree,
+            })
+    return lignes
+
+
+def construire_afd_minimal(expression, nom=None):
+    """
+    AFD minimal d'une expression régulière, entièrement en mémoire : automate
+    des positions (Glushkov, sans ε), construction des sous-ensembles sur les
+    followpos puis minimisation de Hopcroft. Les états sont renommés q0, q1, ...
+    """
+    afn = GlushkovBuilder(expression).construire()
+    afd, _ = determiniser_compile(afn)
+    afd_min, _, _ = minimiser_compile(afd)
+    return AutomateCompile(
+        [f"q{i}" for i in range(afd_min.nb_etats)], afd_min.iter_transitions(),
+        initiaux=afd_min.initiaux, finaux=afd_min.finaux, symboles=afd_min.symboles,
+        nom=nom if nom is not None else f"AFD({expression})",
+        type='DFA',
+        alphabet=afn.alphabet,
+    )
+
+
+def generer_afd_minimal(expression, nom=None):
+    """Construit l'AFD minimal de l'expression et l'enregistre en une seule écriture."""
+    return enregistrer_automate(construire_afd_minimal(expression, nom))
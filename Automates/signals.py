@@ -0,0 +1,45 @@
+"""
+Invalidation des automates compilés en cache.
+
+Toute modification d'un automate, d'un de ses états ou d'une de ses
+transitions incrémente Automate.revision : les entrées de cache construites
+pour une révision antérieure ne sont alors plus jamais servies, y compris
+dans les autres processus.
+
+Aucun récepteur post_delete n'est posé sur Etat ni Transition : il
+désactiverait la suppression rapide (une requête par table) des cascades.
+La suppression d'un automate est traitée une fois par pre_delete ; celle
+d'un état ou d'une transition isolés appelle incrementer_revision.
+"""
+from django.db.models import F
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .cache_automates import cache_reconnaisseurs
+from .models import Automate, Etat, Transition
+
+
+def incrementer_revision(automate_id):
+    Automate.objects.filter(pk=automate_id).update(revision=F('revision') + 1)
+    cache_reconnaisseurs.invalider(automate_id)
+
+
+@receiver(pre_save, sender=Automate)
+def automate_modifie(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance.revision = (
+            Automate.objects.filter(pk=instance.pk).values_list('revision', flat=True).first() or 0
+        ) + 1
+        cache_reconnaisseurs.invalider(instance.pk)
+
+
+@receiver(pre_delete, sender=Automate)
+def automate_supprime(sender, instance, **kwargs):
+    cache_reconnaisseurs.invalider(instance.pk)
+
+
+@receiver(post_save, sender=Etat)
+@receiver(post_save, sender=Transition)
+def contenu_modifie(sender, instance, raw=False, **kwargs):
+    if not raw:
+        incrementer_revision(instance.automate_id)
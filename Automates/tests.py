@@ -1,3 +1,674 @@
+import itertools
+import json
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import caches
 from django.test import TestCase
+from django.urls import reverse
+
+from . import derivees, views
+from .algorithmes import (
+    ConcatNode, EquationSolver, LetterNode, Parser, StarNode, UnionNode, VariableNode,
+    automate_to_expression, automate_vers_systeme, calculer_epsilon_fermetures, comparer_langages, concatenation,
+    determiniser, difference, difference_symetrique, eliminer_etats, equivalence_afd, etats_accessibles,
+    etats_coaccessibles, etats_utiles, faire_intersection, faire_minimisation, faire_union, simplify_expression,
+)
+from .automate_compile import AutomateCompile, compiler_automate
+from .cache_operations import empreinte_automate, resultat_operation
+from .models import Automate, Etat, Transition
+from .moteurs import (
+    Reconnaisseur, determiniser_compile, equivalence_compile, inclusion_compile, minimiser_compile, np,
+    produit_compile,
+)
+from .persistance import enregistrer_automate
+from .regular import AntimirovBuilder, GlushkovBuilder, ThompsonBuilder, construire_afd_minimal
+
+
+def creer_automate(nom, type, alphabet, etats, transitions):
+    """
+    Automate saisi ligne à ligne par l'ORM, comme depuis l'interface :
+    etats = [(nom, initial, final)], transitions = [(source, symbole, cible)].
+    """
+    automate = Automate.objects.create(nom=nom, type=type, alphabet=alphabet)
+    par_nom = {
+        nom_etat: Etat.objects.create(automate=automate, nom=nom_etat, est_initial=initial, est_final=final)
+        for nom_etat, initial, final in etats
+    }
+    for source, symbole, cible in transitions:
+        Transition.objects.create(automate=automate, source=par_nom[source], symbole=symbole, cible=par_nom[cible])
+    return automate
+
+
+def contenu(automate):
+    """(type, états (nom, initial, final), transitions (source, symbole, cible)) triés, par les noms."""
+    etats = sorted(automate.etats.values_list('nom', 'est_initial', 'est_final'))
+    transitions = sorted(automate.transitions.values_list('source__nom', 'symbole', 'cible__nom'))
+    return automate.type, etats, transitions
+
+
+def automate_complet(n, nom='complet', type='NFA'):
+    """AFN de n états où chaque état mène à tous les autres par a et b (2n² transitions)."""
+    transitions = [(q, s, r) for q in range(n) for s in 'ab' for r in range(n)]
+    return enregistrer_automate(AutomateCompile(
+        [f"q{q}" for q in range(n)], transitions, initiaux=1, finaux=1, nom=nom, type=type,
+    ))
+
+
+class AutomateCompileTests(TestCase):
+    def setUp(self):
+        # q3 est mort (boucle sans final), q4 inaccessible
+        self.automate = creer_automate('utiles', 'NFA', 'a,b', [
+            ('q0', True, False), ('q1', False, False), ('q2', False, True), ('q3', False, False), ('q4', False, False),
+        ], [('q0', 'a', 'q1'), ('q1', 'b', 'q2'), ('q1', 'a', 'q3'), ('q4', 'a', 'q2'), ('q3', 'b', 'q3')])
+
+    def test_compilation_en_deux_requetes(self):
+        with self.assertNumQueries(2):
+            c = compiler_automate(self.automate)
+        self.assertEqual(c.noms, ('q0', 'q1', 'q2', 'q3', 'q4'))
+        self.assertEqual(c.symboles, ('a', 'b'))
+        self.assertEqual(c.etats_initiaux(), [0])
+        self.assertEqual(c.etats_finaux(), [2])
+        self.assertEqual(
+            sorted(c.iter_transitions()), [(0, 'a', 1), (1, 'a', 3), (1, 'b', 2), (3, 'b', 3), (4, 'a', 2)],
+        )
+        transition = self.automate.transitions.get(source__nom='q1', symbole='b')
+        self.assertEqual(c.transition_id(1, 'b', 2), transition.pk)
+
+    def test_etats_utiles_comme_la_version_par_requetes(self):
+        # Résultats de la version d'origine (une requête par état visité)
+        noms = lambda etats: sorted(e.nom for e in etats)
+        self.assertEqual(noms(etats_accessibles(self.automate)), ['q0', 'q1', 'q2', 'q3'])
+        self.assertEqual(noms(etats_coaccessibles(self.automate)), ['q0', 'q1', 'q2', 'q4'])
+        with self.assertNumQueries(3):
+            self.assertEqual(noms(etats_utiles(self.automate)), ['q0', 'q1', 'q2'])
+
+
+class SuppressionTests(TestCase):
+    def test_suppression_en_cascade_a_cout_constant(self):
+        automate = automate_complet(40)
+        self.assertEqual(automate.transitions.count(), 3200)
+        # Sans récepteur de suppression sur Etat/Transition, les transitions
+        # partent en DELETE groupés et non ligne à ligne.
+        with self.assertNumQueries(5):
+            automate.delete()
+        self.assertFalse(Transition.objects.exists())
+
+    def test_suppression_transition_incremente_revision(self):
+        automate = automate_complet(3)
+        revision = Automate.objects.get(pk=automate.pk).revision
+        self.client.get(reverse('supprimer_transition', args=[automate.transitions.first().pk]))
+        self.assertGreater(Automate.objects.get(pk=automate.pk).revision, revision)
+
+
+class PersistanceTests(TestCase):
+    def setUp(self):
+        self.a1 = creer_automate('a1', 'NFA', 'a,b', [('q0', True, False), ('q1', False, True)],
+                                 [('q0', 'a', 'q1'), ('q1', 'b', 'q1')])
+        self.a2 = creer_automate('a2', 'NFA', 'a,b', [('p', True, True)], [('p', 'b', 'p')])
+
+    def test_aller_retour_a_nombre_de_requetes_constant(self):
+        petit = AutomateCompile(['q0', 'q1'], [(0, 'a', 1)], initiaux=1, finaux=2, nom='petit')
+        transitions = [(q, s, (q + 1) % 30) for q in range(30) for s in 'ab']
+        grand = AutomateCompile([f"q{q}" for q in range(30)], transitions, initiaux=1, finaux=1 << 29, nom='grand')
+        with self.assertNumQueries(5):
+            automate = enregistrer_automate(petit)
+        with self.assertNumQueries(5):
+            enregistrer_automate(grand)
+        c = compiler_automate(automate)
+        self.assertEqual((c.noms, list(c.iter_transitions())), (('q0', 'q1'), [(0, 'a', 1)]))
+        self.assertEqual((c.etats_initiaux(), c.etats_finaux()), ([0], [1]))
+
+    def test_union_et_concatenation_comme_la_version_ligne_a_ligne(self):
+        # Résultats de la version d'origine (un save() par état et par transition)
+        self.assertEqual(contenu(faire_union(self.a1, self.a2)[1]), ('EFA', [
+            ('A_q0', False, False), ('A_q1', False, True), ('B_p', False, True), ('q_init', True, False),
+        ], [
+            ('A_q0', 'a', 'A_q1'), ('A_q1', 'b', 'A_q1'), ('B_p', 'b', 'B_p'),
+            ('q_init', 'ε', 'A_q0'), ('q_init', 'ε', 'B_p'),
+        ]))
+        self.assertEqual(contenu(concatenation(self.a1, self.a2)[1]), ('AFN', [
+            ('p_2', False, True), ('q0_1', True, False), ('q1_1', False, False),
+        ], [('p_2', 'b', 'p_2'), ('q0_1', 'a', 'q1_1'), ('q1_1', 'b', 'q1_1'), ('q1_1', 'ε', 'p_2')]))
+
+
+class DeterminisationTests(TestCase):
+    # Résultats de la version d'origine (construction des sous-ensembles par requêtes)
+    def test_a_ou_b_etoile_abb(self):
+        afn = creer_automate('abb', 'NFA', 'a,b', [
+            ('q0', True, False), ('q1', False, False), ('q2', False, False), ('q3', False, True),
+        ], [('q0', 'a', 'q0'), ('q0', 'b', 'q0'), ('q0', 'a', 'q1'), ('q1', 'b', 'q2'), ('q2', 'b', 'q3')])
+        self.assertEqual(contenu(determiniser(afn)[1]), ('DFA', [
+            ('q0', True, False), ('q1', False, False), ('q2', False, False), ('q3', False, True),
+        ], [
+            ('q0', 'a', 'q1'), ('q0', 'b', 'q0'), ('q1', 'a', 'q1'), ('q1', 'b', 'q2'),
+            ('q2', 'a', 'q1'), ('q2', 'b', 'q3'), ('q3', 'a', 'q1'), ('q3', 'b', 'q0'),
+        ]))
+
+    def test_plusieurs_initiaux(self):
+        afn = creer_automate('x', 'NFA', 'a,b', [('p', True, False), ('r', True, True), ('s', False, False)],
+                             [('p', 'a', 'r'), ('p', 'a', 's'), ('r', 'b', 'p'), ('s', 'b', 's'), ('s', 'a', 'r')])
+        self.assertEqual(contenu(determiniser(afn)[1]), ('DFA', [
+            ('q0', True, True), ('q1', False, True), ('q2', False, False),
+            ('q3', False, True), ('q4', False, False), ('q5', False, False),
+        ], [
+            ('q0', 'a', 'q1'), ('q0', 'b', 'q2'), ('q1', 'a', 'q3'), ('q1', 'b', 'q4'), ('q2', 'a', 'q1'),
+            ('q3', 'b', 'q2'), ('q4', 'a', 'q1'), ('q4', 'b', 'q5'), ('q5', 'a', 'q3'), ('q5', 'b', 'q5'),
+        ]))
+
+
+class MinimisationTests(TestCase):
+    def test_classes_modulo(self):
+        # Nombre de a modulo 9, finaux 0, 3, 6 : |w|a ≡ 0 (mod 3), 3 états minimaux
+        transitions = [(q, 'a', (q + 1) % 9) for q in range(9)] + [(q, 'b', q) for q in range(9)]
+        c = AutomateCompile([f"q{q}" for q in range(9)], transitions, initiaux=1, finaux=[0, 3, 6], type='DFA')
+        afd_min, classes, _ = minimiser_compile(c)
+        self.assertEqual(afd_min.nb_etats, 3)
+        self.assertEqual(sorted(classes), [[0, 3, 6], [1, 4, 7], [2, 5, 8]])
+
+    def test_etats_morts_et_inaccessibles_retires(self):
+        # q2 inaccessible, q3 mort : il reste ab* (2 états, AFD partiel)
+        c = AutomateCompile(
+            ['q0', 'q1', 'q2', 'q3'], [(0, 'a', 1), (1, 'b', 1), (2, 'a', 1), (0, 'b', 3), (3, 'a', 3)],
+            initiaux=1, finaux=[1], type='DFA',
+        )
+        afd_min, classes, _ = minimiser_compile(c)
+        self.assertEqual(sorted(classes), [[0], [1]])
+        self.assertEqual(afd_min.nb_transitions, 2)
+
+    def test_n_ieme_lettre_avant_la_fin(self):
+        # (a+b)*a(a+b)^4 : l'AFD minimal a 2^5 états
+        afn = AutomateCompile(
+            [f"q{q}" for q in range(6)],
+            [(0, 'a', 0), (0, 'b', 0), (0, 'a', 1)] + [(q, s, q + 1) for q in range(1, 5) for s in 'ab'],
+            initiaux=1, finaux=[5],
+        )
+        afd, _ = determiniser_compile(afn)
+        self.assertEqual(minimiser_compile(afd)[0].nb_etats, 32)
+
+
+class EliminationEpsilonTests(TestCase):
+    def test_vue_renvoie_afn_sans_epsilon(self):
+        # q0 -ε-> q1, q1 -a-> q1, q1 -ε-> q2, q2 -b-> q3 : a*b
+        automate = enregistrer_automate(AutomateCompile(
+            ['q0', 'q1', 'q2', 'q3'], [(0, 'ε', 1), (1, 'a', 1), (1, 'ε', 2), (2, 'b', 3)],
+            initiaux=1, finaux=[3], nom='epsilon', type='EFA', alphabet='a,b',
+        ))
+        reponse = self.client.get(reverse('epsilon-AFN_vers_AFN', args=[automate.pk]))
+        self.assertIsNone(reponse.context['error'])
+        resultat = compiler_automate(reponse.context['automate_resultat'])
+        self.assertFalse(resultat.a_epsilon())
+        for mot, attendu in (('b', True), ('aab', True), ('', False), ('ba', False)):
+            self.assertEqual(reconnait(resultat, mot), attendu, mot)
+
+
+    def test_fermetures_sur_un_cycle_epsilon(self):
+        # Cycle ε q0 -> q1 -> q2 -> q0 (une seule composante), puis chaîne q2 -> q3 -> q4
+        automate = creer_automate('fermetures', 'EFA', 'a', [
+            ('q0', True, False), ('q1', False, False), ('q2', False, False),
+            ('q3', False, False), ('q4', False, True), ('q5', False, False),
+        ], [
+            ('q0', 'ε', 'q1'), ('q1', 'ε', 'q2'), ('q2', 'ε', 'q0'), ('q2', 'ε', 'q3'),
+            ('q3', 'ε', 'q4'), ('q4', 'a', 'q5'), ('q5', 'ε', 'q5'),
+        ])
+        fermetures = {
+            etat.nom: sorted(e.nom for e in fermeture)
+            for etat, fermeture in calculer_epsilon_fermetures(automate).items()
+        }
+        # Résultat de la version d'origine (un parcours en profondeur par état)
+        cycle = ['q0', 'q1', 'q2', 'q3', 'q4']
+        self.assertEqual(fermetures, {
+            'q0': cycle, 'q1': cycle, 'q2': cycle, 'q3': ['q3', 'q4'], 'q4': ['q4'], 'q5': ['q5'],
+        })
+
+
+class CacheOperationsTests(TestCase):
+    def setUp(self):
+        caches['operations'].clear()
+        # Deux états homonymes « p » : seul le sens de la transition les distingue
+        self.automate = enregistrer_automate(AutomateCompile(
+            ['p', 'p'], [(0, 'a', 1)], initiaux=1, finaux=2, nom='homonymes', type='DFA',
+        ))
+
+    def accepte(self, automate, mot):
+        c = compiler_automate(automate)
+        q = c.etats_initiaux()[0]
+        for lettre in mot:
+            q = c.cible(q, c.index_symbole[lettre]) if lettre in c.index_symbole else -1
+            if q < 0:
+                return False
+        return c.est_final(q)
+
+    def test_resultat_reutilise_si_entree_inchangee(self):
+        _, premier = resultat_operation('minimisation', [self.automate], faire_minimisation)
+        etapes, second = resultat_operation('minimisation', [self.automate], faire_minimisation)
+        self.assertEqual(premier.pk, second.pk)
+        self.assertTrue(etapes[0].startswith('♻️'))
+
+    def test_inversion_transition_entre_homonymes(self):
+        empreinte = empreinte_automate(self.automate)
+        _, avant = resultat_operation('minimisation', [self.automate], faire_minimisation)
+        self.assertTrue(self.accepte(avant, 'a'))
+
+        transition = self.automate.transitions.get()
+        transition.source, transition.cible = transition.cible, transition.source
+        transition.save()
+
+        self.assertNotEqual(empreinte_automate(self.automate), empreinte)
+        _, apres = resultat_operation('minimisation', [self.automate], faire_minimisation)
+        self.assertNotEqual(avant.pk, apres.pk)
+        self.assertFalse(self.accepte(apres, 'a'))
+
+
+def automate_aleatoire(n, nb_transitions, graine, **options):
+    """AFN pseudo-aléatoire fixe (graine) de n états sur {a, b}, initial q0, finaux q3, q7, q11."""
+    generateur = random.Random(graine)
+    transitions = set()
+    while len(transitions) < nb_transitions:
+        transitions.add((generateur.randrange(n), generateur.choice('ab'), generateur.randrange(n)))
+    return AutomateCompile(
+        [f"q{q}" for q in range(n)], sorted(transitions), initiaux=1, finaux=[3, 7, 11], **options,
+    )
+
+
+def reconnait(c, mot):
+    """Appartenance de mot au langage de l'automate compilé c (sans ε), par ensembles d'états."""
+    etats = set(c.etats_initiaux())
+    for lettre in mot:
+        a = c.index_symbole.get(lettre)
+        etats = {r for q in etats for r in c.delta[q].get(a, ())}
+    return any(c.est_final(q) for q in etats)
+
+
+class ProduitTests(TestCase):
+    def setUp(self):
+        # A : nombre pair de a ; B : mots finissant par b (DFA complets)
+        self.a = creer_automate('A', 'DFA', 'a,b', [('p', True, True), ('i', False, False)],
+                                [('p', 'a', 'i'), ('p', 'b', 'p'), ('i', 'a', 'p'), ('i', 'b', 'i')])
+        self.b = creer_automate('B', 'DFA', 'a,b', [('x', True, False), ('y', False, True)],
+                                [('x', 'a', 'x'), ('x', 'b', 'y'), ('y', 'a', 'x'), ('y', 'b', 'y')])
+        self.mots = [''.join(m) for n in range(7) for m in itertools.product('ab', repeat=n)]
+
+    def verifier(self, automate, predicat):
+        c = compiler_automate(automate)
+        for mot in self.mots:
+            self.assertEqual(reconnait(c, mot), predicat(mot.count('a') % 2 == 0, mot.endswith('b')), mot)
+
+    def test_intersection_difference_et_xor(self):
+        # Mêmes langages que la version d'origine (produit cartésien complet,
+        # différence par complémentaire enregistré puis supprimé)
+        self.verifier(faire_intersection(self.a, self.b)[1], lambda p, q: p and q)
+        nb_automates = Automate.objects.count()
+        self.verifier(difference(self.a, self.b)[1], lambda p, q: p and not q)
+        self.assertEqual(Automate.objects.count(), nb_automates + 1)
+        self.verifier(difference_symetrique(self.a, self.b)[1], lambda p, q: p != q)
+
+    def test_ou_et_paires_inaccessibles(self):
+        # Les quatre paires sont accessibles depuis (p, x), et toutes utiles pour « ou »
+        c1, c2 = compiler_automate(self.a), compiler_automate(self.b)
+        produit, paires, nb_explorees = produit_compile(c1, c2, 'ou')
+        for mot in self.mots:
+            self.assertEqual(reconnait(produit, mot), mot.count('a') % 2 == 0 or mot.endswith('b'), mot)
+        self.assertEqual(nb_explorees, 4)
+        self.assertEqual(paires[0], (c1.etats_initiaux()[0], c2.etats_initiaux()[0]))
+
+
+class EquationSolverTests(TestCase):
+    def test_etapes_non_rendues_par_defaut(self):
+        systeme, _ = automate_vers_systeme(automate_aleatoire(25, 111, 3))
+
+        solver = EquationSolver.from_linear_system(systeme)
+        solver.resoudre()
+        self.assertEqual(solver.etapes, [])
+
+    def test_expression_initiale_rendue(self):
+        automate = enregistrer_automate(automate_aleatoire(25, 111, 3, nom='aleatoire', type='NFA'))
+        # L'état initial éliminé en dernier : ~2,9 M caractères, contre 339 M
+        # quand la remontée recopiait les sous-expressions partagées
+        expression = automate_to_expression(automate.pk)
+        self.assertLess(len(expression), 4_000_000)
+        self.assertNotEqual(expression, '∅')
+
+    def test_expression_initiale_reconnait_le_langage(self):
+        c = automate_aleatoire(12, 30, 5, nom='petit', type='NFA')
+        motif = re.compile(automate_to_expression(enregistrer_automate(c).pk).replace('+', '|').replace('ε', '()'))
+        generateur = random.Random(1)
+        for _ in range(300):
+            mot = ''.join(generateur.choice('ab') for _ in range(generateur.randint(0, 10)))
+            self.assertEqual(bool(motif.fullmatch(mot)), reconnait(c, mot), mot)
+
+    def test_substitution_memorisee_sur_le_dag(self):
+        partage = StarNode(UnionNode(LetterNode('a'), VariableNode('X1')))
+        memo = {}
+        resultat = ConcatNode(partage, partage).substitute({'X1': LetterNode('b')}, memo)
+        self.assertEqual(str(resultat), '(a+b)*(a+b)*')
+        # Concat, étoile, union et variable : chaque nœud partagé réécrit une fois
+        self.assertEqual(len(memo), 4)
+        self.assertIs(LetterNode('a').substitute({'X1': LetterNode('b')}), LetterNode('a'))
+
+    def test_etapes_sur_demande(self):
+        solver = EquationSolver("X0 = aX0 + bX1\nX1 = ε")
+        solver.resoudre(tracer=True)
+        self.assertEqual(solver.get_resultats(), {'X0': 'a*b', 'X1': 'ε'})
+        self.assertIn("X0 = a*b", solver.etapes)
+
+
+class EliminationEtatsTests(TestCase):
+    def test_heuristique_plus_courte_que_ordre_naif(self):
+        c = automate_aleatoire(15, 45, 3)
+        heuristique = str(eliminer_etats(c))
+        naive = str(eliminer_etats(c, ordre=range(c.nb_etats)))
+        # 3 919 caractères contre 113 545 en éliminant q0, q1, … dans l'ordre
+        self.assertLess(10 * len(heuristique), len(naive))
+
+        motif = re.compile(heuristique.replace('+', '|').replace('ε', '()'))
+        generateur = random.Random(4)
+        for _ in range(300):
+            mot = ''.join(generateur.choice('ab') for _ in range(generateur.randint(0, 10)))
+            self.assertEqual(bool(motif.fullmatch(mot)), reconnait(c, mot), mot)
+
+
+class SimplificationTests(TestCase):
+    def test_regles_de_reecriture(self):
+        cas = {
+            'aε': 'a', 'a∅+b': 'b', 'a+b+a': 'a+b', '(a*)*': 'a*',
+            'ε+a*': 'a*', '(ε+a)*': 'a*', 'ε*': 'ε', 'ab+ac': 'a(b+c)',
+        }
+        for expression, attendue in cas.items():
+            self.assertEqual(simplify_expression(expression), attendue, expression)
+
+    def test_meme_langage_que_l_expression_initiale(self):
+        # La version d'origine (substitutions de chaînes) rendait 'ab*' pour '(ab)*ε'
+        # et '(a+b)+ε' pour '(a+b)(a+b)*+ε' : la réécriture doit préserver le langage.
+        cas = {
+            'a+a': 'a', 'ε+ε': 'ε', 'εa+b': 'a+b', 'a+(b+a)': 'a+b', '(ab)*ε': '(ab)*',
+            'a(bc)+a(bd)': 'a(bc+bd)', 'a(b+c)+a': 'a(b+c+ε)', '(a+b)(a+b)*+ε': '(a+b)(a+b)*+ε',
+        }
+        mots = [''.join(m) for n in range(6) for m in itertools.product('abcd', repeat=n)]
+        langage = lambda e: {m for m in mots if re.fullmatch(e.replace('+', '|').replace('ε', '()'), m)}
+        for expression, attendue in cas.items():
+            self.assertEqual(simplify_expression(expression), attendue, expression)
+            self.assertEqual(langage(attendue), langage(expression), expression)
+
+    def test_expression_trop_longue_rendue_telle_quelle(self):
+        expression = '+'.join(['aε'] * 60_000)
+        with mock.patch.object(Parser, 'parse', side_effect=AssertionError):
+            self.assertEqual(simplify_expression(expression), expression)
+
+    def test_expression_trop_imbriquee_rendue_telle_quelle(self):
+        expression = '(' * 5000 + 'aε' + ')' * 5000
+        self.assertEqual(simplify_expression(expression), expression)
+
+
+class ResolutionEquationsVueTests(TestCase):
+    def poster(self, systeme):
+        return self.client.post(reverse('resoudre_equations'), {'systeme': systeme})
+
+    def test_variable_non_definie(self):
+        reponse = self.poster("X0 = aX1")
+        self.assertEqual(reponse.status_code, 200)
+        self.assertContains(reponse, "Variables non définies")
+
+    def test_equation_non_lineaire(self):
+        reponse = self.poster("X0 = X0a + b")
+        self.assertEqual(reponse.status_code, 200)
+        self.assertContains(reponse, "Équation non linéaire")
+
+
+class TesterMotVueTests(TestCase):
+    def soumettre(self, automate, mot):
+        return self.client.post(reverse('tester_mot', args=[automate.pk]), {'mot': mot}).json()
+
+    def test_chemin_avec_epsilon(self):
+        # q0 -a-> q3 est une impasse que la simulation doit ignorer
+        automate = creer_automate('e', 'EFA', 'a,b', [
+            ('q0', True, False), ('q1', False, False), ('q2', False, True), ('q3', False, False),
+        ], [('q0', 'a', 'q0'), ('q0', 'ε', 'q1'), ('q1', 'b', 'q2'), ('q0', 'a', 'q3')])
+        # Acceptation identique à la version d'origine (retour arrière récursif)
+        for mot, attendu in [('b', True), ('aab', True), ('aa', False), ('ba', False), ('', False)]:
+            self.assertEqual(self.soumettre(automate, mot)['valide'], attendu, mot)
+
+        chemin = self.soumettre(automate, 'aab')['chemins'][0]
+        self.assertEqual(
+            [(t['source'], t['symbole'], t['cible']) for t in chemin],
+            [('q0', 'a', 'q0'), ('q0', 'a', 'q0'), ('q0', 'ε', 'q1'), ('q1', 'b', 'q2')],
+        )
+        for t in chemin:
+            transition = Transition.objects.get(pk=t['id'])
+            self.assertEqual((transition.source.nom, transition.symbole, transition.cible.nom),
+                             (t['source'], t['symbole'], t['cible']))
+
+    def test_afn_ambigu_mot_long(self):
+        # 2^n chemins partiels : exponentiel (et récursion trop profonde) par retour arrière
+        automate = creer_automate('ambigu', 'NFA', 'a', [('q0', True, True), ('q1', False, False)],
+                                  [('q0', 'a', 'q0'), ('q0', 'a', 'q1'), ('q1', 'a', 'q0')])
+        reponse = self.soumettre(automate, 'a' * 3000)
+        self.assertTrue(reponse['valide'])
+        self.assertEqual(len(reponse['chemins'][0]), 3000)
+        self.assertEqual(reponse['chemins'][0][-1]['cible'], 'q0')
+        self.assertFalse(self.soumettre(automate, 'a' * 2999 + 'b')['valide'])
+
+
+class TesterMotsVueTests(TestCase):
+    def setUp(self):
+        automate = enregistrer_automate(AutomateCompile(
+            ['p', 'q'], [(0, 'a', 1), (1, 'a', 0)], initiaux=1, finaux=2, nom='impair', type='DFA',
+        ))
+        self.urls = [
+            reverse('tester_mots', args=[automate.pk]),
+            reverse('tester_expression') + '?expression=a(aa)*',
+        ]
+
+    def poster(self, url, corps):
+        return self.client.post(url, corps, content_type='text/plain')
+
+    def lignes(self, reponse):
+        return [json.loads(l) for l in b''.join(reponse.streaming_content).decode().splitlines()]
+
+    def test_resultats_diffuses(self):
+        for url in self.urls:
+            reponse = self.poster(url, b'a\naa\n')
+            self.assertEqual(reponse['Content-Type'], 'application/x-ndjson; charset=utf-8')
+            self.assertEqual([l['valide'] for l in self.lignes(reponse)], [True, False])
+
+    def test_corps_mal_encode(self):
+        for url in self.urls:
+            reponse = self.poster(url, b'a\n\xff\xfe\n')
+            self.assertEqual(reponse.status_code, 400, url)
+            self.assertFalse(json.loads(reponse.content)['valide'])
+
+    def test_erreur_apres_le_premier_paquet(self):
+        with mock.patch.object(views, 'TAILLE_PAQUET_MOTS', 1):
+            for url in self.urls:
+                reponse = self.poster(url, b'a\n\xff\n')
+                self.assertEqual(reponse.status_code, 200)
+                lignes = self.lignes(reponse)
+                self.assertEqual(lignes[0], {'mot': 'a', 'valide': True})
+                self.assertIn('erreur', lignes[-1])
+
+
+class ReconnaisseurLotTests(TestCase):
+    def test_lot_identique_mot_a_mot(self):
+        # AFD partiel : blocages, caractères hors alphabet ou hors latin-1, mot vide
+        generateur = random.Random(2)
+        transitions = [(q, s, generateur.randrange(6)) for q in range(6) for s in 'abé' if generateur.random() < 0.8]
+        reconnaisseur = Reconnaisseur(AutomateCompile(
+            [f"q{q}" for q in range(6)], transitions, initiaux=1, finaux=[1, 4], symboles='abé',
+        ))
+        mots = [''.join(generateur.choice('abéxΩ') for _ in range(generateur.randint(0, 40))) for _ in range(3000)]
+        attendus = [reconnaisseur.tester(mot) for mot in mots]
+        acceptes, positions = reconnaisseur.tester_lot(mots)
+        self.assertEqual(acceptes, [r[0] for r in attendus])
+        self.assertEqual(positions, [r[1] for r in attendus])
+
+    def test_chemin_numpy_emprunte(self):
+        if np is None:
+            self.skipTest("NumPy non installé")
+        reconnaisseur = Reconnaisseur(AutomateCompile(['p'], [(0, 'a', 0)], initiaux=1, finaux=1, symboles='a'))
+        with mock.patch.object(reconnaisseur, 'tester', side_effect=AssertionError):
+            self.assertEqual(reconnaisseur.tester_lot(['', 'aa', 'ab']), ([True, True, False], [0, 2, 1]))
+
+
+def aretes(c):
+    """Transitions d'un automate compilé, par noms d'états, triées."""
+    return sorted((c.noms[source], symbole, c.noms[cible]) for source, symbole, cible in c.iter_transitions())
+
+
+class ThompsonTests(TestCase):
+    def test_meme_automate_que_la_version_d_origine(self):
+        c = ThompsonBuilder('a*').construire()
+        self.assertEqual(c.noms, ('q0', 'q1', 'q2', 'q3'))
+        self.assertEqual((c.etats_initiaux(), c.etats_finaux(), c.alphabet), ([2], [3], 'a'))
+        self.assertEqual(aretes(c), [
+            ('q0', 'a', 'q1'), ('q1', 'ε', 'q0'), ('q1', 'ε', 'q3'), ('q2', 'ε', 'q0'), ('q2', 'ε', 'q3'),
+        ])
+        c = ThompsonBuilder('(a+b)*abb').construire()
+        self.assertEqual((c.nb_etats, c.nb_transitions), (14, 16))
+        reconnaisseur = Reconnaisseur(c)
+        for mot, attendu in (('abb', True), ('babb', True), ('ab', False), ('abba', False), ('', False)):
+            self.assertEqual(reconnaisseur.tester(mot)[0], attendu, mot)
+
+    def test_expressions_mal_formees(self):
+        for expression in ('(a+b', 'a+b)', 'a+', '*a'):
+            with self.assertRaises(ValueError, msg=expression):
+                ThompsonBuilder(expression).construire()
+
+    def test_longue_concatenation(self):
+        # La pile de l'ancienne version recopiait les automates partiels (quadratique)
+        c = ThompsonBuilder('ab' * 25_000).construire()
+        self.assertEqual((c.nb_etats, c.nb_transitions), (100_000, 99_999))
+        reconnaisseur = Reconnaisseur(ThompsonBuilder('ab' * 5000).construire())
+        self.assertTrue(reconnaisseur.tester('ab' * 5000)[0])
+        self.assertFalse(reconnaisseur.tester('ab' * 4999 + 'a')[0])
+
+
+class GlushkovTests(TestCase):
+    def test_meme_automate_que_la_version_d_origine(self):
+        c = GlushkovBuilder('(a+b)*abb').construire()
+        self.assertEqual(c.noms, ('q0', 'q1', 'q2', 'q3', 'q4', 'q5'))
+        self.assertEqual((c.etats_initiaux(), c.etats_finaux()), ([0], [5]))
+        self.assertEqual(aretes(c), [
+            ('q0', 'a', 'q1'), ('q0', 'a', 'q3'), ('q0', 'b', 'q2'), ('q1', 'a', 'q1'), ('q1', 'a', 'q3'),
+            ('q1', 'b', 'q2'), ('q2', 'a', 'q1'), ('q2', 'a', 'q3'), ('q2', 'b', 'q2'), ('q3', 'b', 'q4'),
+            ('q4', 'b', 'q5'),
+        ])
+
+    def test_constructions_simultanees(self):
+        # L'ancienne version partageait positions et followpos dans des globales du module
+        expressions = ['(a+b)*abb', 'a(b+c)*', 'ab*+ba*', '(ab+ba)*(a+ε)b*'] * 25
+        resume = lambda c: (c.noms, aretes(c), c.etats_finaux())
+        attendus = [resume(GlushkovBuilder(e).construire()) for e in expressions]
+        with ThreadPoolExecutor(max_workers=8) as executeur:
+            obtenus = list(executeur.map(lambda e: resume(GlushkovBuilder(e).construire()), expressions))
+        self.assertEqual(obtenus, attendus)
+
+
+class AfdMinimalTests(TestCase):
+    def test_comme_glushkov_determinise_puis_minimise(self):
+        # (états, transitions, finaux) de la version d'origine : Glushkov,
+        # determiniser puis faire_minimisation, chaque étape enregistrée en base
+        cas = {
+            '(a+b)*abb': (4, 8, 1), 'a(b+c)*': (2, 3, 1), 'ab*+ba*': (3, 4, 2), '(a+b)*a(a+b)(a+b)': (8, 16, 4),
+        }
+        for expression, attendu in cas.items():
+            afd = construire_afd_minimal(expression)
+            self.assertTrue(afd.est_deterministe(), expression)
+            self.assertEqual((afd.nb_etats, afd.nb_transitions, len(afd.etats_finaux())), attendu, expression)
+            inclus, _, inclus_inverse, _, _ = equivalence_compile(afd, GlushkovBuilder(expression).construire())
+            self.assertTrue(inclus and inclus_inverse, expression)
+
+    def test_vue_une_seule_ecriture(self):
+        reponse = self.client.get(reverse('generer_afd', args=['(a+b)*abb']))
+        automate = Automate.objects.get()
+        self.assertRedirects(reponse, reverse('details_automate', args=[automate.pk]), fetch_redirect_response=False)
+        self.assertEqual((automate.type, automate.etats.count(), automate.transitions.count()), ('DFA', 4, 8))
+
+
+class InclusionTests(TestCase):
+    def setUp(self):
+        # AFN de (a+b)*abb et ε-AFN de Thompson de (a+b)*bb et (a+b)*b(a+b)
+        self.automates = [
+            AutomateCompile(['q0', 'q1', 'q2', 'q3'], [(0, 'a', 0), (0, 'b', 0), (0, 'a', 1), (1, 'b', 2), (2, 'b', 3)],
+                            initiaux=1, finaux=[3]),
+            ThompsonBuilder('(a+b)*bb').construire(),
+            ThompsonBuilder('(a+b)*b(a+b)').construire(),
+        ]
+        self.mots = [''.join(m) for n in range(7) for m in itertools.product('ab', repeat=n)]
+
+    def test_comme_l_enumeration_des_mots(self):
+        for x, y in itertools.permutations(self.automates, 2):
+            rx, ry = Reconnaisseur(x), Reconnaisseur(y)
+            difference = [m for m in self.mots if rx.tester(m)[0] and not ry.tester(m)[0]]
+            inclus, contre_exemple, _ = inclusion_compile(x, y)
+            self.assertEqual(inclus, not difference)
+            if not inclus:
+                # Parcours en largeur : un plus court mot de L(x) \ L(y)
+                self.assertIn(''.join(contre_exemple), difference)
+                self.assertEqual(len(contre_exemple), len(difference[0]))
+
+    def test_comparer_langages(self):
+        a = creer_automate('A', 'NFA', 'a,b', [('p', True, False), ('q', False, True)],
+                           [('p', 'a', 'p'), ('p', 'b', 'p'), ('p', 'b', 'q')])
+        b = ThompsonBuilder('(a+b)*b(a+b)*').create_automate()
+        nb_automates = Automate.objects.count()
+        _, resultat = comparer_langages(a, b)
+        self.assertEqual(resultat['a_dans_b'], True)
+        self.assertEqual((resultat['b_dans_a'], resultat['contre_exemple_b_dans_a']), (False, 'ba'))
+        self.assertFalse(resultat['equivalents'])
+        self.assertEqual(Automate.objects.count(), nb_automates)
+
+
+class EquivalenceAfdTests(TestCase):
+    def setUp(self):
+        # A : nombre pair de a ; A2 : même langage compté modulo 4 ; C : A sans b depuis l'état impair
+        self.a = creer_automate('A', 'DFA', 'a,b', [('p', True, True), ('i', False, False)],
+                                [('p', 'a', 'i'), ('p', 'b', 'p'), ('i', 'a', 'p'), ('i', 'b', 'i')])
+        self.a2 = creer_automate('A2', 'DFA', 'a,b', [
+            ('r0', True, True), ('r1', False, False), ('r2', False, True), ('r3', False, False),
+        ], [(f'r{k}', 'a', f'r{(k + 1) % 4}') for k in range(4)] + [(f'r{k}', 'b', f'r{k}') for k in range(4)])
+        self.c = creer_automate('C', 'DFA', 'a,b', [('p', True, True), ('i', False, False)],
+                                [('p', 'a', 'i'), ('p', 'b', 'p'), ('i', 'a', 'p')])
+
+    def test_comme_la_comparaison_des_formes_canoniques(self):
+        # Verdicts de la version d'origine (canonisation des deux automates)
+        nb_automates = Automate.objects.count()
+        for x, y, attendu in ((self.a, self.a2, True), (self.a, self.c, False), (self.a2, self.c, False)):
+            _, resultat = equivalence_afd(x, y)
+            self.assertEqual(resultat['equivalents'], attendu, (x.nom, y.nom))
+            if not attendu:
+                mot = resultat['mot_distinguant']
+                cx, cy = compiler_automate(x), compiler_automate(y)
+                self.assertNotEqual(reconnait(cx, mot), reconnait(cy, mot), mot)
+        self.assertEqual(Automate.objects.count(), nb_automates)
+
+
+class AntimirovTests(TestCase):
+    def test_meme_grammaire_que_glushkov(self):
+        for expression in ('(a|b)*abb', 'X1(a+X)*', '(ab|ba)*(a+ε)b*'):
+            antimirov = AntimirovBuilder(expression).construire()
+            glushkov = GlushkovBuilder(expression).construire()
+            self.assertFalse(antimirov.a_epsilon())
+            self.assertEqual(set(antimirov.symboles), set(glushkov.symboles))
+            inclus_ag, _, inclus_ga, _, _ = equivalence_compile(antimirov, glushkov)
+            self.assertTrue(inclus_ag and inclus_ga, expression)
+
+
+class ReconnaisseurDeriveesTests(TestCase):
+    def test_meme_grammaire_que_glushkov(self):
+        reconnaisseur = derivees.ReconnaisseurDerivees('X1(a|b)*')
+        self.assertTrue(reconnaisseur.tester('X1ab')[0])
+        self.assertFalse(reconnaisseur.tester('X')[0])
 
-# Create your tests here.
+    def test_table_des_derivees_bornee(self):
+        expression = '(a+b)*a' + '(a+b)' * 12
+        motif = re.compile('(a|b)*a' + '(a|b)' * 12)
+        generateur = random.Random(0)
+        with mock.patch.object(derivees, 'TAILLE_MAX_DERIVEES', 50):
+            reconnaisseur = derivees.ReconnaisseurDerivees(expression)
+            for _ in range(500):
+                mot = ''.join(generateur.choice('ab') for _ in range(generateur.randint(0, 30)))
+                self.assertEqual(reconnaisseur.tester(mot)[0], bool(motif.fullmatch(mot)), mot)
+                self.assertLessEqual(len(reconnaisseur._derivees), 50)
+        self.assertGreater(reconnaisseur.vidages, 0)
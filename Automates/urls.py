@@ -8,6 +8,8 @@ urlpatterns = [
     path('automate/<int:automate_id>/ajouter-etat/', views.ajouter_etat, name='ajouter_etat'),
     path('automate/<int:automate_id>/ajouter-transition/', views.ajouter_transition, name='ajouter_transition'),
     path('automate/<int:automate_id>/tester-mot/', views.tester_mot, name='tester_mot'),
+    path('automate/<int:automate_id>/tester-mots/', views.tester_mots, name='tester_mots'),
+    path('expression/tester-mots/', views.tester_expression, name='tester_expression'),
     path('automate/<int:automate_id>/modifier/', views.modifier_automate, name='modifier_automate'),
     path('etat/<int:etat_id>/modifier/', views.modifier_etat, name='modifier_etat'),
     path('transition/<int:transition_id>/modifier/', views.modifier_transition, name='modifier_transition'),
@@ -33,7 +35,10 @@ urlpatterns = [
     path('operation/Concatenation/<int:id1>/<int:id2>/', views.cloture_concatenation, name='Concatenation'),
     path('operation/Miroir/<int:automate_id>/', views.cloture_miroir, name='Miroir'),
     path('operation/difference/<int:id1>/<int:id2>/', views.cloture_difference, name='difference_automates'),
+    path('operation/difference_symetrique/<int:id1>/<int:id2>/', views.cloture_difference_symetrique, name='difference_symetrique_automates'),
     path('operation/quotient/<int:id1>/<int:id2>/', views.cloture_quotient, name='quotient_automates'),
+    path('operation/inclusion/<int:id1>/<int:id2>/', views.inclusion_automates, name='inclusion_automates'),
+    path('operation/equivalence_afd/<int:id1>/<int:id2>/', views.equivalence_afd_automates, name='equivalence_afd_automates'),
     path('operation/expression/<int:automate_id>/', views.expression_reguliere, name='automate_expression'),
 
 
@@ -42,6 +47,8 @@ urlpatterns = [
     path('automate/generer_expreg/', views.generer_automate_expreg, name='generer_automate_expreg'),
     path('automate/expreg/thompson/<str:expression>/', views.generer_thompson, name='generer_thompson'),
     path('automate/expreg/glushkov/<str:expression>/', views.generer_glushkov, name='generer_glushkov'),
+    path('automate/expreg/antimirov/<str:expression>/', views.generer_antimirov, name='generer_antimirov'),
+    path('automate/expreg/dfa/<str:expression>/', views.generer_afd, name='generer_afd'),
     path('equations/', views.resoudre_equations, name='resoudre_equations'),
     path('<int:automate_id>/emoder/', views.emoder_automate, name='emoder_automate'),
 ]
@@ -1,5 +1,8 @@
+import json
+from itertools import islice
+
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from .models import Automate, Etat, Transition
 from .forms import *
 from django.http import HttpResponseBadRequest
@@ -8,6 +11,12 @@ from django.contrib import messages
 from django.views.generic import FormView
 from .algorithmes import *
 from .regular import *
+from .automate_compile import AutomateCompile, compiler_automate, iter_bits
+from .cache_automates import cache_reconnaisseurs
+from .cache_operations import resultat_operation
+from .derivees import obtenir_reconnaisseur
+from .persistance import enregistrer_automate
+from .signals import incrementer_revision
 
 """ AFFICHAGES """
 
@@ -128,6 +137,7 @@ def supprimer_etat(request, etat_id):
     etat = get_object_or_404(Etat, id=etat_id)
     automate_id = etat.automate.id
     etat.delete()
+    incrementer_revision(automate_id)
     messages.success(request, "État supprimé avec succès.")
     return redirect('details_automate', automate_id=automate_id)
 
@@ -135,6 +145,7 @@ def supprimer_transition(request, transition_id):
     transition = get_object_or_404(Transition, id=transition_id)
     automate_id = transition.automate.id
     transition.delete()
+    incrementer_revision(automate_id)
     messages.success(request, "Transition supprimée avec succès.")
     return redirect('details_automate', automate_id=automate_id)
 
@@ -149,105 +160,22 @@ def tester_mot(request, automate_id):
     
     mot = request.POST.get("mot", "")
     automate = get_object_or_404(Automate, id=automate_id)
+    # Reconnaisseur compilé partagé entre requêtes, tant que l'automate n'est pas modifié
+    reconnaisseur = cache_reconnaisseurs.obtenir(automate)
+    c = reconnaisseur.automate
     
-    # Préparation des données
-    transitions = automate.transitions.select_related('source', 'cible').all()
-    etats = automate.etats.all()
-    epsilon = 'ε'
-    
-    # Vérification des états initiaux/finaux
-    etats_initiaux = [e.nom for e in etats.filter(est_initial=True)]
-    etats_finaux = {e.nom for e in etats.filter(est_final=True)}
-    
-    if not etats_initiaux:
+    # Vérification des états initiaux
+    if not c.initiaux:
         return JsonResponse({
             'valide': False,
             'message': "Aucun état initial défini dans l'automate",
             'detail': "L'automate doit avoir au moins un état initial"
         }, status=400)
     
-    # Construction du graphe de transition
-    transitions_dict = {}
-    for trans in transitions:
-        if trans.source.nom not in transitions_dict:
-            transitions_dict[trans.source.nom] = {}
-        symbole = trans.symbole if trans.symbole != epsilon else ''
-        if symbole not in transitions_dict[trans.source.nom]:
-            transitions_dict[trans.source.nom][symbole] = []
-        transitions_dict[trans.source.nom][symbole].append({
-            'cible': trans.cible.nom,
-            'id': trans.id  # Pour l'animation dans le frontend
-        })
-    
-    # Fonction de fermeture epsilon
-    def epsilon_closure(etats):
-        fermeture = set(etats)
-        queue = deque(etats)
-        while queue:
-            etat = queue.popleft()
-            if etat in transitions_dict and '' in transitions_dict[etat]:
-                for transition in transitions_dict[etat]['']:
-                    if transition['cible'] not in fermeture:
-                        fermeture.add(transition['cible'])
-                        queue.append(transition['cible'])
-        return fermeture
-    
-    # Algorithme pour trouver un chemin valide
-    def trouver_chemin(etats_courants, pos, chemin):
-        if pos == len(mot):
-            if any(etat in etats_finaux for etat in etats_courants):
-                return chemin
-            return None
-        
-        lettre = mot[pos]
-        transitions_possibles = []
-        
-        # Explorer d'abord les transitions non-epsilon
-        for etat in etats_courants:
-            if etat in transitions_dict:
-                if lettre in transitions_dict[etat]:
-                    for transition in transitions_dict[etat][lettre]:
-                        transitions_possibles.append((
-                            transition['cible'],
-                            pos + 1,
-                            chemin + [{
-                                'source': etat,
-                                'cible': transition['cible'],
-                                'symbole': lettre,
-                                'id': transition['id']
-                            }]
-                        ))
-        
-        # Si aucune transition normale, essayer epsilon-transitions
-        if not transitions_possibles:
-            for etat in etats_courants:
-                if etat in transitions_dict and '' in transitions_dict[etat]:
-                    for transition in transitions_dict[etat]['']:
-                        transitions_possibles.append((
-                            transition['cible'],
-                            pos,
-                            chemin + [{
-                                'source': etat,
-                                'cible': transition['cible'],
-                                'symbole': epsilon,
-                                'id': transition['id']
-                            }]
-                        ))
-        
-        # Trier pour prioriser les transitions consommant des lettres
-        transitions_possibles.sort(key=lambda x: -x[1])
-        
-        for etat_suivant, new_pos, new_chemin in transitions_possibles:
-            result = trouver_chemin(epsilon_closure([etat_suivant]), new_pos, new_chemin)
-            if result is not None:
-                return result
-        
-        return None
+    # Table dense pour un AFD, sinon simulation par ensembles d'états actifs
+    accepte, position, chemin = reconnaisseur.tester(mot, avec_chemin=True)
     
-    # Trouver un chemin valide
-    chemin_complet = trouver_chemin(epsilon_closure(etats_initiaux), 0, [])
-    
-    if chemin_complet is None:
+    if not accepte:
         return JsonResponse({
             'valide': False,
             'message': f"Le mot '{mot}' n'est pas accepté par l'automate",
@@ -257,14 +185,15 @@ def tester_mot(request, automate_id):
         })
     
     # Préparer la réponse pour l'animation
-    chemin_animation = []
-    for transition in chemin_complet:
-        chemin_animation.append({
-            'source': transition['source'],
-            'cible': transition['cible'],
-            'symbole': transition['symbole'],
-            'id': transition['id']
-        })
+    chemin_animation = [
+        {
+            'source': c.noms[source],
+            'cible': c.noms[cible],
+            'symbole': symbole,
+            'id': c.transition_id(source, symbole, cible)
+        }
+        for source, symbole, cible in chemin
+    ]
     
     return JsonResponse({
         'valide': True,
@@ -274,13 +203,109 @@ def tester_mot(request, automate_id):
     })
 
 
+# Nombre de mots testés (et diffusés) à la fois par tester_mots
+TAILLE_PAQUET_MOTS = 10_000
+
+
+def _lire_mots(request):
+    """
+    Mots à tester : tableau JSON si le corps est en application/json,
+    sinon un mot par ligne (corps lu au fil de l'eau, sans le charger en entier :
+    une ligne mal encodée lève UnicodeDecodeError pendant l'itération).
+    """
+    if request.content_type == 'application/json':
+        mots = json.loads(request.body or b'[]')
+        if not isinstance(mots, list) or not all(isinstance(m, str) for m in mots):
+            raise ValueError("Le corps JSON doit être un tableau de chaînes")
+        return iter(mots)
+    return (ligne.decode('utf-8').rstrip('\r\n') for ligne in request)
+
+
+def tester_mots(request, automate_id):
+    """
+    Test d'appartenance d'un lot de mots avec un seul reconnaisseur compilé.
+
+    Réponse diffusée en NDJSON : une ligne {"mot", "valide"[, "position"]} par
+    mot, dans l'ordre de la requête. ?positions=1 ajoute la position de rejet.
+    """
+    if request.method != "POST":
+        return JsonResponse({'valide': False, 'erreur': 'Méthode non autorisée'}, status=405)
+
+    automate = get_object_or_404(Automate, id=automate_id)
+    reconnaisseur = cache_reconnaisseurs.obtenir(automate)
+    if not reconnaisseur.automate.initiaux:
+        return JsonResponse({
+            'valide': False,
+            'message': "Aucun état initial défini dans l'automate",
+            'detail': "L'automate doit avoir au moins un état initial"
+        }, status=400)
+
+    try:
+        mots = _lire_mots(request)
+    except ValueError as e:
+        return JsonResponse({'valide': False, 'erreur': str(e)}, status=400)
+    return _diffuser_resultats(reconnaisseur, mots, request)
+
+
+def tester_expression(request):
+    """
+    Test d'un lot de mots contre une expression régulière (?expression=...),
+    par dérivées de Brzozowski : aucun automate n'est construit ni enregistré.
+    Corps et réponse au même format que tester_mots.
+    """
+    if request.method != "POST":
+        return JsonResponse({'valide': False, 'erreur': 'Méthode non autorisée'}, status=405)
+
+    try:
+        reconnaisseur = obtenir_reconnaisseur(request.GET.get('expression', ''))
+        mots = _lire_mots(request)
+    except ValueError as e:
+        return JsonResponse({'valide': False, 'erreur': str(e)}, status=400)
+    return _diffuser_resultats(reconnaisseur, mots, request)
+
+
+def _diffuser_resultats(reconnaisseur, mots, request):
+    """
+    Réponse NDJSON diffusée : une ligne {"mot", "valide"[, "position"]} par mot.
+
+    Le premier paquet est lu avant de répondre : un corps mal encodé dès le
+    début donne un 400. Une erreur de décodage plus loin, une fois le statut
+    200 envoyé, termine le flux par une ligne {"erreur"}.
+    """
+    avec_positions = request.GET.get('positions') in ('1', 'true', 'oui')
+    try:
+        premier = list(islice(mots, TAILLE_PAQUET_MOTS))
+    except UnicodeDecodeError as e:
+        return JsonResponse({'valide': False, 'erreur': str(e)}, status=400)
+
+    def resultats():
+        # Par paquets : mémoire constante, exécution vectorisée possible (AFD + NumPy)
+        paquet = premier
+        while paquet:
+            lignes = []
+            acceptes, positions = reconnaisseur.tester_lot(paquet)
+            for mot, accepte, position in zip(paquet, acceptes, positions):
+                ligne = {'mot': mot, 'valide': accepte}
+                if avec_positions and not accepte:
+                    ligne['position'] = position
+                lignes.append(json.dumps(ligne, ensure_ascii=False) + "\n")
+            yield ''.join(lignes)
+            try:
+                paquet = list(islice(mots, TAILLE_PAQUET_MOTS))
+            except UnicodeDecodeError as e:
+                yield json.dumps({'erreur': str(e)}, ensure_ascii=False) + "\n"
+                return
+
+    return StreamingHttpResponse(resultats(), content_type='application/x-ndjson; charset=utf-8')
+
+
 """ Operations sur les automates """
 
 def union_automates(request, id1, id2):
     a1 = get_object_or_404(Automate, id=id1)
     a2 = get_object_or_404(Automate, id=id2)
     try:
-        etapes, result = faire_union(a1, a2)
+        etapes, result = resultat_operation('union', [a1, a2], faire_union)
         error = None
     except Exception as e:
         etapes = []
@@ -301,7 +326,7 @@ def intersection_automates(request, id1, id2):
     a1 = get_object_or_404(Automate, id=id1)
     a2 = get_object_or_404(Automate, id=id2)
     try:
-        etapes, resultat = faire_intersection(a1, a2)
+        etapes, resultat = resultat_operation('intersection', [a1, a2], faire_intersection)
         error = None
     except Exception as e:
         etapes = []
@@ -320,7 +345,7 @@ def intersection_automates(request, id1, id2):
 def determiniser_automate(request, automate_id):
     afn = get_object_or_404(Automate, id=automate_id)
     try:
-        etapes, afd = determiniser(afn)
+        etapes, afd = resultat_operation('determinisation', [afn], determiniser)
         error = None
     except Exception as e:
         afd = None
@@ -357,7 +382,10 @@ def choisir_operation(request):
         'Fermeture': 1,
         'Concatenation': 2,
         'difference': 2,
+        'difference_symetrique': 2,
         'quotient': 2,
+        'inclusion': 2,
+        'equivalence_afd': 2,
     }
 
     if request.method == "POST":
@@ -376,8 +404,14 @@ def choisir_operation(request):
             return redirect('union_automates', id1=selected_ids[0], id2=selected_ids[1])
         if operation == 'difference':
             return redirect('difference_automates', id1=selected_ids[0], id2=selected_ids[1])
+        if operation == 'difference_symetrique':
+            return redirect('difference_symetrique_automates', id1=selected_ids[0], id2=selected_ids[1])
         if operation == 'quotient':
             return redirect('quotient_automates', id1=selected_ids[0], id2=selected_ids[1])
+        if operation == 'inclusion':
+            return redirect('inclusion_automates', id1=selected_ids[0], id2=selected_ids[1])
+        if operation == 'equivalence_afd':
+            return redirect('equivalence_afd_automates', id1=selected_ids[0], id2=selected_ids[1])
         elif operation == 'intersection':
             return redirect('intersection_automates', id1=selected_ids[0], id2=selected_ids[1])
         elif operation == 'complementaire':
@@ -424,7 +458,7 @@ def choisir_operation(request):
 def complement_automate(request, id):
     automate = get_object_or_404(Automate, id=id)
     try:
-        etapes, resultat = faire_complementaire(automate)
+        etapes, resultat = resultat_operation('complementaire', [automate], faire_complementaire)
         error = None
     except Exception as e:
         resultat = None
@@ -443,7 +477,7 @@ def complement_automate(request, id):
 def minimiser_automate(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
     try:
-        etapes, resultat = faire_minimisation(automate)
+        etapes, resultat = resultat_operation('minimisation', [automate], faire_minimisation)
         error = None
     except Exception as e:
         resultat = None
@@ -462,7 +496,7 @@ def minimiser_automate(request, automate_id):
 def canoniser_automate(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
     try:
-        etapes, resultat = faire_canonisation(automate)
+        etapes, resultat = resultat_operation('canonisation', [automate], faire_canonisation)
         error = None
     except Exception as e:
         resultat = None
@@ -482,7 +516,7 @@ def etoile_kleene(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
 
     try:
-        resultat = cloture_etoile(automate)
+        _, resultat = resultat_operation('etoile_kleene', [automate], lambda a: ([], cloture_etoile(a)))
     except Exception as e:
         messages.error(request, str(e))
         return redirect('details_automate', automate_id=automate.id)
@@ -499,7 +533,7 @@ def cloture_concatenation(request, id1, id2):
     a1 = get_object_or_404(Automate, id=id1)
     a2 = get_object_or_404(Automate, id=id2)
     try:
-        etapes, resultat = concatenation(a1, a2)
+        etapes, resultat = resultat_operation('concatenation', [a1, a2], concatenation)
         error = None
     except Exception as e:
         resultat = None
@@ -518,7 +552,7 @@ def cloture_concatenation(request, id1, id2):
 def cloture_miroir(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
 
-    etapes, resultat = miroir(automate)
+    etapes, resultat = resultat_operation('miroir', [automate], miroir)
 
     return render(request, 'automates/operation_resultat.html', {
         'automates_origine': [automate],
@@ -534,7 +568,7 @@ def cloture_difference(request, id1, id2):
     a2 = get_object_or_404(Automate, id=id2)
 
     try:
-        etapes, resultat = difference(a1, a2)
+        etapes, resultat = resultat_operation('difference', [a1, a2], difference)
         error = None
     except Exception as e:
         resultat = None
@@ -549,12 +583,82 @@ def cloture_difference(request, id1, id2):
         'operation': f"Clôture par Différence ({a1.nom} \\ {a2.nom})"
     })
 
+def cloture_difference_symetrique(request, id1, id2):
+    a1 = get_object_or_404(Automate, id=id1)
+    a2 = get_object_or_404(Automate, id=id2)
+
+    try:
+        etapes, resultat = resultat_operation('difference_symetrique', [a1, a2], difference_symetrique)
+        error = None
+    except Exception as e:
+        resultat = None
+        etapes = []
+        error = str(e)
+
+    return render(request, 'automates/operation_resultat.html', {
+        'automates_origine': [a1, a2],
+        'automate_resultat': resultat,
+        'etapes': etapes,
+        'error': error,
+        'operation': f"Différence symétrique ({a1.nom} Δ {a2.nom})"
+    })
+
+def inclusion_automates(request, id1, id2):
+    a1 = get_object_or_404(Automate, id=id1)
+    a2 = get_object_or_404(Automate, id=id2)
+
+    try:
+        etapes, resultat = comparer_langages(a1, a2)
+        verdicts = [
+            {'propriete': f"L({a1.nom}) ⊆ L({a2.nom})", 'reponse': resultat['a_dans_b'],
+             'contre_exemple': resultat['contre_exemple_a_dans_b']},
+            {'propriete': f"L({a2.nom}) ⊆ L({a1.nom})", 'reponse': resultat['b_dans_a'],
+             'contre_exemple': resultat['contre_exemple_b_dans_a']},
+            {'propriete': f"L({a1.nom}) = L({a2.nom})", 'reponse': resultat['equivalents'],
+             'contre_exemple': resultat['contre_exemple_a_dans_b'] or resultat['contre_exemple_b_dans_a']},
+        ]
+        error = None
+    except Exception as e:
+        etapes, verdicts = [], []
+        error = str(e)
+
+    return render(request, 'automates/comparaison_resultat.html', {
+        'automates_origine': [a1, a2],
+        'verdicts': verdicts,
+        'etapes': etapes,
+        'error': error,
+        'operation': f"Inclusion et équivalence ({a1.nom}, {a2.nom})"
+    })
+
+def equivalence_afd_automates(request, id1, id2):
+    a1 = get_object_or_404(Automate, id=id1)
+    a2 = get_object_or_404(Automate, id=id2)
+
+    try:
+        etapes, resultat = equivalence_afd(a1, a2)
+        verdicts = [
+            {'propriete': f"L({a1.nom}) = L({a2.nom})", 'reponse': resultat['equivalents'],
+             'contre_exemple': resultat['mot_distinguant']},
+        ]
+        error = None
+    except Exception as e:
+        etapes, verdicts = [], []
+        error = str(e)
+
+    return render(request, 'automates/comparaison_resultat.html', {
+        'automates_origine': [a1, a2],
+        'verdicts': verdicts,
+        'etapes': etapes,
+        'error': error,
+        'operation': f"Équivalence d'AFD ({a1.nom}, {a2.nom})"
+    })
+
 def cloture_quotient(request, id1, id2):
     a_b = get_object_or_404(Automate, id=id1)  # B
     a_a = get_object_or_404(Automate, id=id2)  # A
 
     try:
-        etapes, resultat = quotient_gauche(a_b, a_a)
+        etapes, resultat = resultat_operation('quotient', [a_b, a_a], quotient_gauche)
         error = None
     except Exception as e:
         resultat = None
@@ -597,7 +701,7 @@ def analyse_etats(request, automate_id):
 def completer_automate(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
     try:
-        etapes, resultat = completion(automate)
+        etapes, resultat = resultat_operation('completion', [automate], completion)
         error = None
     except Exception as e:
         resultat = None
@@ -629,7 +733,7 @@ def afd_vers_afn(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
 
     try:
-        etapes, resultat = convertir_afd_en_afn(automate)
+        etapes, resultat = resultat_operation('AFD_vers_AFN', [automate], convertir_afd_en_afn)
     except Exception as e:
         messages.error(request, str(e))
         return redirect('details_automate', automate_id=automate.id)
@@ -648,7 +752,7 @@ def afd_vers_afn(request, automate_id):
 def afn_vers_efn(request, automate_id):
     automate = get_object_or_404(Automate, id = automate_id)
     try:
-        etapes, resultat = convertir_afn_vers_efn(automate)
+        etapes, resultat = resultat_operation('AFN_vers_epsilon-AFN', [automate], convertir_afn_vers_efn)
         error = None
 
     except Exception as e:
@@ -667,7 +771,7 @@ def afn_vers_efn(request, automate_id):
 def afd_vers_efn(request, automate_id):
     automate = get_object_or_404(Automate, id = automate_id)
     try:
-        etapes, resultat = convertir_afd_vers_efn(automate)
+        etapes, resultat = resultat_operation('AFD_vers_epsilon-AFN', [automate], convertir_afd_vers_efn)
         error = None
 
     except Exception as e:
@@ -689,7 +793,7 @@ def afd_vers_efn(request, automate_id):
 def convertir_epsilon_vers_afn(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
     try:
-        resultat, etapes = eliminer_transitions_epsilon(automate)
+        etapes, resultat = resultat_operation('epsilon-AFN_vers_AFN', [automate], eliminer_transitions_epsilon)
         error = None
     except Exception as e:
         resultat = None
@@ -709,7 +813,7 @@ def convertir_epsilon_vers_afn(request, automate_id):
 def convertir_epsilon_vers_afd(request, automate_id):
     automate = get_object_or_404(Automate, id=automate_id)
     try:
-        etapes, resultat = eliminer_epsilon_et_determiniser(automate)
+        etapes, resultat = resultat_operation('epsilon-AFN_vers_AFD', [automate], eliminer_epsilon_et_determiniser)
         error = None
     except Exception as e:
         resultat = None
@@ -731,49 +835,36 @@ def emoder_automate(request, automate_id):
     automate = get_object_or_404(Automate, pk=automate_id)
     
     # Analyse initiale
-    accessibles = etats_accessibles(automate)
-    coaccessibles = etats_coaccessibles(automate)
+    c = compiler_automate(automate)
+    accessibles = c.accessibles()
+    coaccessibles = c.coaccessibles()
     utiles = accessibles & coaccessibles
+    rang = {q: i for i, q in enumerate(iter_bits(utiles))}
     transitions_utiles = [
-        t for t in automate.transitions.all() 
-        if t.source in utiles and t.cible in utiles
+        (rang[source], symbole, rang[cible])
+        for source, symbole, cible in c.iter_transitions()
+        if source in rang and cible in rang
     ]
     
-    # Créer le nouvel automate émodé
-    nouvel_automate = Automate.objects.create(
+    # Créer le nouvel automate émodé (états et transitions utiles)
+    nouvel_automate = enregistrer_automate(AutomateCompile(
+        [c.noms[q] for q in rang],
+        transitions_utiles,
+        initiaux=[i for q, i in rang.items() if c.est_initial(q)],
+        finaux=[i for q, i in rang.items() if c.est_final(q)],
         nom=f"{automate.nom} (Émodé)",
         type=automate.type,
-        alphabet=automate.alphabet
-    )
-    
-    # Copier les états utiles
-    etats_map = {}
-    for etat in utiles:
-        nouvel_etat = Etat.objects.create(
-            automate=nouvel_automate,
-            nom=etat.nom,
-            est_initial=etat.est_initial,
-            est_final=etat.est_final
-        )
-        etats_map[etat.id] = nouvel_etat
-    
-    # Copier les transitions utiles
-    for transition in transitions_utiles:
-        Transition.objects.create(
-            automate=nouvel_automate,
-            source=etats_map[transition.source_id],
-            cible=etats_map[transition.cible_id],
-            symbole=transition.symbole
-        )
+        alphabet=automate.alphabet,
+    ))
     
     return render(request, 'automates/emodage_resultat.html', {
         'operation': 'Émodage',
         'automates_origine': [automate],
         'automate_resultat': nouvel_automate,
         'etapes': [
-            f"Analyse des états accessibles: {len(accessibles)} état(s)",
-            f"Analyse des états co-accessibles: {len(coaccessibles)} état(s)",
-            f"Identification des états utiles: {len(utiles)} état(s)",
+            f"Analyse des états accessibles: {bin(accessibles).count('1')} état(s)",
+            f"Analyse des états co-accessibles: {bin(coaccessibles).count('1')} état(s)",
+            f"Identification des états utiles: {len(rang)} état(s)",
             f"Transitions conservées: {len(transitions_utiles)} transition(s)",
             "Création du nouvel automate émodé"
         ]
@@ -792,6 +883,10 @@ def generer_automate_expreg(request):
                 return redirect("generer_thompson", expression=expression)
             elif algo == "glushkov":
                 return redirect("generer_glushkov", expression=expression)
+            elif algo == "antimirov":
+                return redirect("generer_antimirov", expression=expression)
+            elif algo == "dfa":
+                return redirect("generer_afd", expression=expression)
     else:
         form = ExpressionReguliereForm()
 
@@ -821,6 +916,26 @@ def generer_glushkov(request, expression):
         messages.error(request, f"Erreur lors de la génération de l'automate Glushkov : {e}")
         
         return redirect("generer_automate_expreg")
+
+
+def generer_antimirov(request, expression):
+    try:
+        automate = AntimirovBuilder(expression).build(f"Antimirov({expression})")
+        messages.success(request, f"Automate d'Antimirov généré pour : {expression}")
+        return redirect("details_automate", automate_id=automate.id)
+    except Exception as e:
+        messages.error(request, f"Erreur lors de la génération de l'automate d'Antimirov : {e}")
+        return redirect("generer_automate_expreg")
+
+
+def generer_afd(request, expression):
+    try:
+        automate = generer_afd_minimal(expression, f"AFD({expression})")
+        messages.success(request, f"AFD minimal généré pour : {expression}")
+        return redirect("details_automate", automate_id=automate.id)
+    except Exception as e:
+        messages.error(request, f"Erreur lors de la génération de l'AFD minimal : {e}")
+        return redirect("generer_automate_expreg")
     
 
 
@@ -852,9 +967,13 @@ def resoudre_equations(request):
         if form.is_valid():
             systeme = form.cleaned_data['systeme']
             solver =EquationSolver(systeme)
-            solver.resoudre()
-            resultats = solver.get_resultats()
-            etapes = solver.get_etapes()
+            try:
+                solver.resoudre()
+                resultats = solver.get_resultats()
+                etapes = solver.get_etapes()
+            except ValueError as e:
+                # Variable non définie, équation non linéaire ou syntaxe invalide
+                form.add_error('systeme', str(e))
     else:
         form = EquationForm()
     return render(request, 'automates/resolution_equations.html', {